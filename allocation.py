@@ -0,0 +1,298 @@
+import sys
+import re
+import json
+import time
+import argparse
+import logging
+
+import numpy as np
+import pandas as pd
+
+from db import get_db_connection
+from scoring import ScoringIndex, default_scalers, top_k_batch
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# 1. ALLOCATION SETTINGS
+# ---------------------------
+CANDIDATES_PER_STUDENT = 50    # best-scoring eligible internships each student may be placed in
+MAX_CELLS = 4_000_000          # students x internships per score matrix while building candidates
+DEFAULT_CAPACITY = 1           # seats assumed when an internship has no capacity value
+
+# ---------------------------
+# 2. SPARSE CANDIDATE EDGES
+# ---------------------------
+def candidate_edges(students, index, scalers, limit=CANDIDATES_PER_STUDENT, chunk_size=None):
+    """
+    Keep only each student's ``limit`` best eligible internships
+
+    Scores are produced chunk by chunk with ``ScoringIndex.score_batch`` so the
+    full students x internships matrix never exists in memory.
+
+    Returns:
+        (cand, cand_score): (m, limit) internship positions (-1 padded) and their
+        total_score, best first per row
+    """
+    m = len(students)
+    cand = np.full((m, limit), -1, dtype=np.int32)
+    cand_score = np.full((m, limit), -np.inf)
+    if m == 0 or len(index) == 0:
+        return cand, cand_score
+
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CELLS // len(index))
+
+    for start in range(0, m, chunk_size):
+        chunk = students[start:start + chunk_size]
+        scores, mask = index.score_batch(chunk, scalers)
+        for row, top in enumerate(top_k_batch(scores, mask, limit)):
+            cand[start + row, :len(top)] = top
+            cand_score[start + row, :len(top)] = scores[row, top]
+
+    return cand, cand_score
+
+# ---------------------------
+# 3. DEFERRED ACCEPTANCE
+# ---------------------------
+def deferred_acceptance(cand, cand_score, capacity):
+    """
+    Student-proposing deferred acceptance with seat limits
+
+    Students propose down their candidate lists; every internship keeps the
+    ``capacity`` proposals with the highest total_score (ties go to the lower
+    student position) and rejects the rest. Each round is a handful of array
+    operations over the currently held and newly proposed edges, so a round
+    costs O(m log m) regardless of catalog size.
+
+    Returns:
+        (assigned, choice_rank, rounds): internship position per student (-1 if
+        unplaced), 0-based position of that internship in the student's list,
+        and the number of proposal rounds
+    """
+    m = cand.shape[0]
+    capacity = np.asarray(capacity, dtype=np.int64)
+    degree = (cand >= 0).sum(axis=1)
+    assigned = np.full(m, -1, dtype=np.int64)
+    choice_rank = np.full(m, -1, dtype=np.int64)
+    pointer = np.zeros(m, dtype=np.int64)
+    rounds = 0
+
+    while True:
+        free = np.flatnonzero((assigned < 0) & (pointer < degree))
+        if len(free) == 0:
+            break
+        rounds += 1
+
+        # Every free student proposes to their next candidate
+        proposal_rank = pointer[free]
+        pointer[free] += 1
+
+        held = np.flatnonzero(assigned >= 0)
+        pool_students = np.concatenate([held, free])
+        pool_rank = np.concatenate([choice_rank[held], proposal_rank])
+        pool_internships = cand[pool_students, pool_rank].astype(np.int64)
+        pool_scores = cand_score[pool_students, pool_rank]
+
+        # Group by internship, best score first, and keep the first `capacity` of each group
+        order = np.lexsort((pool_students, -pool_scores, pool_internships))
+        pool_students = pool_students[order]
+        pool_rank = pool_rank[order]
+        pool_internships = pool_internships[order]
+        group_start = np.searchsorted(pool_internships, pool_internships, side='left')
+        keep = np.arange(len(order)) - group_start < capacity[pool_internships]
+
+        rejected = pool_students[~keep]
+        assigned[rejected] = -1
+        choice_rank[rejected] = -1
+        assigned[pool_students[keep]] = pool_internships[keep]
+        choice_rank[pool_students[keep]] = pool_rank[keep]
+
+    return assigned, choice_rank, rounds
+
+def count_blocking_pairs(cand, cand_score, capacity, assigned, choice_rank):
+    """
+    Number of candidate edges (student, internship) that would both rather be matched to each other
+
+    Zero means the allocation is stable over the candidate lists.
+    """
+    m, limit = cand.shape
+    n = len(capacity)
+
+    # Weakest held student per internship as (score, student position)
+    placed = np.flatnonzero(assigned >= 0)
+    seats_used = np.bincount(assigned[placed], minlength=n)
+    held_scores = cand_score[placed, choice_rank[placed]]
+    worst_score = np.full(n, np.inf)
+    worst_student = np.full(n, -1)
+    order = np.lexsort((-placed, held_scores, assigned[placed]))
+    internships, first = np.unique(assigned[placed][order], return_index=True)
+    worst_score[internships] = held_scores[order][first]
+    worst_student[internships] = placed[order][first]
+
+    rows, cols = np.nonzero(cand >= 0)
+    current = np.where(choice_rank[rows] >= 0, choice_rank[rows], limit)
+    prefers = cols < current
+    internships = cand[rows, cols]
+    scores = cand_score[rows, cols]
+    has_seat = seats_used[internships] < np.asarray(capacity)[internships]
+    beats_worst = (scores > worst_score[internships]) | (
+        (scores == worst_score[internships]) & (rows < worst_student[internships])
+    )
+    return int(np.count_nonzero(prefers & (has_seat | beats_worst)))
+
+# ---------------------------
+# 4. ALLOCATION ENTRY POINT
+# ---------------------------
+def allocate(students, internships_df, scalers=default_scalers, capacities=None,
+             candidates_per_student=CANDIDATES_PER_STUDENT, index=None):
+    """
+    Assign students to internships under seat limits using the recommendation total_score
+
+    Args:
+        students (list): Student profiles (domain, cgpa, experience_years,
+            certifications, optional skills and student_id)
+        internships_df (DataFrame): Internships to allocate
+        scalers (dict): Feature scalers
+        capacities (array-like): Seats per internship row (defaults to DEFAULT_CAPACITY)
+        candidates_per_student (int): Length of each student's candidate list
+        index (ScoringIndex): Precomputed arrays for internships_df
+
+    Returns:
+        (DataFrame, dict): One row per student (student_id, internship_id,
+        total_score, choice_rank) and summary statistics
+    """
+    started = time.perf_counter()
+    if index is None or len(index) != len(internships_df):
+        index = ScoringIndex(internships_df)
+    if capacities is None:
+        capacities = np.full(len(index), DEFAULT_CAPACITY)
+    capacities = np.asarray(capacities, dtype=np.int64)
+
+    cand, cand_score = candidate_edges(students, index, scalers, candidates_per_student)
+    scored = time.perf_counter()
+    assigned, choice_rank, rounds = deferred_acceptance(cand, cand_score, capacities)
+    matched = time.perf_counter()
+
+    placed = assigned >= 0
+    rows = np.flatnonzero(placed)
+    internship_ids = internships_df['internship_id'].to_numpy()
+    result = pd.DataFrame({
+        'student_id': [s.get('student_id', i) for i, s in enumerate(students)],
+        'internship_id': pd.Series(pd.NA, index=range(len(students)), dtype='Int64'),
+        'total_score': np.nan,
+        'choice_rank': pd.Series(pd.NA, index=range(len(students)), dtype='Int64')
+    })
+    result.loc[rows, 'internship_id'] = internship_ids[assigned[rows]]
+    result.loc[rows, 'total_score'] = cand_score[rows, choice_rank[rows]]
+    result.loc[rows, 'choice_rank'] = choice_rank[rows] + 1
+
+    summary = {
+        "students": len(students),
+        "internships": len(index),
+        "seats": int(capacities.sum()),
+        "placed": int(placed.sum()),
+        "candidate_edges": int((cand >= 0).sum()),
+        "rounds": rounds,
+        "mean_score": round(float(result['total_score'].mean()), 4) if placed.any() else None,
+        "first_choice": int((choice_rank == 0).sum()),
+        "scoring_seconds": round(scored - started, 3),
+        "matching_seconds": round(matched - scored, 3)
+    }
+    logger.info(f"Placed {summary['placed']}/{len(students)} students in {rounds} rounds")
+    return result, summary
+
+# ---------------------------
+# 5. DATABASE INPUT
+# ---------------------------
+# Student profiles in the shape the recommender scores (also streamed by export.py)
+STUDENT_PROFILE_SQL = """
+    SELECT user_id AS student_id, domain, cgpa,
+           total_experience AS experience_years, certifications,
+           CONCAT_WS(', ', skills, extracted_skills) AS skills
+    FROM user_details
+    WHERE domain IS NOT NULL AND domain <> '' AND cgpa IS NOT NULL
+"""
+
+def student_profile(row):
+    """Profile dict from a STUDENT_PROFILE_SQL row, converted as get_recommendations.php does"""
+    return {
+        'student_id': row['student_id'],
+        'domain': row['domain'],
+        'cgpa': float(row['cgpa'] or 0),
+        'experience_years': float(row['experience_years'] or 0),
+        'certifications': int(row['certifications'] or 0),
+        'skills': row['skills']
+    }
+
+def load_students():
+    """Load every student profile with the fields the recommender scores on"""
+    connection = get_db_connection()
+    if not connection:
+        return []
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(STUDENT_PROFILE_SQL)
+        students = [student_profile(row) for row in cursor.fetchall()]
+        cursor.close()
+        return students
+    finally:
+        connection.close()
+
+def load_capacities(internships_df, capacity_column):
+    """Seats per internship from ``capacity_column``, or DEFAULT_CAPACITY if it is missing"""
+    from mysql.connector import Error
+
+    capacities = np.full(len(internships_df), DEFAULT_CAPACITY, dtype=np.int64)
+    if not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', capacity_column):
+        raise ValueError(f"Invalid capacity column: {capacity_column}")
+
+    connection = get_db_connection()
+    if not connection:
+        return capacities
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT internship_id, {capacity_column} FROM internships WHERE is_active = 1")
+        seats = {row[0]: row[1] for row in cursor.fetchall()}
+        cursor.close()
+    except Error as e:
+        logger.warning(f"No capacity column '{capacity_column}', assuming {DEFAULT_CAPACITY} seat(s) each: {e}")
+        return capacities
+    finally:
+        connection.close()
+
+    for i, internship_id in enumerate(internships_df['internship_id']):
+        value = seats.get(internship_id)
+        if value is not None:
+            capacities[i] = max(int(value), 0)
+    return capacities
+
+# ---------------------------
+# 6. COMMAND LINE
+# ---------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Allocate students to internships under seat limits")
+    parser.add_argument("--output", default="allocation.csv", help="CSV file to write the assignments to")
+    parser.add_argument("--candidates", type=int, default=CANDIDATES_PER_STUDENT,
+                        help="internships considered per student")
+    parser.add_argument("--capacity-column", default="seats",
+                        help="internships column holding the number of seats")
+    args = parser.parse_args(argv)
+
+    from recommendation_api import load_internships
+
+    internships_df = load_internships()
+    students = load_students()
+    if internships_df.empty or not students:
+        print(json.dumps({"error": "No internships or student profiles to allocate."}))
+        sys.exit(1)
+
+    capacities = load_capacities(internships_df, args.capacity_column)
+    result, summary = allocate(students, internships_df, default_scalers, capacities, args.candidates)
+    result.to_csv(args.output, index=False)
+    summary["output"] = args.output
+    print(json.dumps(summary))
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
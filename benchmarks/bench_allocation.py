@@ -0,0 +1,58 @@
+"""
+Benchmark the capacity-constrained allocation on synthetic data
+
+    python benchmarks/bench_allocation.py --students 50000 --internships 5000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from allocation import candidate_edges, deferred_acceptance, count_blocking_pairs, CANDIDATES_PER_STUDENT
+from scoring import ScoringIndex, default_scalers
+from synthetic import make_internships, make_students
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--internships", type=int, default=5000)
+    parser.add_argument("--seats", type=int, default=8, help="maximum seats per internship (uniform 1..seats)")
+    parser.add_argument("--candidates", type=int, default=CANDIDATES_PER_STUDENT)
+    parser.add_argument("--check-stability", action="store_true", help="count blocking pairs afterwards")
+    args = parser.parse_args()
+
+    internships_df = make_internships(args.internships)
+    students = make_students(args.students)
+    capacities = np.random.default_rng(2).integers(1, args.seats + 1, args.internships)
+
+    started = time.perf_counter()
+    index = ScoringIndex(internships_df)
+    indexed = time.perf_counter()
+    cand, cand_score = candidate_edges(students, index, default_scalers, args.candidates)
+    scored = time.perf_counter()
+    assigned, choice_rank, rounds = deferred_acceptance(cand, cand_score, capacities)
+    matched = time.perf_counter()
+
+    report = {
+        "students": args.students,
+        "internships": args.internships,
+        "seats": int(capacities.sum()),
+        "candidate_edges": int((cand >= 0).sum()),
+        "placed": int((assigned >= 0).sum()),
+        "rounds": rounds,
+        "index_seconds": round(indexed - started, 3),
+        "candidate_seconds": round(scored - indexed, 3),
+        "matching_seconds": round(matched - scored, 3),
+        "total_seconds": round(matched - started, 3)
+    }
+    if args.check_stability:
+        report["blocking_pairs"] = count_blocking_pairs(cand, cand_score, capacities, assigned, choice_rank)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
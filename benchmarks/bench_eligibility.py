@@ -0,0 +1,61 @@
+"""
+Benchmark single-student ranking: pre-filter index vs. full-catalog scan
+
+    python benchmarks/bench_eligibility.py --sizes 10000 100000 1000000
+
+"scan" scores every posting and masks afterwards (ScoringIndex.score +
+top_k); "prefilter" asks the EligibilityIndex for open, eligible candidates
+and scores only those (ScoringIndex.rank). A third of the synthetic postings
+have a deadline, half of which have passed.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scoring import ScoringIndex, default_scalers, top_k
+from synthetic import add_deadlines, make_internships, make_students
+
+def per_request_ms(fn, students):
+    started = time.perf_counter()
+    for student in students:
+        fn(student)
+    return round((time.perf_counter() - started) / len(students) * 1000, 3)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    students = make_students(args.requests)
+    for n in args.sizes:
+        internships_df = add_deadlines(make_internships(n))
+        started = time.perf_counter()
+        index = ScoringIndex(internships_df)
+        built = time.perf_counter() - started
+
+        def scan(student):
+            scores, mask = index.score(student, default_scalers)
+            return top_k(scores, mask)
+
+        def prefilter(student):
+            return index.rank(student, default_scalers)[0]
+
+        candidates = np.mean([len(index.candidates(s)) for s in students])
+        print(json.dumps({
+            "internships": n,
+            "threshold_groups": len(index.eligibility.group_cgpa),
+            "mean_candidates": int(candidates),
+            "index_build_seconds": round(built, 3),
+            "scan_ms": per_request_ms(scan, students),
+            "prefilter_ms": per_request_ms(prefilter, students)
+        }), flush=True)
+
+if __name__ == "__main__":
+    main()
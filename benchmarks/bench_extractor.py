@@ -0,0 +1,76 @@
+"""
+Per-resume cost of extract_info: eager full spaCy pipeline vs lazy/trimmed vs regex-only
+
+    python benchmarks/bench_extractor.py --resumes 200
+    python benchmarks/bench_extractor.py --proxy
+
+--proxy replaces en_core_web_sm (when it cannot be downloaded) with untrained
+pipelines of the same components and default architecture: tok2vec, tagger,
+parser and ner for the eager run, ner alone for the trimmed one. Their
+entities are meaningless, but the per-token cost of running them is what
+the lazy pipeline avoids, so the timings stand in for the real model's.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from extractor_cli import extract_info, load_nlp, SPACY_MODEL
+from synthetic import make_resume_text
+
+def per_resume_ms(fn, texts):
+    started = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return round((time.perf_counter() - started) * 1000 / len(texts), 3)
+
+def proxy_pipelines():
+    """(full, trimmed) untrained stand-ins for en_core_web_sm"""
+    import spacy
+
+    def build(pipes):
+        nlp = spacy.blank("en")
+        labels = {"tagger": ["NN", "VB", "JJ"], "parser": ["nsubj", "dobj"], "ner": ["PERSON", "ORG"]}
+        for name in pipes:
+            pipe = nlp.add_pipe(name)
+            for label in labels.get(name, []):
+                pipe.add_label(label)
+        nlp.initialize()
+        return nlp
+
+    return build(["tok2vec", "tagger", "parser", "ner"]), build(["ner"])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--proxy", action="store_true", help="time untrained stand-ins instead of en_core_web_sm")
+    args = parser.parse_args()
+
+    texts = [make_resume_text(seed) for seed in range(args.resumes)]
+    report = {"resumes": args.resumes}
+
+    if args.proxy:
+        full_nlp, trimmed_nlp = proxy_pipelines()
+        report["model"] = "untrained proxy"
+    else:
+        import spacy
+        started = time.perf_counter()
+        full_nlp = spacy.load(SPACY_MODEL)
+        report["load_full_model_seconds"] = round(time.perf_counter() - started, 3)
+        started = time.perf_counter()
+        trimmed_nlp = load_nlp()
+        report["load_trimmed_model_seconds"] = round(time.perf_counter() - started, 3)
+
+    # Before: the whole resume went through every pipe before any field was extracted
+    report["eager_full_pipeline_ms"] = per_resume_ms(lambda t: (full_nlp(t), extract_info(t, None)), texts)
+    # After: NER on the header only, and only when the name heuristic fails
+    report["lazy_trimmed_ms"] = per_resume_ms(lambda t: extract_info(t, trimmed_nlp), texts)
+    report["regex_only_ms"] = per_resume_ms(lambda t: extract_info(t, None), texts)
+
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
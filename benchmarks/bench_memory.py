@@ -0,0 +1,96 @@
+"""
+Report the memory a catalog snapshot holds per worker
+
+    python benchmarks/bench_memory.py --sizes 100000 1000000
+    python benchmarks/bench_memory.py --sizes 1000000 --payload
+
+For each size a synthetic catalog (with a distinct description per posting)
+is installed into ``recommendation_api.catalog``. The report compares the
+plain frame from the database with the compact snapshot (categoricals, packed
+text, float32 scoring arrays) and gives the growth of the process RSS once
+the plain frame has been dropped, as after a database load. --payload
+also builds the pre-serialized /internships body, which is the largest
+component once that endpoint has been hit. Rankings from the compact
+snapshot are checked against an index built from the plain frame.
+"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+sys.path.insert(0, HERE)
+
+from synthetic import add_deadlines, make_internships, make_students
+
+def rss_bytes():
+    """Resident set size of this process (Linux)"""
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+def make_catalog(n):
+    df = add_deadlines(make_internships(n))
+    df['description'] = [f"Internship {i}: build and ship features with the team, " * 3 for i in range(n)]
+    df['created_at'] = pd.Timestamp('2024-01-01')
+    return df
+
+def mb(value):
+    return round(value / 1e6, 1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument("--payload", action="store_true", help="also build the /internships payload")
+    parser.add_argument("--check", type=int, default=200, help="students whose rankings are compared")
+    args = parser.parse_args()
+
+    import db
+    db.DB_ACQUIRE_TIMEOUT = 0  # no database behind the benchmark
+    import recommendation_api
+    from compact import memory_report
+    from scoring import ScoringIndex, default_scalers
+
+    for n in args.sizes:
+        recommendation_api.catalog.load_frame(make_catalog(0))
+        gc.collect()
+        before = rss_bytes()
+        df = make_catalog(n)
+        plain_bytes = int(df[recommendation_api.INTERNSHIP_COLUMNS].memory_usage(deep=True, index=False).sum())
+        started = time.perf_counter()
+        recommendation_api.catalog.load_frame(df)
+        built = time.perf_counter() - started
+        del df
+        snapshot = recommendation_api.catalog.snapshot()
+        if args.payload:
+            snapshot.payload.full_body()
+        gc.collect()
+        grown = rss_bytes() - before
+
+        plain_index = ScoringIndex(make_catalog(n))
+        mismatches = sum(
+            not np.array_equal(plain_index.rank(s, default_scalers)[0], snapshot.index.rank(s, default_scalers)[0])
+            for s in make_students(args.check)
+        )
+        report = memory_report(snapshot)
+        print(json.dumps({
+            "internships": n,
+            "plain_frame_mb": mb(plain_bytes),
+            "compact_frame_mb": mb(report["frame_bytes"]),
+            "packed_text_mb": mb(sum(report["text_bytes"].values())),
+            "index_mb": mb(sum(report["index_bytes"].values())),
+            "payload_mb": mb(sum(report["payload"].values())),
+            "snapshot_total_mb": mb(report["total_bytes"]),
+            "rss_growth_mb": mb(grown),
+            "build_seconds": round(built, 2),
+            "ranking_mismatches": mismatches
+        }), flush=True)
+        del plain_index, snapshot
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Measure recommendation_api cold start
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --modes import serve --wait 30
+
+"import" times ``import recommendation_api`` in a fresh interpreter. "dev"
+and "serve" start ``recommendation_api.py dev|serve`` as a subprocess and
+poll /health: ``healthy_seconds`` is the time to the first 200 and
+``catalog_ready_seconds`` the time until the catalog is loaded (None if it
+was not within ``--wait``, e.g. without a database). The dev server warms the
+catalog in the background; the pre-fork server loads it in the master before
+forking, so both times coincide there.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import statistics
+import subprocess
+import http.client
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+API = os.path.join(ROOT, 'recommendation_api.py')
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import recommendation_api; print(time.perf_counter() - t)"
+
+def time_import():
+    output = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+def poll_health(port):
+    """Parsed /health body, or None while the server is not answering"""
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+        connection.request('GET', '/health')
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return json.loads(body) if response.status == 200 else None
+    except (OSError, http.client.HTTPException, ValueError):
+        return None
+
+def time_server(mode, port, wait):
+    command = [sys.executable, API, mode, '--host', '127.0.0.1', '--port', str(port)]
+    if mode == 'serve':
+        command += ['--workers', '1', '--threads', '1']
+    started = time.perf_counter()
+    server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              start_new_session=True)
+    healthy = ready = None
+    try:
+        while time.perf_counter() - started < wait:
+            health = poll_health(port)
+            if health is not None:
+                elapsed = time.perf_counter() - started
+                healthy = healthy if healthy is not None else elapsed
+                if health.get('catalog_ready'):
+                    ready = elapsed
+                    break
+            time.sleep(0.01)
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)  # dev mode runs a reloader child
+        server.wait(timeout=30)
+    return healthy, ready
+
+def summarize(values):
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 3) if values else None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs='+', choices=['import', 'dev', 'serve'], default=['import', 'dev', 'serve'])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--wait", type=float, default=20.0, help="seconds to wait for a loaded catalog")
+    parser.add_argument("--port", type=int, default=5056)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        if mode == 'import':
+            timings = [time_import() for _ in range(args.runs)]
+            print(json.dumps({"mode": mode, "runs": args.runs, "import_seconds": summarize(timings)}), flush=True)
+            continue
+        results = [time_server(mode, args.port, args.wait) for _ in range(args.runs)]
+        print(json.dumps({
+            "mode": mode,
+            "runs": args.runs,
+            "healthy_seconds": summarize([h for h, _ in results]),
+            "catalog_ready_seconds": summarize([r for _, r in results])
+        }), flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Load-test the API under the pre-fork server and report requests/second per worker count
+
+    python benchmarks/loadtest.py --workers 1 2 4 8 --clients 16 --duration 10
+    python benchmarks/loadtest.py --workers 4 --endpoint mix
+
+For every worker count a server is started as a subprocess
+(``recommendation_api.serve``). The synthetic catalog pinned into it stands
+in for MySQL, so the whole Flask stack is exercised without a database.
+Client processes replay synthetic requests over keep-alive connections, and
+the server is shut down with SIGTERM afterwards. Throughput should grow
+roughly linearly until the worker count reaches the number of cores.
+
+Endpoints: "recommend" (distinct profiles), "recommend-repeat" (a few popular
+profiles, i.e. response-cache hits), "batch" (16 students per call),
+"internships" (100-row pages) and "mix" (all of them, weighted towards
+/recommend).
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import subprocess
+import http.client
+from multiprocessing import Pool
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+sys.path.insert(0, HERE)
+
+from synthetic import make_internships, make_students
+
+# ---------------------------
+# 1. SERVER UNDER TEST
+# ---------------------------
+def run_server(port, workers, threads, internships):
+    """Serve the API with a pinned synthetic catalog (runs in the subprocess)"""
+    import db
+    db.DB_ACQUIRE_TIMEOUT = 0.1  # fail fast: there is no database behind the benchmark
+
+    import recommendation_api
+
+    recommendation_api.catalog.load_frame(make_internships(internships))
+    recommendation_api.catalog.check_interval = float('inf')
+    recommendation_api.catalog.ttl = float('inf')
+    recommendation_api.serve('127.0.0.1', port, workers, threads)
+
+def start_server(args, workers):
+    command = [
+        sys.executable, os.path.abspath(__file__), '--serve',
+        '--port', str(args.port), '--workers', str(workers),
+        '--threads', str(args.threads), '--internships', str(args.internships)
+    ]
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', args.port, timeout=1)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                connection.close()
+                return server
+        except OSError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"Server with {workers} workers did not come up on port {args.port}")
+
+# ---------------------------
+# 2. LOAD GENERATOR
+# ---------------------------
+ENDPOINTS = ['recommend', 'recommend-repeat', 'batch', 'internships', 'mix']
+
+def make_requests(endpoint, seed, internships):
+    """(method, path, body) tuples a client cycles through"""
+    students = make_students(200, seed=seed)
+    if endpoint == 'recommend':
+        return [('POST', '/recommend', json.dumps(s).encode()) for s in students]
+    if endpoint == 'recommend-repeat':
+        return [('POST', '/recommend', json.dumps(s).encode()) for s in make_students(5, seed=0)]
+    if endpoint == 'batch':
+        return [('POST', '/recommend/batch', json.dumps({"students": students[i:i + 16]}).encode())
+                for i in range(0, len(students), 16)]
+    if endpoint == 'internships':
+        pages = max(1, internships // 100)
+        return [('GET', f'/internships?offset={100 * (i % pages)}&limit=100', None) for i in range(50)]
+    requests = (make_requests('recommend', seed, internships)[:14] + make_requests('recommend-repeat', seed, internships)
+                + make_requests('internships', seed, internships)[:3])
+    return requests + make_requests('batch', seed, internships)[:1]
+
+def client(job):
+    """Send requests on one keep-alive connection until the deadline"""
+    port, seed, duration, endpoint, internships = job
+    requests = make_requests(endpoint, seed, internships)
+    headers = {'Content-Type': 'application/json'}
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+    i = 0
+    while time.monotonic() < deadline:
+        method, path, body = requests[i % len(requests)]
+        started = time.perf_counter()
+        try:
+            connection.request(method, path, body, headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        latencies.append(time.perf_counter() - started)
+        i += 1
+    connection.close()
+    return latencies, errors
+
+def measure(args, workers):
+    server = start_server(args, workers)
+    try:
+        with Pool(args.clients) as pool:
+            jobs = [(args.port, seed, args.duration, args.endpoint, args.internships) for seed in range(args.clients)]
+            results = pool.map(client, jobs)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    latencies = np.concatenate([np.array(l) for l, _ in results]) * 1000
+    return {
+        "endpoint": args.endpoint,
+        "workers": workers,
+        "threads": args.threads,
+        "clients": args.clients,
+        "requests": len(latencies),
+        "errors": sum(e for _, e in results),
+        "requests_per_second": round(len(latencies) / args.duration, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2) if len(latencies) else None,
+        "p99_ms": round(float(np.percentile(latencies, 99)), 2) if len(latencies) else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=1, help="threads per worker")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent client processes")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per worker count")
+    parser.add_argument("--internships", type=int, default=5000)
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default='recommend')
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        run_server(args.port, args.workers[0], args.threads, args.internships)
+        return
+
+    print(json.dumps({"cpu_count": os.cpu_count(), "internships": args.internships}))
+    for workers in args.workers:
+        print(json.dumps(measure(args, workers)), flush=True)
+
+if __name__ == "__main__":
+    main()
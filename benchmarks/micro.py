@@ -0,0 +1,247 @@
+"""
+Microbenchmarks for scoring, filtering, extraction and serialization
+
+    python benchmarks/micro.py                          # run everything
+    python benchmarks/micro.py -k scoring --size 100000 # only names containing "scoring"
+    python benchmarks/micro.py --save baseline.json     # record timings
+    python benchmarks/micro.py --compare baseline.json  # exit 1 on regressions
+
+Each benchmark is calibrated to run for roughly ``--min-time`` seconds per
+round; the best and median of ``--rounds`` rounds are reported in
+microseconds. With --compare, a benchmark whose median is more than
+``--tolerance`` slower than the saved one counts as a regression.
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import statistics
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+sys.path.insert(0, HERE)
+
+BENCHMARKS = []
+
+def benchmark(name):
+    """Register ``setup(context) -> callable`` under name"""
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+# ---------------------------
+# 1. SHARED FIXTURES
+# ---------------------------
+class Context:
+    """Synthetic inputs shared by the benchmarks, built on first use"""
+
+    def __init__(self, size):
+        self.size = size
+        self._cache = {}
+
+    def get(self, name, build):
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    @property
+    def internships(self):
+        from synthetic import add_deadlines, make_internships
+        return self.get('internships', lambda: add_deadlines(make_internships(self.size)))
+
+    @property
+    def index(self):
+        from scoring import ScoringIndex
+        return self.get('index', lambda: ScoringIndex(self.internships))
+
+    @property
+    def students(self):
+        from synthetic import make_students
+        return self.get('students', lambda: make_students(256))
+
+    @property
+    def resume_pdf(self):
+        from synthetic import make_resume_pdf
+        directory = self.get('tmpdir', tempfile.TemporaryDirectory)
+        return self.get('resume_pdf', lambda: make_resume_pdf(os.path.join(directory.name, "resume.pdf"), pages=2))
+
+def cycle(items):
+    """Callable returning the next item on every call, so repeated runs do not hit one input only"""
+    state = {"i": 0}
+    def next_item():
+        state["i"] += 1
+        return items[state["i"] % len(items)]
+    return next_item
+
+# ---------------------------
+# 2. SCORING AND FILTERING
+# ---------------------------
+@benchmark("scoring/index_build")
+def bench_index_build(ctx):
+    from scoring import ScoringIndex
+    df = ctx.internships
+    return lambda: ScoringIndex(df)
+
+@benchmark("scoring/score_full_catalog")
+def bench_score(ctx):
+    from scoring import default_scalers
+    index, student = ctx.index, cycle(ctx.students)
+    return lambda: index.score(student(), default_scalers)
+
+@benchmark("scoring/rank_top10")
+def bench_rank(ctx):
+    from scoring import default_scalers
+    index, student = ctx.index, cycle(ctx.students)
+    return lambda: index.rank(student(), default_scalers)
+
+@benchmark("scoring/score_batch_32")
+def bench_score_batch(ctx):
+    from scoring import default_scalers
+    index, students = ctx.index, ctx.students[:32]
+    return lambda: index.score_batch(students, default_scalers)
+
+@benchmark("scoring/recommend_internships")
+def bench_recommend(ctx):
+    import db
+    db.DB_ACQUIRE_TIMEOUT = 0  # no database behind the benchmarks
+    from recommendation_api import recommend_internships, scalers
+    df, index, student = ctx.internships, ctx.index, cycle(ctx.students)
+    return lambda: recommend_internships(student(), df, scalers, index)
+
+@benchmark("filtering/eligible_candidates")
+def bench_candidates(ctx):
+    index, student = ctx.index, cycle(ctx.students)
+    return lambda: index.candidates(student())
+
+@benchmark("filtering/eligible_mask_scan")
+def bench_mask(ctx):
+    index, student = ctx.index, cycle(ctx.students)
+    def run():
+        s = student()
+        return index.eligible_mask(s['cgpa'], s['experience_years'], s['certifications']) & index.eligibility.open_mask()
+    return run
+
+@benchmark("filtering/skill_coverage")
+def bench_skills(ctx):
+    index, student = ctx.index, cycle(ctx.students)
+    return lambda: index.skills.coverage(student()['skills'])
+
+# ---------------------------
+# 3. EXTRACTION
+# ---------------------------
+@benchmark("extraction/extract_info_regex")
+def bench_extract_info(ctx):
+    from extractor_cli import extract_info
+    from synthetic import make_resume_text
+    text = cycle([make_resume_text(seed) for seed in range(32)])
+    return lambda: extract_info(text(), None)
+
+@benchmark("extraction/pdf_text")
+def bench_pdf_text(ctx):
+    from extractor_cli import extract_text_from_pdf
+    path = ctx.resume_pdf
+    return lambda: extract_text_from_pdf(path)
+
+@benchmark("extraction/extract_resume_uncached")
+def bench_extract_resume(ctx):
+    import extractor_cli
+    extractor_cli.result_cache.directory = ""  # measure the work, not the cache
+    path = ctx.resume_pdf
+    return lambda: extractor_cli.extract_resume(path, None, regex_only=True)
+
+# ---------------------------
+# 4. SERIALIZATION
+# ---------------------------
+@benchmark("serialization/format_top10")
+def bench_format(ctx):
+    from serialization import frame_records
+    top = ctx.internships.iloc[:10].copy()
+    top['total_score'] = 0.5
+    return lambda: frame_records(top)
+
+@benchmark("serialization/dumps_top10")
+def bench_dumps(ctx):
+    from serialization import dumps, frame_records
+    records = frame_records(ctx.internships.iloc[:10])
+    return lambda: dumps({"success": True, "count": 10, "recommendations": records})
+
+@benchmark("serialization/catalog_page_100")
+def bench_page(ctx):
+    from serialization import CatalogPayload, dumps
+    payload = CatalogPayload(ctx.internships)
+    return lambda: dumps({"internships": payload.records(None, 1000, 100)})
+
+@benchmark("serialization/catalog_records")
+def bench_catalog_records(ctx):
+    from serialization import CatalogPayload
+    payload = CatalogPayload(ctx.internships)
+    return lambda: payload.records()
+
+# ---------------------------
+# 5. RUNNER
+# ---------------------------
+def measure(fn, rounds, min_time):
+    """Best and median seconds per call over rounds, each calibrated to last about min_time"""
+    fn()  # warm-up
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    timings = [elapsed / number]
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - started) / number)
+    return min(timings), statistics.median(timings), number
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--size", type=int, default=10000, help="synthetic catalog size")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against a JSON file written by --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before a regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    ctx = Context(args.size)
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<40} {'best us':>12} {'median us':>12} {'calls':>9} {'vs saved':>9}")
+    for name, setup in BENCHMARKS:
+        if args.pattern not in name:
+            continue
+        best, median, number = measure(setup(ctx), args.rounds, args.min_time)
+        results[name] = {"best_us": round(best * 1e6, 2), "median_us": round(median * 1e6, 2)}
+        change = ""
+        if name in baseline:
+            ratio = median * 1e6 / baseline[name]["median_us"] - 1
+            change = f"{ratio:+.1%}"
+            if ratio > args.tolerance:
+                regressions.append(name)
+        print(f"{name:<40} {best * 1e6:>12.1f} {median * 1e6:>12.1f} {number:>9} {change:>9}", flush=True)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"size": args.size, "results": results}, f, indent=2)
+    if regressions:
+        print(f"Regressions over {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# 1. SYNTHETIC DATA SETTINGS
+# ---------------------------
+DOMAINS = [
+    'Software Development', 'Web Development', 'Data Science', 'Machine Learning',
+    'Artificial Intelligence', 'Cloud Computing', 'Cyber Security', 'Mobile Development',
+    'DevOps', 'UI/UX Design', 'Embedded Systems', 'Database Administration'
+]
+SKILLS = ['Python', 'Java', 'C++', 'JavaScript', 'React', 'Node.js', 'MySQL', 'MongoDB',
+          'Docker', 'AWS', 'Git', 'Machine Learning', 'HTML', 'CSS', 'PHP']
+
+# ---------------------------
+# 2. INTERNSHIP CATALOG
+# ---------------------------
+def domain_probabilities(domains, weights=None):
+    """Normalized sampling weights for domains (uniform by default)"""
+    if weights is None:
+        return None
+    weights = np.asarray(weights, dtype=np.float64)
+    if len(weights) != len(domains) or weights.min() < 0 or weights.sum() == 0:
+        raise ValueError("domain_weights needs one non-negative weight per domain")
+    return weights / weights.sum()
+
+def make_internships(n, seed=0, domains=DOMAINS, domain_weights=None):
+    """
+    Random internships frame with the same columns load_internships() returns
+
+    ``domain_weights`` skews the domain distribution (one weight per domain),
+    e.g. to model a catalog dominated by a few popular fields.
+    """
+    rng = np.random.default_rng(seed)
+    domain_p = domain_probabilities(domains, domain_weights)
+    importance = rng.dirichlet(np.ones(4), size=n)
+    return pd.DataFrame({
+        'internship_id': np.arange(1, n + 1),
+        'title': [f"Intern {i}" for i in range(1, n + 1)],
+        'company_name': [f"Company {i % 997}" for i in range(n)],
+        'description': "Synthetic internship used for benchmarking.",
+        'required_domain': rng.choice(domains, n, p=domain_p),
+        'min_cgpa': rng.choice([0, 6.0, 6.5, 7.0, 7.5, 8.0], n),
+        'required_experience': rng.choice([0, 0, 0, 0.5, 1, 2], n),
+        'min_certifications': rng.choice([0, 0, 1, 2, 3], n),
+        'importance_domain': importance[:, 0],
+        'importance_cgpa': importance[:, 1],
+        'importance_experience': importance[:, 2],
+        'importance_certifications': importance[:, 3],
+        'location': rng.choice(['Remote', 'Bengaluru', 'Pune', 'Delhi', 'Hyderabad'], n),
+        'duration_months': rng.choice([2, 3, 6], n),
+        'stipend': rng.choice([0, 5000, 10000, 15000, 25000], n).astype(float),
+        'application_deadline': None,
+        'required_skills': [", ".join(rng.choice(SKILLS, rng.integers(0, 5), replace=False)) for _ in range(n)]
+    })
+
+def add_deadlines(internships_df, share=1 / 3, seed=3):
+    """Give ``share`` of the postings a deadline within 60 days either side of today (so about half have passed)"""
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.today().normalize()
+    deadlines = today + pd.to_timedelta(rng.integers(-60, 60, len(internships_df)), unit='D')
+    has_deadline = rng.random(len(internships_df)) < share
+    internships_df['application_deadline'] = np.where(has_deadline, deadlines.date, None)
+    return internships_df
+
+# ---------------------------
+# 3. STUDENT PROFILES
+# ---------------------------
+def make_students(m, seed=1, domains=DOMAINS, domain_weights=None):
+    """Random student profiles in the /recommend payload format"""
+    rng = np.random.default_rng(seed)
+    domain = rng.choice(domains, m, p=domain_probabilities(domains, domain_weights))
+    cgpa = np.clip(rng.normal(7.5, 1.0, m), 4, 10).round(2)
+    experience = rng.choice([0, 0, 0.5, 1, 2, 3], m)
+    certifications = rng.poisson(1.5, m)
+    return [
+        {
+            'student_id': i + 1,
+            'domain': str(domain[i]),
+            'cgpa': float(cgpa[i]),
+            'experience_years': float(experience[i]),
+            'certifications': int(certifications[i]),
+            'skills': ", ".join(rng.choice(SKILLS, 1 + i % 6, replace=False))
+        }
+        for i in range(m)
+    ]
+
+# ---------------------------
+# 4. RESUME TEXT
+# ---------------------------
+FIRST_NAMES = ['Aarav', 'Diya', 'Rohan', 'Ananya', 'Kabir', 'Meera', 'Vikram', 'Isha']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Reddy', 'Singh', 'Gupta', 'Nair', 'Das']
+def make_resume_text(seed=0, experience_items=3, project_items=3, filler_lines=20):
+    """Plain-text resume with the headings extract_info() looks for"""
+    rng = np.random.default_rng(seed)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.choice(SKILLS, size=6, replace=False)
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com",
+        f"+91 9{rng.integers(100000000, 999999999)}",
+        "Education",
+        "B.Tech in Computer Science, National Institute of Technology",
+        f"CGPA: {rng.uniform(6, 10):.2f}",
+        "Experience"
+    ]
+    lines += [f"Software Intern at Company {rng.integers(1, 500)} - worked on backend services"
+              for _ in range(experience_items)]
+    lines.append("Projects")
+    lines += [f"Developed a {rng.choice(skills)} application for campus placements"
+              for _ in range(project_items)]
+    lines.append("Skills")
+    lines.append(", ".join(skills))
+    lines.append("Certifications")
+    lines += ["AWS Certified Cloud Practitioner", "Coursera Machine Learning"]
+    lines.append("Interests")
+    lines += [f"Volunteer activity number {i} with the local community" for i in range(filler_lines)]
+    return "\n".join(lines)
+
+# ---------------------------
+# 5. RESUME PDF CORPUS
+# ---------------------------
+def make_resume_pdf(path, seed=0, pages=1, **text_options):
+    """Write a text-based resume PDF; extra pages repeat the filler so multi-page limits can be exercised"""
+    import fitz  # PyMuPDF
+
+    lines = make_resume_text(seed, **text_options).split("\n")
+    per_page = 50
+    with fitz.open() as doc:
+        for number in range(pages):
+            page = doc.new_page()
+            chunk = lines[number * per_page:(number + 1) * per_page] or lines[-per_page:]
+            page.insert_text((50, 50), "\n".join(chunk), fontsize=9)
+        doc.save(path)
+    return path
+
+def make_resume_corpus(directory, count, seed=0, max_pages=3):
+    """Write ``count`` resume PDFs of 1..max_pages pages into directory and return their paths"""
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(count):
+        pages = int(rng.integers(1, max_pages + 1))
+        path = os.path.join(directory, f"resume_{i:05d}.pdf")
+        paths.append(make_resume_pdf(path, seed + i, pages, filler_lines=20 + 50 * (pages - 1)))
+    return paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic resume PDF corpus (e.g. for extractor_cli.py --bulk)")
+    parser.add_argument("directory")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--max-pages", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    written = make_resume_corpus(args.directory, args.count, args.seed, args.max_pages)
+    print(f"Wrote {len(written)} resumes to {args.directory}")
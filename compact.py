@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# ---------------------------
+# 1. COMPACTION SETTINGS
+# ---------------------------
+# Free-text columns that are (nearly) unique per posting. They are packed into
+# TextColumns instead of one Python str per row, and only decoded for the rows
+# a response actually returns.
+TEXT_COLUMNS = ['title', 'description']
+
+# Other string columns become categoricals when they have at most this many
+# distinct values per row (companies, domains, locations, skill lists, deadlines)
+CATEGORY_MAX_RATIO = 0.5
+
+# ---------------------------
+# 2. PACKED TEXT COLUMNS
+# ---------------------------
+class TextColumn:
+    """
+    Strings of one column in a single UTF-8 buffer with int64 offsets
+
+    About 8 bytes of overhead per row instead of a ~50-byte str object and an
+    8-byte pointer. ``take`` decodes only the requested rows.
+    """
+
+    def __init__(self, values):
+        values = pd.Series(values, dtype=object)
+        missing = values.isna().to_numpy()
+        encoded = [b'' if m else str(v).encode('utf-8') for v, m in zip(values.tolist(), missing.tolist())]
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=self.offsets[1:])
+        self.buffer = b''.join(encoded)
+        self.missing = missing if missing.any() else None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        return len(self.buffer) + self.offsets.nbytes + (0 if self.missing is None else self.missing.nbytes)
+
+    def take(self, positions):
+        """Decoded values at positions (None where missing)"""
+        buffer, offsets, missing = self.buffer, self.offsets, self.missing
+        positions = np.asarray(positions, dtype=np.int64).tolist()
+        values = [buffer[offsets[i]:offsets[i + 1]].decode('utf-8') for i in positions]
+        if missing is not None:
+            values = [None if missing[i] else v for i, v in zip(positions, values)]
+        return values
+
+    def tolist(self):
+        return self.take(np.arange(len(self)))
+
+class TextStore:
+    """The packed text columns of one catalog frame, row-aligned with it"""
+
+    def __init__(self, columns):
+        self.columns = columns  # name -> TextColumn
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
+
+    def join(self, rows, positions=None):
+        """
+        Copy of ``rows`` (a slice of the compact frame) with the text columns added back
+
+        ``positions`` are the catalog positions of those rows; omit it when
+        ``rows`` is the whole frame.
+        """
+        if positions is None:
+            positions = np.arange(len(rows))
+        rows = rows.copy()
+        for name, column in self.columns.items():
+            rows[name] = column.take(positions)
+        return rows
+
+# ---------------------------
+# 3. COMPACT CATALOG FRAME
+# ---------------------------
+def _is_text(values):
+    return values.dtype == object or isinstance(values.dtype, pd.StringDtype)
+
+def compact_frame(df, text_columns=TEXT_COLUMNS):
+    """
+    Typed copy of a catalog frame plus its free-text columns as a TextStore
+
+    Repetitive string columns become categoricals and integer columns the
+    smallest integer type that holds them. Float columns keep float64 so
+    /internships returns the stored values exactly; the float32 copies used
+    for scoring live in the ScoringIndex.
+    """
+    text = TextStore({c: TextColumn(df[c].to_numpy()) for c in text_columns if c in df})
+    columns = {}
+    for name in df.columns:
+        if name in text:
+            continue
+        values = df[name]
+        if _is_text(values):
+            if values.nunique(dropna=True) <= CATEGORY_MAX_RATIO * len(values):
+                values = values.astype('category')
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            values = pd.to_numeric(values, downcast='integer')
+        columns[name] = values
+    return pd.DataFrame(columns, index=df.index), text
+
+# ---------------------------
+# 4. MEMORY REPORT
+# ---------------------------
+def array_bytes(obj):
+    """Bytes held by the NumPy arrays and sparse matrices among obj's attributes"""
+    total = 0
+    for value in vars(obj).values():
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif sparse.issparse(value):
+            total += value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+    return total
+
+def memory_report(snapshot):
+    """
+    Approximate bytes held by one catalog snapshot, by component
+
+    Frame sizes include the str objects behind object/categorical columns
+    (``memory_usage(deep=True)``), so this walks every string once and is
+    meant for admin endpoints and benchmarks, not the request path. The
+    payload entry is everything CatalogPayload caches; pages are decoded
+    from the frame and text columns counted here.
+    """
+    frame, text, index, payload = snapshot.frame, snapshot.text, snapshot.index, snapshot.payload
+    frame_columns = {c: int(frame[c].memory_usage(deep=True, index=False)) for c in frame.columns}
+    index_parts = {
+        "arrays": array_bytes(index),
+        "domains": array_bytes(index.domains),
+        "skills": array_bytes(index.skills),
+        "eligibility": array_bytes(index.eligibility)
+    }
+    payload_bytes = payload.nbytes()
+    report = {
+        "rows": len(frame),
+        "frame_bytes": sum(frame_columns.values()),
+        "frame_columns": frame_columns,
+        "text_bytes": {name: column.nbytes for name, column in text.columns.items()},
+        "index_bytes": index_parts,
+        "payload": payload_bytes
+    }
+    report["total_bytes"] = (report["frame_bytes"] + text.nbytes + sum(index_parts.values())
+                             + sum(payload_bytes.values()))
+    return report
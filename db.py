@@ -0,0 +1,180 @@
+import os
+import time
+import threading
+import logging
+
+import pandas as pd
+import mysql.connector
+from mysql.connector import Error, pooling
+from mysql.connector.errors import PoolError
+
+from metrics import REGISTRY, span
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# 1. DATABASE CONFIGURATION
+# ---------------------------
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',  # Your XAMPP MySQL username
+    'password': '',  # Your XAMPP MySQL password (usually empty)
+    'database': 'smartmatch_db',  # YOUR actual database name
+    'port': 3306,
+    'connection_timeout': 5  # seconds to establish a connection
+}
+
+DB_POOL_NAME = 'smartmatch_pool'
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+DB_ACQUIRE_TIMEOUT = 5       # seconds to wait for a free or reachable connection
+DB_RETRY_BASE_DELAY = 0.05   # first backoff step; doubles up to DB_RETRY_MAX_DELAY
+DB_RETRY_MAX_DELAY = 2.0
+
+# ---------------------------
+# 2. CONNECTION POOL
+# ---------------------------
+_pool = None
+_pool_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    "checkouts": 0,      # connections handed out
+    "waits": 0,          # checkouts that had to wait for a free connection
+    "retries": 0,        # attempts repeated after a database error
+    "failures": 0        # checkouts that gave up after DB_ACQUIRE_TIMEOUT
+}
+
+DB_ACQUIRE_SECONDS = REGISTRY.histogram('db_acquire_seconds', "Time to check a connection out of the pool")
+DB_QUERY_SECONDS = REGISTRY.histogram('db_query_seconds', "Time to run a query_df() query and fetch its rows")
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+def _get_pool():
+    """Create the pool on first use so the API can start before MySQL is up"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name=DB_POOL_NAME,
+                    pool_size=DB_POOL_SIZE,
+                    pool_reset_session=True,
+                    **DB_CONFIG
+                )
+                logger.info(f"Created MySQL connection pool ({DB_POOL_SIZE} connections)")
+    return _pool
+
+def close_pool():
+    """
+    Close the idle pooled connections and forget the pool
+
+    Called in the pre-fork server's master before workers are forked, so no
+    MySQL socket is ever shared between processes; each worker then creates
+    its own pool on first use.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        try:
+            pool._remove_connections()
+        except (AttributeError, Error) as e:
+            logger.warning(f"Could not close pooled connections: {e}")
+
+def get_db_connection(timeout=None):
+    """
+    Check a connection out of the pool, or return None if the database stays unreachable
+
+    The pool re-validates idle connections on checkout (reconnecting dead ones),
+    so a MySQL restart costs one reconnect instead of a process restart. While
+    the pool is exhausted or the server is down this retries with exponential
+    backoff until ``timeout``. Callers must always ``close()`` the connection,
+    which returns it to the pool.
+    """
+    started = time.perf_counter()
+    deadline = time.monotonic() + (DB_ACQUIRE_TIMEOUT if timeout is None else timeout)
+    delay = DB_RETRY_BASE_DELAY
+    waited = False
+    while True:
+        try:
+            connection = _get_pool().get_connection()
+            DB_ACQUIRE_SECONDS.observe(time.perf_counter() - started)
+            _count("checkouts")
+            if waited:
+                _count("waits")
+            return connection
+        except PoolError as e:
+            # Exhausted: every connection is checked out
+            waited = True
+            error = e
+        except Error as e:
+            # Server unreachable: pool creation or the reconnect of a dead connection failed
+            _count("retries")
+            error = e
+
+        if time.monotonic() + delay > deadline:
+            _count("failures")
+            logger.error(f"Error connecting to MySQL database: {error}")
+            return None
+        time.sleep(delay)
+        delay = min(delay * 2, DB_RETRY_MAX_DELAY)
+
+def open_stream_connection():
+    """
+    A dedicated connection outside the pool, or None if the database is unreachable
+
+    For long unbuffered (server-side cursor) reads such as exports, which would
+    otherwise hold a pooled connection for the whole stream. Closing it
+    mid-stream discards the unread rows instead of returning a connection with
+    a pending result set to the pool.
+    """
+    try:
+        return mysql.connector.connect(**DB_CONFIG)
+    except Error as e:
+        logger.error(f"Error connecting to MySQL database: {e}")
+        return None
+
+def pool_stats():
+    """Pool size, current utilization and checkout counters for /health"""
+    pool = _pool
+    idle = None
+    if pool is not None:
+        queue = getattr(pool, '_cnx_queue', None)
+        idle = queue.qsize() if queue is not None else None
+    with _stats_lock:
+        stats = dict(_stats)
+    stats.update({
+        "pool_size": DB_POOL_SIZE,
+        "idle": idle,
+        "in_use": None if idle is None else DB_POOL_SIZE - idle,
+        "connected": pool is not None
+    })
+    return stats
+
+# ---------------------------
+# 3. QUERY HELPERS
+# ---------------------------
+def query_df(query, params=None):
+    """
+    Run a parameterized SELECT on a pooled connection and return a DataFrame
+
+    Returns None if the database is unreachable or the query fails. DECIMAL
+    columns are converted to float, as ``pd.read_sql`` does.
+    """
+    connection = get_db_connection()
+    if not connection:
+        return None
+    try:
+        with span(DB_QUERY_SECONDS):
+            cursor = connection.cursor()
+            cursor.execute(query, params or ())
+            rows = cursor.fetchall()
+            columns = list(cursor.column_names)
+            cursor.close()
+        return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+    except Error as e:
+        logger.error(f"Query failed: {e}")
+        return None
+    finally:
+        connection.close()
@@ -0,0 +1,140 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# 1. DOMAIN VOCABULARY
+# ---------------------------
+# Domains students pick from on the application form (apply.php)
+STUDENT_DOMAINS = [
+    'Full Stack Development', 'Data Science & ML', 'Cyber Security',
+    'Cloud Computing', 'DevOps', 'UI/UX Design', 'Other'
+]
+
+# Abbreviations and spelling variants, expanded token by token during normalization
+DOMAIN_ALIASES = {
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'dl': 'deep learning',
+    'nlp': 'natural language processing',
+    'cv': 'computer vision',
+    'ds': 'data science',
+    'fullstack': 'full stack',
+    'frontend': 'front end',
+    'backend': 'back end',
+    'cybersecurity': 'cyber security',
+    'infosec': 'cyber security',
+    'uiux': 'ui ux',
+    'dev': 'development',
+    'sde': 'software development',
+    'swe': 'software development',
+    'dba': 'database administration',
+    'iot': 'internet of things'
+}
+
+# Tokens that say nothing about the field ("Web Development" vs "Game Development")
+GENERIC_TOKENS = {'and', 'of', 'the', 'in', 'development', 'developer', 'engineering', 'engineer'}
+
+# Related fields: domains sharing a family are partial matches even without common words
+DOMAIN_FAMILIES = {
+    'web': ['full stack', 'web', 'front end', 'back end', 'mern', 'mean'],
+    'data': ['data science', 'machine learning', 'artificial intelligence', 'deep learning',
+             'data analytics', 'data analysis', 'natural language processing', 'computer vision'],
+    'security': ['cyber security', 'network security', 'security', 'ethical hacking'],
+    'infrastructure': ['cloud', 'devops', 'site reliability', 'infrastructure'],
+    'design': ['ui ux', 'ui', 'ux', 'product design', 'graphic design'],
+    'mobile': ['mobile', 'android', 'ios', 'flutter']
+}
+
+EXACT_SCORE = 1.0
+PARTIAL_SCORE = 0.5   # one domain contains the other, or both are in the same family
+OVERLAP_SCORE = 0.5   # scaled by the Jaccard overlap of the meaningful tokens
+
+# ---------------------------
+# 2. NORMALIZATION AND SIMILARITY
+# ---------------------------
+@lru_cache(maxsize=4096)
+def normalize_domain(domain):
+    """Lowercase, turn '&' and punctuation into words/spaces and expand aliases"""
+    text = str(domain or '').lower().replace('&', ' and ').replace('+', ' plus ')
+    tokens = re.findall(r'[a-z0-9]+', text)
+    return ' '.join(DOMAIN_ALIASES.get(t, t) for t in tokens)
+
+def _families(normalized):
+    padded = f' {normalized} '
+    return {
+        family for family, phrases in DOMAIN_FAMILIES.items()
+        if any(f' {phrase} ' in padded for phrase in phrases)
+    }
+
+def _tokens(normalized):
+    return set(normalized.split()) - GENERIC_TOKENS
+
+def domain_similarity(a, b):
+    """
+    Similarity in [0, 1] between two normalized domains
+
+    1.0 for the same domain; 0.5 when one contains the other as whole words
+    (the original substring rule) or both belong to the same family; otherwise
+    0.5 scaled by the share of meaningful words they have in common.
+    """
+    if not a or not b:
+        return EXACT_SCORE if a == b else 0.0
+    if a == b:
+        return EXACT_SCORE
+    if f' {a} ' in f' {b} ' or f' {b} ' in f' {a} ':
+        return PARTIAL_SCORE
+    if _families(a) & _families(b):
+        return PARTIAL_SCORE
+    ta, tb = _tokens(a), _tokens(b)
+    if not ta or not tb:
+        return 0.0
+    return OVERLAP_SCORE * len(ta & tb) / len(ta | tb)
+
+# ---------------------------
+# 3. PRECOMPUTED DOMAIN INDEX
+# ---------------------------
+class DomainIndex:
+    """
+    Domain similarity table for one catalog snapshot
+
+    Internship domains are normalized and dictionary-encoded once. A
+    similarity row (student domain x distinct internship domains) is
+    precomputed for every form domain and every catalog domain; other student
+    domains are computed on first sight and memoized. Scoring a request is a
+    dictionary lookup plus a gather through ``codes``.
+    """
+
+    MAX_ROWS = 10_000  # memoized student domains before new ones are computed per call
+
+    def __init__(self, domains, student_domains=STUDENT_DOMAINS):
+        # Normalize each distinct raw value once, then merge values that normalize alike
+        raw_codes, raw_vocab = pd.factorize(pd.Series(domains, dtype=object).fillna(''))
+        normalized = np.array([normalize_domain(d) for d in raw_vocab], dtype=str)
+        self.vocab, merged = np.unique(normalized, return_inverse=True)
+        self.codes = merged.reshape(-1).astype(np.int32)[raw_codes]
+        self._rows = {}
+        for domain in list(student_domains) + list(self.vocab):
+            self.row(domain)
+
+    def row(self, student_domain):
+        """Similarity of student_domain to each distinct internship domain"""
+        key = normalize_domain(student_domain)
+        row = self._rows.get(key)
+        if row is None:
+            row = np.array([domain_similarity(key, d) for d in self.vocab], dtype=np.float64)
+            if len(self._rows) < self.MAX_ROWS:
+                self._rows[key] = row
+        return row
+
+    def scores(self, student_domain):
+        """Per-internship similarity for one student domain"""
+        return self.row(student_domain)[self.codes]
+
+    def score_matrix(self, student_domains):
+        """(m, n) similarities, computed once per distinct student domain"""
+        distinct, inverse = np.unique([normalize_domain(d) for d in student_domains], return_inverse=True)
+        rows = np.array([self.row(d) for d in distinct]).reshape(len(distinct), len(self.vocab))
+        return rows[inverse][:, self.codes]
@@ -0,0 +1,103 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+NO_DEADLINE = np.iinfo(np.int64).max // 2  # day number used for postings without a deadline
+
+def today_days():
+    """Today's local date as days since the epoch"""
+    return int(np.datetime64(datetime.date.today(), 'D').astype(np.int64))
+
+def deadline_days(deadlines):
+    """Application deadlines as days since the epoch; missing or unparsable ones never expire"""
+    parsed = pd.to_datetime(pd.Series(deadlines, dtype=object), errors='coerce')
+    days = parsed.to_numpy(dtype='datetime64[D]').astype(np.int64)
+    days[parsed.isna().to_numpy()] = NO_DEADLINE
+    return days
+
+# ---------------------------
+# ELIGIBILITY PRE-FILTER
+# ---------------------------
+class EligibilityIndex:
+    """
+    Hard-filter index over the (min_cgpa, required_experience, min_certifications) thresholds
+
+    Internships are grouped by their distinct threshold triple, which is a
+    small set in practice. Groups are sorted by min_cgpa, so the groups a
+    student's CGPA clears are a prefix found with ``np.searchsorted``; the
+    other two thresholds are checked on that prefix of groups only. Inside a
+    group, positions are ordered by deadline (latest first), so the postings
+    still open are a prefix of each group; those prefix lengths are computed
+    once per day. A lookup costs O(groups + eligible) instead of comparing
+    every posting.
+    """
+
+    def __init__(self, min_cgpa, required_experience, min_certifications, deadlines=None):
+        thresholds = np.column_stack([min_cgpa, required_experience, min_certifications]).astype(np.float64)
+        thresholds = thresholds.reshape(-1, 3)
+        # Missing thresholds never pass (as a NaN comparison would not)
+        thresholds[np.isnan(thresholds)] = np.inf
+        self.size = len(thresholds)
+
+        if deadlines is None:
+            self.deadlines = np.full(self.size, NO_DEADLINE, dtype=np.int64)
+        else:
+            self.deadlines = deadline_days(deadlines)
+
+        # Encode each threshold column, then the triple as one integer key; keys sort by min_cgpa first
+        values, codes = zip(*(np.unique(thresholds[:, i], return_inverse=True) for i in range(3)))
+        codes = [c.reshape(-1).astype(np.int64) for c in codes]
+        key = (codes[0] * len(values[1]) + codes[1]) * len(values[2]) + codes[2]
+        group_keys, group_of = np.unique(key, return_inverse=True)
+        group_of = group_of.reshape(-1)
+        cgpa_code, rest = np.divmod(group_keys, len(values[1]) * len(values[2]))
+        experience_code, certifications_code = np.divmod(rest, len(values[2]))
+        self.group_cgpa = values[0][cgpa_code]
+        self.group_experience = values[1][experience_code]
+        self.group_certifications = values[2][certifications_code]
+
+        # Positions ordered by group, then latest deadline first (stable, so catalog order within ties);
+        # int32 halves the two per-posting position arrays
+        self.order = np.lexsort((-self.deadlines, group_of)).astype(np.int32)
+        self.group_sorted = group_of[self.order].astype(np.int32)
+        self.deadline_sorted = self.deadlines[self.order]
+        self.group_start = np.searchsorted(self.group_sorted, np.arange(len(group_keys)))
+        self._open = (None, None)  # (day, open postings per group)
+
+    def __len__(self):
+        return self.size
+
+    def open_counts(self, today=None):
+        """Postings per group whose deadline is today or later, cached for the day"""
+        today = today_days() if today is None else today
+        day, counts = self._open
+        if day != today:
+            is_open = self.deadline_sorted >= today
+            counts = np.bincount(self.group_sorted[is_open], minlength=len(self.group_start))
+            self._open = (today, counts)
+        return counts
+
+    def open_mask(self, today=None):
+        """Boolean mask (catalog order) of postings still accepting applications"""
+        today = today_days() if today is None else today
+        return self.deadlines >= today
+
+    def candidates(self, cgpa, experience_years, certifications, today=None):
+        """Sorted positions of open internships whose minimum requirements the student meets"""
+        end = np.searchsorted(self.group_cgpa, cgpa, side='right')
+        groups = np.flatnonzero(
+            (self.group_experience[:end] <= experience_years) &
+            (self.group_certifications[:end] <= certifications)
+        )
+        counts = self.open_counts(today)[groups]
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=self.order.dtype)
+
+        # Concatenate the open prefix of every eligible group without a Python loop
+        starts = self.group_start[groups]
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        positions = self.order[offsets + np.arange(total)]
+        positions.sort()
+        return positions
@@ -0,0 +1,267 @@
+import sys
+import json
+import time
+import argparse
+import logging
+
+import numpy as np
+import pandas as pd
+from mysql.connector import Error
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: pip install pyarrow (Parquet exports only)
+    pa = pq = None
+
+from db import open_stream_connection
+from serialization import column_values, dumps
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# 1. EXPORT SETTINGS
+# ---------------------------
+EXPORT_CHUNK_ROWS = 2000      # catalog rows per fetch, JSON Lines chunk and Parquet row group
+EXPORT_CHUNK_STUDENTS = 500   # students fetched and scored at a time
+
+EXPORT_FORMATS = {
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet'
+}
+PARQUET_AVAILABLE = pq is not None
+PARQUET_MISSING_ERROR = "Parquet export needs pyarrow (pip install pyarrow)"
+
+# Column -> Parquet type. Values are the JSON-ready ones /internships and
+# /recommend return (serialization.column_values), so both formats agree.
+CATALOG_TYPES = {
+    'internship_id': 'int64',
+    'title': 'string',
+    'company_name': 'string',
+    'description': 'string',
+    'required_domain': 'string',
+    'min_cgpa': 'float64',
+    'required_experience': 'float64',
+    'min_certifications': 'float64',
+    'importance_domain': 'float64',
+    'importance_cgpa': 'float64',
+    'importance_experience': 'float64',
+    'importance_certifications': 'float64',
+    'location': 'string',
+    'duration_months': 'int64',
+    'stipend': 'float64',
+    'application_deadline': 'string',
+    'required_skills': 'string'
+}
+
+# One row per (student, recommendation), best first
+RECOMMENDATION_TYPES = {
+    'student_id': 'int64',
+    'rank': 'int64',
+    'internship_id': 'int64',
+    'title': 'string',
+    'company_name': 'string',
+    'location': 'string',
+    'stipend': 'float64',
+    'application_deadline': 'string',
+    'total_score': 'float64'
+}
+
+class ExportUnavailable(Exception):
+    pass
+
+# ---------------------------
+# 2. SERVER-SIDE CURSORS
+# ---------------------------
+def stream_rows(query, params=(), size=EXPORT_CHUNK_ROWS, dictionary=False):
+    """
+    Run query on an unbuffered cursor and return a generator of (column names, rows) chunks
+
+    MySQL sends the result set as it is read, so only ``size`` rows are held
+    at a time. The query runs (and ExportUnavailable is raised) before the
+    first chunk is requested, so callers can still report errors up front.
+    """
+    connection = open_stream_connection()
+    if connection is None:
+        raise ExportUnavailable("MySQL is unreachable")
+    try:
+        cursor = connection.cursor(buffered=False, dictionary=dictionary)
+        cursor.execute(query, params)
+    except Error as e:
+        connection.close()
+        raise ExportUnavailable(f"Export query failed: {e}")
+
+    def chunks():
+        try:
+            while True:
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    break
+                yield cursor.column_names, rows
+        finally:
+            connection.close()
+
+    return chunks()
+
+def catalog_chunks(size=EXPORT_CHUNK_ROWS):
+    """Active internships from the database as {column: values} chunks, newest first"""
+    from recommendation_api import INTERNSHIP_COLUMNS, select_list
+
+    select = select_list()
+    if select is None:
+        raise ExportUnavailable("MySQL is unreachable")
+    query = f"SELECT {', '.join(select)} FROM internships WHERE is_active = 1 ORDER BY created_at DESC"
+    rows = stream_rows(query, size=size)
+
+    def chunks():
+        for columns, chunk in rows:
+            df = pd.DataFrame.from_records(chunk, columns=columns, coerce_float=True)
+            yield {c: column_values(df, c) for c in INTERNSHIP_COLUMNS}
+
+    return chunks()
+
+def recommendation_chunks(snapshot, k, size=EXPORT_CHUNK_STUDENTS):
+    """
+    Top-k recommendations of every student profile as {column: values} chunks
+
+    Profiles are streamed from user_details and scored ``size`` at a time
+    against the catalog snapshot, from the same quantized profiles as
+    /recommend, so memory does not grow with the cohort.
+    """
+    from allocation import STUDENT_PROFILE_SQL, student_profile
+    from recommendation_api import recommend_internships_batch, scalers
+    from response_cache import quantize_profile
+
+    rows = stream_rows(STUDENT_PROFILE_SQL, size=size, dictionary=True)
+
+    def chunks():
+        for _, chunk in rows:
+            students = [student_profile(row) for row in chunk]
+            ranked = recommend_internships_batch(
+                [quantize_profile(s) for s in students], snapshot.frame, scalers, snapshot.index,
+                k=k, text=snapshot.text
+            )
+            frames = [r.assign(student_id=s['student_id'], rank=np.arange(1, len(r) + 1))
+                      for s, r in zip(students, ranked) if len(r)]
+            if frames:
+                df = pd.concat(frames, ignore_index=True)
+                yield {c: column_values(df, c) for c in RECOMMENDATION_TYPES}
+
+    return chunks()
+
+# ---------------------------
+# 3. STREAMING ENCODERS
+# ---------------------------
+def encode_jsonl(chunks):
+    """One JSON object per row; yields one bytes block per chunk"""
+    for columns in chunks:
+        names = list(columns)
+        yield b"".join(dumps(dict(zip(names, row))) + b"\n" for row in zip(*columns.values()))
+
+class _ChunkSink:
+    """Write-only file object that hands back what was written since the last take()"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+def encode_parquet(chunks, types):
+    """One Parquet row group per chunk; yields the file bytes as each group is written"""
+    if pq is None:
+        raise ExportUnavailable(PARQUET_MISSING_ERROR)
+    schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in types.items()])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for columns in chunks:
+            arrays = [pa.array(columns[field.name], type=field.type) for field in schema]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()  # writes the footer
+    yield sink.take()
+
+def encode(chunks, fmt, types):
+    if fmt == 'parquet':
+        return encode_parquet(chunks, types)
+    return encode_jsonl(chunks)
+
+# ---------------------------
+# 4. COMMAND LINE
+# ---------------------------
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Stream the catalog or every student's recommendations to a file")
+    parser.add_argument("what", choices=['internships', 'recommendations'])
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default='jsonl')
+    parser.add_argument("--output", default='-', help="file to write (default stdout; JSON Lines only)")
+    parser.add_argument("--top-k", type=int, default=None, help="recommendations per student")
+    args = parser.parse_args()
+
+    if args.format == 'parquet' and args.output == '-':
+        parser.error("--format parquet needs --output")
+
+    started = time.perf_counter()
+    try:
+        if args.what == 'internships':
+            chunks, types = catalog_chunks(), CATALOG_TYPES
+        else:
+            from recommendation_api import catalog
+            from scoring import TOP_K
+            snapshot = catalog.current()
+            if not catalog.ready:
+                raise ExportUnavailable("internship catalog could not be loaded")
+            chunks, types = recommendation_chunks(snapshot, args.top_k or TOP_K), RECOMMENDATION_TYPES
+
+        stats = {"rows": 0}
+
+        def counted(chunks):
+            for columns in chunks:
+                stats["rows"] += len(next(iter(columns.values())))
+                yield columns
+
+        out = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+        try:
+            written = 0
+            for block in encode(counted(chunks), args.format, types):
+                out.write(block)
+                written += len(block)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+    except (ExportUnavailable, Error) as e:
+        print(json.dumps({"error": f"Export failed: {e}"}), file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps({
+        "export": args.what,
+        "format": args.format,
+        "output": args.output,
+        "rows": stats["rows"],
+        "bytes": written,
+        "seconds": round(time.perf_counter() - started, 2)
+    }), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# 1. CACHE CONFIGURATION
+# ---------------------------
+# Set EXTRACTOR_CACHE_DIR to an empty string to disable caching
+CACHE_DIR = os.environ.get(
+    "EXTRACTOR_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".extract_cache")
+)
+CACHE_MAX_BYTES = int(os.environ.get("EXTRACTOR_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# ---------------------------
+# 2. CONTENT-ADDRESSED RESULT CACHE
+# ---------------------------
+class ExtractionCache:
+    """
+    On-disk cache of extraction results keyed by the SHA-256 of the PDF bytes
+
+    Entries live under ``<directory>/<version>/<key[:2]>/<key>.json``. The
+    version directory is the extractor version, so an upgrade simply stops
+    reading the old directory; stale versions are the first thing removed when
+    the cache grows past ``max_bytes``, followed by the least recently used
+    entries (hits refresh an entry's mtime).
+    """
+
+    def __init__(self, directory=CACHE_DIR, version="1", max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.version = str(version)
+        self.max_bytes = max_bytes
+        self._size = None  # bytes under the current version, computed on first put
+
+    @property
+    def enabled(self):
+        return bool(self.directory)
+
+    def key(self, pdf_path, mode=""):
+        """Hex digest of the file contents plus extraction mode, or None if the file cannot be read"""
+        if not self.enabled:
+            return None
+        digest = hashlib.sha256(mode.encode("utf-8") + b"\0")
+        try:
+            with open(pdf_path, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def key_bytes(self, data, mode=""):
+        """Same key as ``key`` for PDF contents already in memory (e.g. an upload)"""
+        if not self.enabled:
+            return None
+        digest = hashlib.sha256(mode.encode("utf-8") + b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, self.version, key[:2], key + ".json")
+
+    def get(self, key):
+        """Cached result for key, or None"""
+        if not key:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(path)  # mark as recently used
+            return result
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, result):
+        """Store a result atomically, then evict if the cache is over budget"""
+        if not key:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write extraction cache entry: {e}")
+            return
+
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += os.path.getsize(path)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        root = os.path.join(self.directory, self.version)
+        for dirpath, _, files in os.walk(root):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield stat.st_mtime, stat.st_size, path
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Drop other extractor versions, then least recently used entries down to 90% of max_bytes"""
+        try:
+            for name in os.listdir(self.directory):
+                if name != self.version:
+                    shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        except OSError:
+            pass
+
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+                size -= entry_size
+            except OSError:
+                continue
+        self._size = size
+        logger.info(f"Extraction cache evicted down to {size} bytes")
@@ -0,0 +1,393 @@
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import sqlite3
+import argparse
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+from mysql.connector import Error as MySQLError
+
+from db import get_db_connection
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# 1. QUEUE CONFIGURATION
+# ---------------------------
+# Empty: the jobs table lives in MySQL next to user_details (what submit_application.php uses).
+# A file path keeps the queue in a local SQLite database instead (development, bulk runs).
+JOBS_SQLITE_PATH = os.environ.get("EXTRACTION_JOBS_SQLITE", "")
+# Resume paths are stored relative to the PHP document root, i.e. this directory
+UPLOAD_ROOT = os.environ.get("EXTRACTION_UPLOAD_ROOT", os.path.dirname(os.path.abspath(__file__)))
+
+JOB_POLL_INTERVAL = 1.0    # seconds between queue polls while idle
+JOB_MAX_ATTEMPTS = 3       # a job that keeps failing is marked failed after this many runs
+JOB_STALE_AFTER = 300      # seconds after which a running job is assumed lost and requeued
+
+EXTRACTED_COLUMNS = {
+    'name': 'extracted_name',
+    'email': 'extracted_email',
+    'phone': 'extracted_phone',
+    'education': 'extracted_education',
+    'experience': 'extracted_experience',
+    'projects': 'extracted_projects',
+    'skills': 'extracted_skills',
+    'certifications': 'extracted_certifications'
+}
+
+JOB_COLUMNS = ['id', 'user_id', 'resume_path', 'status', 'attempts', 'error', 'result',
+               'created_at', 'started_at', 'finished_at']
+
+DB_ERRORS = (sqlite3.Error, MySQLError)
+
+JOB_SECONDS = REGISTRY.histogram('extract_job_seconds', "Extraction job run time, claim to finish", ['status'])
+JOB_WAIT_SECONDS = REGISTRY.histogram('extract_job_wait_seconds', "Time extraction jobs spend queued")
+
+# ---------------------------
+# 2. JOBS TABLE
+# ---------------------------
+MYSQL_SCHEMA = ["""
+    CREATE TABLE IF NOT EXISTS extraction_jobs (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        resume_path VARCHAR(255) NOT NULL,
+        status VARCHAR(16) NOT NULL DEFAULT 'queued',
+        attempts INT NOT NULL DEFAULT 0,
+        claimed_by VARCHAR(128) NULL,
+        error TEXT NULL,
+        result TEXT NULL,
+        created_at DOUBLE NOT NULL,
+        started_at DOUBLE NULL,
+        finished_at DOUBLE NULL,
+        INDEX idx_extraction_jobs_status (status, id),
+        INDEX idx_extraction_jobs_user (user_id, id)
+    )
+"""]
+
+SQLITE_SCHEMA = ["""
+    CREATE TABLE IF NOT EXISTS extraction_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        resume_path TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        claimed_by TEXT,
+        error TEXT,
+        result TEXT,
+        created_at REAL NOT NULL,
+        started_at REAL,
+        finished_at REAL
+    )
+""",
+    "CREATE INDEX IF NOT EXISTS idx_extraction_jobs_status ON extraction_jobs (status, id)",
+    "CREATE INDEX IF NOT EXISTS idx_extraction_jobs_user ON extraction_jobs (user_id, id)"
+]
+
+class JobStoreUnavailable(Exception):
+    pass
+
+class JobStore:
+    """
+    Extraction jobs table: queued -> running -> done | failed
+
+    Statements are written with ``%s`` placeholders (mysql-connector) and
+    rewritten to ``?`` for SQLite. Claiming is an optimistic
+    ``UPDATE ... WHERE status = 'queued'``, so several runners can share a
+    queue without locking reads.
+    """
+
+    def __init__(self, sqlite_path=JOBS_SQLITE_PATH):
+        self.sqlite_path = sqlite_path
+
+    @contextmanager
+    def _connect(self):
+        if self.sqlite_path:
+            connection = sqlite3.connect(self.sqlite_path, timeout=30)
+        else:
+            connection = get_db_connection()
+            if connection is None:
+                raise JobStoreUnavailable("MySQL is unreachable")
+        try:
+            cursor = connection.cursor()
+            yield cursor
+            connection.commit()
+            cursor.close()
+        finally:
+            connection.close()
+
+    def _execute(self, cursor, sql, params=()):
+        if self.sqlite_path:
+            sql = sql.replace('%s', '?')
+        cursor.execute(sql, params)
+
+    def create_table(self):
+        with self._connect() as cursor:
+            for statement in SQLITE_SCHEMA if self.sqlite_path else MYSQL_SCHEMA:
+                self._execute(cursor, statement)
+
+    def enqueue(self, user_id, resume_path):
+        """Queue one resume and return the job id"""
+        with self._connect() as cursor:
+            self._execute(cursor, "INSERT INTO extraction_jobs (user_id, resume_path, status, created_at) "
+                                  "VALUES (%s, %s, 'queued', %s)", (int(user_id), resume_path, time.time()))
+            return cursor.lastrowid
+
+    def claim(self, worker_id):
+        """Mark the oldest queued job as running for worker_id and return it, or None if the queue is empty"""
+        with self._connect() as cursor:
+            while True:
+                self._execute(cursor, "SELECT id FROM extraction_jobs WHERE status = 'queued' ORDER BY id LIMIT 1")
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                self._execute(cursor, "UPDATE extraction_jobs SET status = 'running', claimed_by = %s, "
+                                      "started_at = %s, attempts = attempts + 1 WHERE id = %s AND status = 'queued'",
+                              (worker_id, time.time(), row[0]))
+                if cursor.rowcount == 1:
+                    return self._fetch(cursor, row[0])
+                # Another runner claimed it between the SELECT and the UPDATE
+
+    def _fetch(self, cursor, job_id):
+        self._execute(cursor, f"SELECT {', '.join(JOB_COLUMNS)} FROM extraction_jobs WHERE id = %s", (job_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        job = dict(zip(JOB_COLUMNS, row))
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def get(self, job_id):
+        """Job status for polling; queued jobs include their position in the queue"""
+        with self._connect() as cursor:
+            job = self._fetch(cursor, job_id)
+            if job is not None and job['status'] == 'queued':
+                self._execute(cursor, "SELECT COUNT(*) FROM extraction_jobs WHERE status = 'queued' AND id < %s",
+                              (job_id,))
+                job['position'] = cursor.fetchone()[0]
+            return job
+
+    def finish(self, job, status, result=None, error=None):
+        with self._connect() as cursor:
+            self._execute(cursor, "UPDATE extraction_jobs SET status = %s, result = %s, error = %s, "
+                                  "finished_at = %s WHERE id = %s",
+                          (status, json.dumps(result) if result is not None else None, error, time.time(), job['id']))
+
+    def retry(self, job, error):
+        """Put a job back in the queue after a transient failure, or fail it once attempts run out; returns the new status"""
+        if job['attempts'] >= JOB_MAX_ATTEMPTS:
+            self.finish(job, 'failed', error=error)
+            return 'failed'
+        with self._connect() as cursor:
+            self._execute(cursor, "UPDATE extraction_jobs SET status = 'queued', claimed_by = NULL, error = %s "
+                                  "WHERE id = %s", (error, job['id']))
+        return 'queued'
+
+    def requeue_stale(self, older_than=JOB_STALE_AFTER):
+        """Requeue (or fail) running jobs whose runner died; returns the number of jobs touched"""
+        cutoff = time.time() - older_than
+        with self._connect() as cursor:
+            self._execute(cursor, "UPDATE extraction_jobs SET status = 'failed', error = %s, finished_at = %s "
+                                  "WHERE status = 'running' AND started_at < %s AND attempts >= %s",
+                          ("Extraction did not finish.", time.time(), cutoff, JOB_MAX_ATTEMPTS))
+            failed = cursor.rowcount
+            self._execute(cursor, "UPDATE extraction_jobs SET status = 'queued', claimed_by = NULL "
+                                  "WHERE status = 'running' AND started_at < %s", (cutoff,))
+            return failed + cursor.rowcount
+
+def resolve_path(resume_path):
+    return resume_path if os.path.isabs(resume_path) else os.path.join(UPLOAD_ROOT, resume_path)
+
+def apply_result(job, info):
+    """
+    Write extracted fields into user_details
+
+    Only updates the row while it still points at the job's resume, so a
+    slow job never overwrites data from a newer upload. Returns False if
+    MySQL is unreachable.
+    """
+    connection = get_db_connection()
+    if connection is None:
+        return False
+    try:
+        assignments = ", ".join(f"{column} = %s" for column in EXTRACTED_COLUMNS.values())
+        values = [info.get(field) for field in EXTRACTED_COLUMNS]
+        cursor = connection.cursor()
+        cursor.execute(f"UPDATE user_details SET {assignments} WHERE user_id = %s AND resume_path = %s",
+                       values + [job['user_id'], job['resume_path']])
+        connection.commit()
+        cursor.close()
+        return True
+    except MySQLError as e:
+        logger.error(f"Could not store extracted fields for job {job['id']}: {e}")
+        return False
+    finally:
+        connection.close()
+
+# ---------------------------
+# 3. JOB RUNNER
+# ---------------------------
+class JobRunner:
+    """
+    Feed queued jobs to an extraction process pool
+
+    A single dispatcher thread keeps up to ``slots`` jobs in flight: it claims
+    jobs, submits ``worker_extract_timed`` to the pool, and records each
+    outcome as it completes. The pool can be shared with the synchronous
+    ``/extract`` endpoint of extractor_service.py. ``notify`` wakes the
+    dispatcher right after an enqueue instead of at the next poll.
+    """
+
+    def __init__(self, store, pool, slots, poll_interval=JOB_POLL_INTERVAL):
+        self.store = store
+        self.pool = pool
+        self.slots = slots
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.in_flight = 0
+        self._events = queue.Queue()  # completed (job, future) pairs, or None as a wake-up
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.store.create_table()
+        self._thread = threading.Thread(target=self._run, name="extraction-jobs", daemon=True)
+        self._thread.start()
+
+    def notify(self):
+        self._events.put(None)
+
+    def stop(self):
+        """Stop claiming jobs and wait for those in flight"""
+        self._stop.set()
+        self.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        next_sweep = 0
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() >= next_sweep:
+                    requeued = self.store.requeue_stale()
+                    if requeued:
+                        logger.warning(f"Requeued {requeued} stale extraction jobs")
+                    next_sweep = time.monotonic() + JOB_STALE_AFTER / 2
+                while self.in_flight < self.slots:
+                    job = self.store.claim(self.worker_id)
+                    if job is None:
+                        break
+                    self._submit(job)
+            except (JobStoreUnavailable, *DB_ERRORS) as e:
+                logger.error(f"Extraction job queue unavailable: {e}")
+            self._wait(self.poll_interval)
+        while self.in_flight:
+            self._wait(None)
+
+    def _submit(self, job):
+        from extractor_cli import worker_extract_timed
+        JOB_WAIT_SECONDS.observe(job['started_at'] - job['created_at'])
+        future = self.pool.submit(worker_extract_timed, resolve_path(job['resume_path']))
+        self.in_flight += 1
+        future.add_done_callback(lambda f: self._events.put((job, f)))
+
+    def _wait(self, timeout):
+        """Block until a job completes, notify() is called or timeout passes; then record every completed job"""
+        try:
+            event = self._events.get(timeout=timeout)
+        except queue.Empty:
+            return
+        while True:
+            if event is not None:
+                self.in_flight -= 1
+                self._record(*event)
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                return
+
+    def _record(self, job, future):
+        try:
+            try:
+                info, timings = future.result()
+            except Exception as e:
+                logger.error(f"Extraction job {job['id']} crashed: {e}")
+                status = self.store.retry(job, f"Extraction failed: {e}")
+                return JOB_SECONDS.observe(time.time() - job['started_at'], status)
+            REGISTRY.merge(timings)
+            if 'error' in info:
+                status = 'failed'
+                self.store.finish(job, status, error=info['error'])
+            elif apply_result(job, info):
+                status = 'done'
+                self.store.finish(job, status, result=info)
+            else:
+                status = self.store.retry(job, "Could not store extracted fields.")
+            JOB_SECONDS.observe(time.time() - job['started_at'], status)
+        except (JobStoreUnavailable, *DB_ERRORS) as e:
+            # Left as running; requeue_stale() picks it up again
+            logger.error(f"Could not record extraction job {job['id']}: {e}")
+
+# ---------------------------
+# 4. COMMAND LINE
+# ---------------------------
+def run(store, workers, regex_only=False):
+    """Run a standalone job runner with its own extraction pool until interrupted"""
+    from extractor_cli import init_worker, worker_ready, MODEL_MISSING_ERROR
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(regex_only,))
+    if not all(f.result() for f in [pool.submit(worker_ready) for _ in range(workers)]):
+        logger.warning(MODEL_MISSING_ERROR)
+    runner = JobRunner(store, pool, workers)
+    runner.start()
+    print(f"📄 Extraction job runner started ({workers} workers)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        runner.stop()
+        pool.shutdown()
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Asynchronous resume extraction jobs")
+    parser.add_argument("--sqlite", default=JOBS_SQLITE_PATH,
+                        help="keep the queue in this SQLite file instead of MySQL")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="process queued jobs until interrupted")
+    run_parser.add_argument("--workers", type=int, default=max(1, min(4, os.cpu_count() or 1)))
+    run_parser.add_argument("--regex-only", action="store_true", help="skip spaCy entirely")
+    enqueue_parser = commands.add_parser("enqueue", help="queue a resume and print the job")
+    enqueue_parser.add_argument("user_id", type=int)
+    enqueue_parser.add_argument("resume_path")
+    status_parser = commands.add_parser("status", help="print a job")
+    status_parser.add_argument("job_id", type=int)
+    args = parser.parse_args()
+
+    store = JobStore(args.sqlite)
+    try:
+        if args.command == "run":
+            run(store, args.workers, args.regex_only)
+            return
+        if args.command == "enqueue":
+            store.create_table()
+            job = store.get(store.enqueue(args.user_id, args.resume_path))
+        else:
+            job = store.get(args.job_id)
+    except (JobStoreUnavailable, *DB_ERRORS) as e:
+        print(json.dumps({"error": f"Job queue unavailable: {e}"}))
+        sys.exit(1)
+    if job is None:
+        print(json.dumps({"error": "Job not found."}))
+        sys.exit(1)
+    print(json.dumps(job))
+
+if __name__ == "__main__":
+    main()
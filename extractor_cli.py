@@ -1,140 +1,519 @@
 import sys
 import json
-import fitz  # PyMuPDF
 import re
-import spacy
 import os
+import time
+import argparse
+import urllib.request
+import urllib.error
+from multiprocessing import Pool
+
+from extraction_cache import ExtractionCache
+from metrics import REGISTRY, Stopwatch, span
+
+# fitz (PyMuPDF) and spacy are imported lazily so the thin-client path below
+# starts in milliseconds when the extractor service is running.
+
+SPACY_MODEL = "en_core_web_sm"
+# Bump whenever extract_info() output changes; cached results of other versions are ignored
+EXTRACTOR_VERSION = "4"
+MODEL_MISSING_ERROR = "spaCy model 'en_core_web_sm' not found. Run 'python -m spacy download en_core_web_sm'"
+
+# Only NER is ever used; these pipes are disabled when the model is loaded
+NLP_DISABLED_PIPES = ["parser", "tagger", "attribute_ruler", "lemmatizer"]
+# NER only looks at the top of the resume, where the candidate's name is
+NER_WINDOW_CHARS = 1000
+
+# Long-lived extractor service (see extractor_service.py)
+SERVICE_URL = os.environ.get("EXTRACTOR_SERVICE_URL", "http://127.0.0.1:5001")
+SERVICE_CONNECT_TIMEOUT = 2
+SERVICE_TIMEOUT = 60
+
+# Timings, recorded in whichever process extracts (served by extractor_service.py /metrics)
+FIELD_SECONDS = REGISTRY.histogram('extract_field_seconds', "Time per extract_info() field", ['field'])
+STAGE_SECONDS = REGISTRY.histogram('extract_stage_seconds', "Time per resume extraction stage", ['stage'])
+
+# --- PAGE-BOUNDED PDF TEXT ---
+# A resume's sections are on its first pages; these bound work on hostile or huge PDFs
+MAX_PDF_PAGES = 10
+MAX_PDF_CHARS = 100_000
+PDF_TIME_BUDGET = 5.0  # seconds per document
+
+def iter_page_text(doc, max_pages=MAX_PDF_PAGES, max_chars=MAX_PDF_CHARS, time_budget=PDF_TIME_BUDGET):
+    """
+    Yield the text of each page, loading pages one at a time
+
+    Stops after ``max_pages`` pages, once ``max_chars`` characters have been
+    produced, or when ``time_budget`` seconds have passed (checked between pages).
+    There is deliberately no "all sections found" exit: education, project,
+    skill and certification lines are collected from the whole document, so
+    no page can be known to be the last one that contributes.
+    """
+    deadline = time.monotonic() + time_budget
+    chars = 0
+    for number in range(min(doc.page_count, max_pages)):
+        if chars >= max_chars or time.monotonic() > deadline:
+            break
+        text = doc.load_page(number).get_text()
+        chars += len(text)
+        yield text
 
 # --- THIS FUNCTION IS NEW/MODIFIED ---
 # Reads from a file path instead of a file stream
 def extract_text_from_pdf(pdf_path):
-    text = ""
+    import fitz  # PyMuPDF
     try:
         if not os.path.exists(pdf_path) or os.path.getsize(pdf_path) == 0:
             return None, f"File not found or is empty: {pdf_path}"
             
+        # fitz reads the file from its path on demand rather than loading it whole
         with fitz.open(pdf_path) as doc:
-            for page in doc:
-                text += page.get_text()
+            text = "".join(iter_page_text(doc))[:MAX_PDF_CHARS]
         if not text.strip():
             return None, "No text could be extracted from the PDF."
         return text, None
     except Exception as e:
         return None, f"Error opening PDF: {e}"
 
+def extract_text_from_pdf_bytes(data):
+    """Like extract_text_from_pdf, for a PDF already in memory (Streamlit uploads)"""
+    import fitz  # PyMuPDF
+    if not data:
+        return None, "The uploaded file is empty."
+    try:
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            text = "".join(iter_page_text(doc))[:MAX_PDF_CHARS]
+        if not text.strip():
+            return None, "No text could be extracted from the PDF."
+        return text, None
+    except Exception as e:
+        return None, f"Error opening PDF: {e}"
+
+# --- LAZY spaCy DOC ---
+class LazyDoc:
+    """Runs the spaCy pipeline on the resume header the first time a field asks for it"""
+
+    def __init__(self, nlp, text):
+        self.nlp = nlp
+        self.text = text[:NER_WINDOW_CHARS]
+        self._doc = None
+
+    def get(self):
+        if self.nlp is None:
+            return None
+        if self._doc is None:
+            self._doc = self.nlp(self.text)
+        return self._doc
+
+def extract_name_entity(lazy_doc):
+    """First PERSON entity in the resume header, or None"""
+    doc = lazy_doc.get()
+    if doc is None:
+        return None
+    for ent in doc.ents:
+        if ent.label_ == "PERSON" and "\n" not in ent.text.strip():
+            return ent.text.strip()
+    return None
+
+# --- ONE-PASS SECTION PARSER ---
+# Headings that open a section (a short line equal to, or starting with, one of these)
+SECTION_HEADINGS = {
+    "experience": ["experience", "work experience", "professional experience", "employment"],
+    "certifications": ["certification", "certificate"],
+}
+# Words that end a section when they appear anywhere in a following line
+SECTION_STOP_TOKENS = {
+    "experience": frozenset(["education", "project", "skills", "certification", "achievement", "awards", "interests"]),
+    "certifications": frozenset(["education", "project", "skills", "experience", "achievement", "awards", "interests"]),
+}
+_STOP_TOKEN_RE = re.compile("|".join(sorted(set().union(*SECTION_STOP_TOKENS.values()))))
+
+def heading_kind(lower_line):
+    """Section name if the (lowercased) line is a section heading, else None"""
+    if not lower_line or len(lower_line) > 60:
+        return None
+    for kind, tokens in SECTION_HEADINGS.items():
+        for tok in tokens:
+            if lower_line == tok or lower_line.startswith(tok + " ") or lower_line.startswith(tok + ":"):
+                return kind
+    return None
+
+class ResumeSections:
+    """
+    A resume split into lines and normalized once, with headings classified
+
+    ``lines`` and ``lower`` hold the stripped non-empty lines and their lowercase
+    form; ``sections`` maps each section name to the lines under its first
+    heading. Every field extractor reads from this instead of re-splitting text.
+    """
+
+    def __init__(self, text):
+        self.lines = []
+        self.lower = []
+        self.headings = []
+        self.mentions = []
+        starts = {}
+        for raw in text.split("\n"):
+            line = raw.strip()
+            if not line:
+                continue
+            low = line.lower()
+            kind = heading_kind(low)
+            self.lines.append(line)
+            self.lower.append(low)
+            self.headings.append(kind)
+            self.mentions.append(frozenset(_STOP_TOKEN_RE.findall(low)))
+            if kind and kind not in starts:
+                starts[kind] = len(self.lines)
+        self.sections = {kind: self._section_body(kind, start) for kind, start in starts.items()}
+
+    def _section_body(self, kind, start):
+        stop_tokens = SECTION_STOP_TOKENS[kind]
+        body = []
+        for i in range(start, len(self.lines)):
+            if self.headings[i] == kind or self.mentions[i] & stop_tokens:
+                break
+            body.append(self.lines[i])
+        return body
+
+# --- COMPILED KEYWORD MATCHER ---
+def _trie_regex(node):
+    """Regex for a character trie node; branches are tried longest-first"""
+    branches = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return "(?:" + body + ")?" if "" in node else body
+
+class KeywordMatcher:
+    """
+    Finds which keywords of a fixed vocabulary occur in a text in a single regex pass
+
+    The vocabulary is compiled into one trie-shaped alternation, so the cost per
+    text position depends on the trie depth, not on how many keywords there are.
+    Matching is case-insensitive and a keyword must not touch a letter or digit
+    on either side (so "C++" is found in "C++, Java" and "Java" is not found in
+    "JavaScript").
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self._canonical = {k.lower(): k for k in self.keywords}
+        trie = {}
+        for word in self._canonical:
+            node = trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        self.pattern = re.compile(r"(?<![a-z0-9])" + _trie_regex(trie) + r"(?![a-z0-9])")
+
+    def find(self, text):
+        """Keywords present in text, in vocabulary order"""
+        found = {self._canonical[m.group(0)] for m in self.pattern.finditer(text.lower())}
+        return [k for k in self.keywords if k in found]
+
+# --- FIELD VOCABULARIES ---
+EDU_KEYWORDS = ["B.Tech", "B.E", "M.Tech", "Bachelor", "Master", "Degree", "University", "College"]
+EDU_EXCLUDE = ["coursera", "university of colorado"]
+PROJ_KEYWORDS = ["Project", "Developed", "Implemented", "Built", "Designed", "Created"]
+SKILLS_KEYWORDS = ["Java", "Python", "C++", "C", "HTML", "CSS", "JavaScript", "PHP", "MySQL", "Machine Learning", "AI", "React", "Node.js", "MongoDB", "Git", "Docker", "AWS", "Azure", "GCP"]
+
+_EDU_RE = re.compile("|".join(re.escape(k) for k in EDU_KEYWORDS))
+_EDU_EXCLUDE_RE = re.compile("|".join(re.escape(k) for k in EDU_EXCLUDE))
+_PROJ_RE = re.compile("|".join(re.escape(k.lower()) for k in PROJ_KEYWORDS))
+_BULLET_RE = re.compile(r'^[\u2022\-\*\d.\s]+')
+_DIGIT_RE = re.compile(r'\d')
+_EMAIL_RE = re.compile(r'\S+@\S+')
+_PHONE_RE = re.compile(r'\+?\d[\d\s-]{8,}\d')
+skills_matcher = KeywordMatcher(SKILLS_KEYWORDS)
+
 # --- THIS FUNCTION IS FROM YOUR SCRIPT (with fixes) ---
-def extract_info(text, nlp):
+def extract_info(text, nlp=None):
+    """
+    Extract resume fields from plain text
+
+    The text is split and classified once by ResumeSections; every field reads
+    from that. ``nlp`` is only run (lazily, on the first NER_WINDOW_CHARS
+    characters) when the name heuristic fails; pass None for regex-only mode.
+    """
     info = {}
-    doc = nlp(text)
+    timer = Stopwatch(FIELD_SECONDS)
+    lazy_doc = LazyDoc(nlp, text)
+    resume = ResumeSections(text)
+    lines, lower_lines = resume.lines, resume.lower
+    timer.lap("sections")
 
     # ======= NAME =======
-    def extract_full_name(text):
-        lines = [line.strip() for line in text.split("\n") if line.strip()]
+    def extract_full_name(lines):
         for line in lines[:5]:
-            if "@" in line or re.search(r'\d', line): continue
+            if "@" in line or _DIGIT_RE.search(line): continue
             words = line.split()
             if 1 < len(words) <= 4 and all(w[0].isupper() for w in words if w.isalpha()):
                 return line
         return None
-    info["name"] = extract_full_name(text)
+    info["name"] = extract_full_name(lines) or extract_name_entity(lazy_doc)
+    timer.lap("name")
 
     # ======= EMAIL =======
-    email = re.findall(r'\S+@\S+', text)
-    info["email"] = email[0] if email else None
+    email = _EMAIL_RE.search(text)
+    info["email"] = email.group(0) if email else None
+    timer.lap("email")
 
     # ======= PHONE =======
-    phone = re.findall(r'\+?\d[\d\s-]{8,}\d', text)
-    info["phone"] = phone[0] if phone else None
+    phone = _PHONE_RE.search(text)
+    info["phone"] = phone.group(0) if phone else None
+    timer.lap("phone")
     
     # ======= EDUCATION =======
-    edu_keywords = ["B.Tech", "B.E", "M.Tech", "Bachelor", "Master", "Degree", "University", "College"]
-    education_lines = [line.strip() for line in text.split("\n") if any(k in line for k in edu_keywords)]
-    filtered_education = [l for l in education_lines if not any(substr in l.lower() for substr in ["coursera", "university of colorado"])]
+    filtered_education = [
+        line for line, low in zip(lines, lower_lines)
+        if _EDU_RE.search(line) and not _EDU_EXCLUDE_RE.search(low)
+    ]
     info["education"] = " | ".join(filtered_education) if filtered_education else "Not Mentioned"
+    timer.lap("education")
 
     # ======= EXPERIENCE =======
-    lines = [line.strip() for line in text.split("\n") if line.strip()]
-    lower_lines = [l.lower() for l in lines]
-    exp_heading_tokens = ["experience", "work experience", "professional experience", "employment"]
-    def is_heading_line(line):
-        s = line.strip().lower()
-        if not s or len(s) > 60: return False
-        for tok in exp_heading_tokens:
-            if s == tok or s.startswith(tok + " ") or s.startswith(tok + ":"): return True
-        return False
-    has_exp_heading = any(is_heading_line(l) for l in lines)
-    if has_exp_heading:
-        start_idx = None
-        for i, l in enumerate(lines):
-            if is_heading_line(l): start_idx = i + 1; break
-        exp_section = []
-        stop_tokens = ["education", "project", "skills", "certification", "achievement", "awards", "interests"]
-        if start_idx is not None:
-            for line in lines[start_idx:]:
-                if is_heading_line(line) or any(tok in line.lower() for tok in stop_tokens): break
-                exp_section.append(line)
-        info["experience"] = " | ".join(exp_section) if exp_section else "NOT APPLICABLE"
-    else:
-        info["experience"] = "NOT APPLICABLE"
+    exp_section = resume.sections.get("experience", [])
+    info["experience"] = " | ".join(exp_section) if exp_section else "NOT APPLICABLE"
+    timer.lap("experience")
 
     # ======= PROJECTS =======
-    proj_keywords = ["Project", "Developed", "Implemented", "Built", "Designed", "Created"]
-    project_lines = [line.strip() for line in text.split("\n") if any(k.lower() in line.lower() for k in proj_keywords)]
+    project_lines = [line for line, low in zip(lines, lower_lines) if _PROJ_RE.search(low)]
     info["projects"] = " | ".join(project_lines) if project_lines else "Not Applicable"
+    timer.lap("projects")
 
     # ======= SKILLS =======
-    skills_keywords = ["Java", "Python", "C++", "C", "HTML", "CSS", "JavaScript", "PHP", "MySQL", "Machine Learning", "AI", "React", "Node.js", "MongoDB", "Git", "Docker", "AWS", "Azure", "GCP"]
-    found_skills = [skill for skill in skills_keywords if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE)]
-    info["skills"] = ", ".join(list(set(found_skills))) if found_skills else "Not Mentioned"
+    found_skills = skills_matcher.find(text)
+    info["skills"] = ", ".join(found_skills) if found_skills else "Not Mentioned"
+    timer.lap("skills")
 
     # ======= CERTIFICATIONS =======
-    lines = [line.strip() for line in text.split("\n") if line.strip()]
-    certs = []
-    start_idx = None
-    cert_heading_tokens = ["certification", "certificate"]
-    def is_cert_heading(line):
-        s = line.strip().lower()
-        if not s or len(s) > 60: return False
-        for tok in cert_heading_tokens:
-            if s == tok or s.startswith(tok + " ") or s.startswith(tok + ":"): return True
-        return False
-    for i, line in enumerate(lines):
-        if is_cert_heading(line): start_idx = i + 1; break
-    if start_idx is not None:
-        stop_tokens = ["education", "project", "skills", "experience", "achievement", "awards", "interests"]
-        for line in lines[start_idx:]:
-            if is_cert_heading(line) or any(tok in line.lower() for tok in stop_tokens): break
-            if line.strip():
-                clean_line = re.sub(r'^[\u2022\-\*\d.\s]+', '', line)
-                certs.append(clean_line)
+    certs = [_BULLET_RE.sub('', line) for line in resume.sections.get("certifications", [])]
     info["certifications"] = " | ".join(certs) if certs else "Not Mentioned"
+    timer.lap("certifications")
 
     return info
 
+# --- SHARED PIPELINE (used by main(), extractor_service.py and resume_extractor.py) ---
+def load_nlp():
+    """Load the spaCy model with unused pipes disabled, or return None if it is not installed"""
+    try:
+        import spacy
+        return spacy.load(SPACY_MODEL, disable=NLP_DISABLED_PIPES)
+    except Exception:
+        return None
+
+# Results keyed by PDF content, so re-submitting the same resume skips extraction
+result_cache = ExtractionCache(version=EXTRACTOR_VERSION)
+
+def _cache_mode(regex_only):
+    return "regex" if regex_only else SPACY_MODEL
+
+def cached_resume(pdf_path, regex_only=False):
+    """Previously extracted fields for this exact PDF content, or None"""
+    return result_cache.get(result_cache.key(pdf_path, _cache_mode(regex_only)))
+
+def extract_resume(pdf_path, nlp, regex_only=False):
+    """Extract text and fields from one PDF; failures are returned as {"error": ...}"""
+    return _extract_cached(lambda mode: result_cache.key(pdf_path, mode),
+                           lambda: extract_text_from_pdf(pdf_path), nlp, regex_only)
+
+def extract_resume_bytes(data, nlp, regex_only=False):
+    """extract_resume for a PDF already in memory; shares the result cache (keyed by content)"""
+    return _extract_cached(lambda mode: result_cache.key_bytes(data, mode),
+                           lambda: extract_text_from_pdf_bytes(data), nlp, regex_only)
+
+def _extract_cached(cache_key_for, read_text, nlp, regex_only):
+    with span(STAGE_SECONDS, "cache_lookup"):
+        cache_key = cache_key_for(_cache_mode(regex_only))
+        cached = result_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    if nlp is None and not regex_only:
+        return {"error": MODEL_MISSING_ERROR}
+    with span(STAGE_SECONDS, "pdf_text"):
+        pdf_text, error = read_text()
+    if error:
+        return {"error": error}
+    if not pdf_text:
+        return {"error": "Could not extract text from PDF."}
+    with span(STAGE_SECONDS, "fields"):
+        info = extract_info(pdf_text, nlp)
+    result_cache.put(cache_key, info)
+    return info
+
+# --- WORKER PROCESS STATE (bulk mode, extractor_service.py and resume_extractor.py) ---
+# Set once per process by the pool initializer so the model is loaded only once
+_worker_nlp = None
+_worker_regex_only = False
+
+def init_worker(regex_only=False):
+    global _worker_nlp, _worker_regex_only
+    REGISTRY.drain()  # forked workers start with a copy of the parent's timings; report only their own
+    _worker_regex_only = regex_only
+    if not regex_only:
+        _worker_nlp = load_nlp()
+
+def worker_extract(pdf_path):
+    return extract_resume(pdf_path, _worker_nlp, regex_only=_worker_regex_only)
+
+def worker_extract_timed(pdf_path):
+    """worker_extract plus the timings recorded in this worker since the last call, for the parent to merge"""
+    result = worker_extract(pdf_path)
+    return result, REGISTRY.drain()
+
+def worker_extract_bytes(data, regex_only=False):
+    """worker_extract for an uploaded PDF; regex_only skips the worker's model for this file only"""
+    regex_only = regex_only or _worker_regex_only
+    return extract_resume_bytes(data, None if regex_only else _worker_nlp, regex_only=regex_only)
+
+def worker_ready():
+    return _worker_regex_only or _worker_nlp is not None
+
+def _bulk_extract(pdf_path):
+    return {"path": pdf_path, **worker_extract(pdf_path)}
+
+# --- BULK MODE ---
+def iter_bulk_sources(source):
+    """Absolute PDF paths from a directory (searched recursively) or a manifest file with one path per line"""
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(".pdf"):
+                    yield os.path.abspath(os.path.join(root, name))
+    else:
+        base = os.path.dirname(os.path.abspath(source))
+        with open(source, encoding="utf-8") as manifest:
+            for line in manifest:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield os.path.abspath(os.path.join(base, line))
+
+def load_processed(output_path):
+    """Paths already recorded in a JSON Lines output file (a torn last line is ignored)"""
+    processed = set()
+    if not output_path or output_path == "-" or not os.path.exists(output_path):
+        return processed
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                processed.add(json.loads(line)["path"])
+            except (ValueError, KeyError, TypeError):
+                continue
+    return processed
+
+def run_bulk(source, output_path="-", workers=None, regex_only=False):
+    """
+    Extract every PDF from ``source`` with a process pool, streaming JSON Lines
+
+    Each output line is ``{"path": ..., <fields or "error">}`` written as soon as
+    that file finishes (in completion order). Files already present in
+    ``output_path`` are skipped, so an interrupted run can simply be restarted.
+    Returns a summary with throughput in resumes/second, or ``{"error": ...}``
+    without processing anything if the workers could not load the spaCy model.
+    """
+    processed = load_processed(output_path)
+    pending = [path for path in iter_bulk_sources(source) if path not in processed]
+    workers = workers or os.cpu_count() or 1
+
+    if output_path == "-":
+        out = sys.stdout
+    else:
+        out = open(output_path, "a", encoding="utf-8")
+        if out.tell() > 0:
+            out.write("\n")  # terminate a line torn by a crash; blank lines are skipped on resume
+
+    started = time.perf_counter()
+    done = errors = 0
+    try:
+        with Pool(workers, initializer=init_worker, initargs=(regex_only,)) as pool:
+            if not pool.apply(worker_ready):
+                return {"error": MODEL_MISSING_ERROR}
+            for record in pool.imap_unordered(_bulk_extract, pending, chunksize=1):
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                done += 1
+                errors += "error" in record
+                if done % 100 == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"{done}/{len(pending)} resumes, {done / elapsed:.1f} resumes/s", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "processed": done,
+        "errors": errors,
+        "skipped": len(processed),
+        "workers": workers,
+        "seconds": round(elapsed, 2),
+        "resumes_per_second": round(done / elapsed, 2) if elapsed > 0 else None
+    }
+
+# --- THIN CLIENT FOR THE EXTRACTOR SERVICE ---
+def extract_via_service(pdf_path, url=SERVICE_URL):
+    """Ask a running extractor service to process the file; returns None if none is reachable"""
+    payload = json.dumps({"path": os.path.abspath(pdf_path)}).encode("utf-8")
+    req = urllib.request.Request(url.rstrip("/") + "/extract", data=payload,
+                                 headers={"Content-Type": "application/json"})
+    try:
+        # Probe first with a short timeout so a missing service costs ~nothing
+        with urllib.request.urlopen(url.rstrip("/") + "/health", timeout=SERVICE_CONNECT_TIMEOUT):
+            pass
+        with urllib.request.urlopen(req, timeout=SERVICE_TIMEOUT) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        try:
+            return json.loads(e.read().decode("utf-8"))
+        except ValueError:
+            return None
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
 # --- MAIN EXECUTION BLOCK ---
 def main():
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description="Extract resume fields from PDFs as JSON")
+    parser.add_argument("pdf_path", nargs="?", help="single PDF to extract")
+    parser.add_argument("--in-process", action="store_true",
+                        help="do not use the extractor service even if it is running")
+    parser.add_argument("--regex-only", action="store_true", help="skip spaCy entirely")
+    parser.add_argument("--bulk", metavar="SOURCE",
+                        help="directory of PDFs or manifest file (one path per line) to process in bulk")
+    parser.add_argument("--output", default="-",
+                        help="bulk mode: JSON Lines file to append to (enables resuming); default stdout; "
+                             "exits 1 if any file failed")
+    parser.add_argument("--workers", type=int, default=None, help="bulk mode: worker processes")
+    args = parser.parse_args()
+    in_process = args.in_process or os.environ.get("EXTRACTOR_IN_PROCESS") == "1"
+    regex_only = args.regex_only
+
+    if args.bulk:
+        summary = run_bulk(args.bulk, args.output, args.workers, regex_only)
+        print(json.dumps(summary), file=sys.stderr)
+        if "error" in summary or summary["errors"]:
+            sys.exit(1)
+        return
+
+    if not args.pdf_path:
         print(json.dumps({"error": "No file path provided."}))
         sys.exit(1)
 
-    pdf_path = sys.argv[1]
+    pdf_path = args.pdf_path
 
-    try:
-        nlp = spacy.load("en_core_web_sm")
-    except:
-        print(json.dumps({"error": "spaCy model 'en_core_web_sm' not found. Run 'python -m spacy download en_core_web_sm'"}))
-        sys.exit(1)
+    if regex_only:
+        # Fast mode: no spaCy import or model load at all
+        result = extract_resume(pdf_path, None, regex_only=True)
+    else:
+        result = None if in_process else extract_via_service(pdf_path)
+        if result is None:
+            # No service running: answer from the cache, or load the model in this process
+            result = cached_resume(pdf_path) or extract_resume(pdf_path, load_nlp())
 
-    pdf_text, error = extract_text_from_pdf(pdf_path)
-    if error:
-        print(json.dumps({"error": error}))
+    print(json.dumps(result)) # Print data as JSON
+    if "error" in result:
         sys.exit(1)
-        
-    if pdf_text:
-        extracted_data = extract_info(pdf_text, nlp)
-        print(json.dumps(extracted_data)) # Print data as JSON
-    else:
-        print(json.dumps({"error": "Could not extract text from PDF."}))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
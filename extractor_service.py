@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from extractor_cli import init_worker, worker_extract_timed, worker_ready, MODEL_MISSING_ERROR
+from metrics import REGISTRY, CONTENT_TYPE
+from extraction_jobs import DB_ERRORS, JOBS_SQLITE_PATH, JobRunner, JobStore, JobStoreUnavailable, resolve_path
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# 1. SERVICE CONFIGURATION
+# ---------------------------
+DEFAULT_HOST = '127.0.0.1'   # local only: the service reads files from disk by path
+DEFAULT_PORT = 5001
+DEFAULT_WORKERS = max(1, min(4, os.cpu_count() or 1))
+REQUEST_TIMEOUT = 60         # seconds a single extraction may take
+
+REQUEST_SECONDS = REGISTRY.histogram('extract_request_seconds', "POST /extract latency", ['status'])
+
+# ---------------------------
+# 2. HTTP PROTOCOL
+# ---------------------------
+class ExtractorHandler(BaseHTTPRequestHandler):
+    """
+    GET  /health   -> {"status": "healthy", "workers": N}
+    GET  /metrics  -> Prometheus text; worker timings are merged in after each extraction
+    POST /extract  {"path": "/abs/path/resume.pdf"} -> extract_info() fields or {"error": ...}
+
+    With --jobs:
+    POST /jobs       {"user_id": 1, "path": "uploads/1_x.pdf"} -> 202 {"id": ..., "status": "queued", ...}
+    GET  /jobs/<id>  -> job status; "result" holds the extracted fields once "done"
+    """
+
+    def _send_json(self, body, status=200):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            data = REGISTRY.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        if self.path.startswith('/jobs/') and self.server.jobs:
+            return self._job_status(self.path[len('/jobs/'):])
+        if self.path != '/health':
+            return self._send_json({"error": "Not found"}, 404)
+        self._send_json({"status": "healthy", "workers": self.server.workers})
+
+    def do_POST(self):
+        if self.path == '/jobs' and self.server.jobs:
+            return self._enqueue()
+        if self.path != '/extract':
+            return self._send_json({"error": "Not found"}, 404)
+        started = time.perf_counter()
+        status = self._extract()
+        REQUEST_SECONDS.observe(time.perf_counter() - started, str(status))
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _allowed(self, pdf_path):
+        root = self.server.root
+        return not root or os.path.commonpath([root, pdf_path]) == root
+
+    def _extract(self):
+        """Handle POST /extract and return the status code sent"""
+        try:
+            pdf_path = os.path.abspath(self._read_json()['path'])
+        except (ValueError, KeyError, TypeError):
+            self._send_json({"error": "Expected JSON body with a 'path'"}, 400)
+            return 400
+
+        if not self._allowed(pdf_path):
+            self._send_json({"error": f"Path outside allowed directory: {pdf_path}"}, 403)
+            return 403
+
+        future = self.server.pool.submit(worker_extract_timed, pdf_path)
+        try:
+            result, timings = future.result(timeout=REQUEST_TIMEOUT)
+        except FutureTimeout:
+            future.cancel()
+            self._send_json({"error": "Extraction timed out."}, 504)
+            return 504
+        except Exception as e:
+            logger.error(f"Extraction failed for {pdf_path}: {e}")
+            self._send_json({"error": f"Extraction failed: {e}"}, 500)
+            return 500
+        REGISTRY.merge(timings)
+        self._send_json(result)
+        return 200
+
+    def _enqueue(self):
+        try:
+            payload = self._read_json()
+            user_id, resume_path = int(payload['user_id']), payload['path']
+        except (ValueError, KeyError, TypeError):
+            return self._send_json({"error": "Expected JSON body with 'user_id' and 'path'"}, 400)
+        if not self._allowed(os.path.abspath(resolve_path(resume_path))):
+            return self._send_json({"error": f"Path outside allowed directory: {resume_path}"}, 403)
+        try:
+            job = self.server.jobs.store.get(self.server.jobs.store.enqueue(user_id, resume_path))
+        except (JobStoreUnavailable, *DB_ERRORS) as e:
+            logger.error(f"Could not enqueue {resume_path}: {e}")
+            return self._send_json({"error": "Job queue unavailable."}, 503)
+        self.server.jobs.notify()
+        self._send_json(job, 202)
+
+    def _job_status(self, job_id):
+        try:
+            job = self.server.jobs.store.get(int(job_id))
+        except ValueError:
+            return self._send_json({"error": "Job id must be an integer"}, 400)
+        except (JobStoreUnavailable, *DB_ERRORS) as e:
+            logger.error(f"Could not read job {job_id}: {e}")
+            return self._send_json({"error": "Job queue unavailable."}, 503)
+        if job is None:
+            return self._send_json({"error": "Job not found."}, 404)
+        self._send_json(job)
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s" % (self.address_string(), format % args))
+
+# ---------------------------
+# 3. RUN THE SERVICE
+# ---------------------------
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS, root=None, regex_only=False,
+          jobs=False, jobs_sqlite=JOBS_SQLITE_PATH):
+    """
+    Start the worker pool, wait until every worker has its model loaded, then serve forever
+
+    Each worker process loads the spaCy model exactly once, in the pool initializer.
+    With ``jobs`` a JobRunner also processes the extraction job queue on the same pool.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(regex_only,))
+    warmup = [pool.submit(worker_ready) for _ in range(workers)]
+    if not all(f.result() for f in warmup):
+        logger.warning(MODEL_MISSING_ERROR)
+
+    server = ThreadingHTTPServer((host, port), ExtractorHandler)
+    server.daemon_threads = True
+    server.pool = pool
+    server.workers = workers
+    server.root = os.path.abspath(root) if root else None
+    server.jobs = None
+    if jobs:
+        server.jobs = JobRunner(JobStore(jobs_sqlite), pool, workers)
+        server.jobs.start()
+
+    print(f"📄 Resume extractor service on http://{host}:{port} ({workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if server.jobs:
+            server.jobs.stop()
+        pool.shutdown(cancel_futures=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-lived resume extraction service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="extraction processes, each holding its own spaCy model")
+    parser.add_argument("--root", default=None,
+                        help="only accept files inside this directory (e.g. the uploads folder)")
+    parser.add_argument("--regex-only", action="store_true",
+                        help="skip spaCy entirely; all fields come from regexes and line scans")
+    parser.add_argument("--jobs", action="store_true",
+                        help="also process the asynchronous extraction job queue (see extraction_jobs.py)")
+    parser.add_argument("--jobs-sqlite", default=JOBS_SQLITE_PATH,
+                        help="keep the job queue in this SQLite file instead of MySQL")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.root, args.regex_only, args.jobs, args.jobs_sqlite)
+
+if __name__ == "__main__":
+    main()
@@ -30,7 +30,8 @@ try {
             ud.domain,
             ud.cgpa,
             ud.total_experience as experience_years,
-            ud.certifications
+            ud.certifications,
+            CONCAT_WS(', ', ud.skills, ud.extracted_skills) as skills
         FROM user_details ud
         WHERE ud.user_id = ?
     ");
@@ -59,12 +60,44 @@ try {
         exit;
     }
     
+    // Serve the precomputed recommendations (materializer.py) when they are current:
+    // same profile, same catalog, no recommended posting closed, and a recent sweep.
+    // The SHA1 expression must stay identical to PROFILE_HASH_SQL in materializer.py.
+    $materialized_table = $conn->query("SHOW TABLES LIKE 'student_recommendations'");
+    if ($materialized_table && $materialized_table->num_rows > 0) {
+        $max_staleness = 120; // MATERIALIZE_MAX_STALENESS
+        $stmt = $conn->prepare("
+            SELECT r.body
+            FROM student_recommendations r
+            JOIN user_details ud ON ud.user_id = r.user_id
+            JOIN recommendation_state s ON s.id = 1
+            WHERE r.user_id = ?
+              AND r.profile_hash = SHA1(CONCAT_WS('|', ud.domain, ud.cgpa, COALESCE(ud.total_experience, ''),
+                  COALESCE(ud.certifications, ''), COALESCE(ud.skills, ''), COALESCE(ud.extracted_skills, '')))
+              AND r.catalog_hash = s.catalog_hash
+              AND (r.valid_until IS NULL OR r.valid_until > UNIX_TIMESTAMP())
+              AND s.verified_at > UNIX_TIMESTAMP() - ?
+        ");
+        $stmt->bind_param("ii", $user_id, $max_staleness);
+        $stmt->execute();
+        $materialized = $stmt->get_result()->fetch_assoc();
+        $stmt->close();
+
+        if ($materialized) {
+            echo $materialized['body'];
+            $conn->close();
+            exit;
+        }
+    }
+
+    // Otherwise compute them live
     // Prepare data for Flask API
     $student_data = [
         'domain' => $user_profile['domain'] ?? 'General',
         'cgpa' => floatval($user_profile['cgpa'] ?? 0),
         'experience_years' => floatval($user_profile['experience_years'] ?? 0),
-        'certifications' => intval($user_profile['certifications'] ?? 0)
+        'certifications' => intval($user_profile['certifications'] ?? 0),
+        'skills' => $user_profile['skills'] ?? ''
     ];
     
     // Call Flask API
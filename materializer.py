@@ -0,0 +1,440 @@
+import sys
+import json
+import time
+import hashlib
+import datetime
+import argparse
+import logging
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from mysql.connector import Error
+
+from db import get_db_connection
+from eligibility import NO_DEADLINE
+from metrics import REGISTRY, span
+from response_cache import quantize_profile, profile_key
+from scoring import ScoringIndex, TOP_K
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# 1. MATERIALIZER SETTINGS
+# ---------------------------
+MATERIALIZE_INTERVAL = 15        # seconds between sweeps of profiles and catalog
+MATERIALIZE_MAX_STALENESS = 120  # readers fall back to /recommend once the last sweep is older than this
+MATERIALIZE_WRITE_BATCH = 500    # rows per INSERT/DELETE statement
+AFFECTED_MAX_CELLS = 4_000_000   # students x changed internships per score matrix
+KTH_SCORE_TOLERANCE = 1e-9       # slack on stored k-th scores (rows written by an older scoring order)
+
+# Profile fingerprint computed by MySQL, so the materializer and get_recommendations.php
+# agree on it without re-implementing number formatting. Keep the PHP copy in sync.
+PROFILE_HASH_SQL = ("SHA1(CONCAT_WS('|', ud.domain, ud.cgpa, COALESCE(ud.total_experience, ''), "
+                    "COALESCE(ud.certifications, ''), COALESCE(ud.skills, ''), COALESCE(ud.extracted_skills, '')))")
+
+SWEEP_SECONDS = REGISTRY.histogram('materialize_sweep_seconds', "Materializer sweep stages", ['stage'])
+
+# ---------------------------
+# 2. RECOMMENDATIONS TABLE
+# ---------------------------
+SCHEMA = ["""
+    CREATE TABLE IF NOT EXISTS student_recommendations (
+        user_id INT PRIMARY KEY,
+        profile_hash CHAR(40) NOT NULL,
+        catalog_hash CHAR(40) NOT NULL,
+        internship_ids TEXT NOT NULL,
+        kth_score DOUBLE NULL,
+        valid_until DOUBLE NULL,
+        body MEDIUMTEXT NOT NULL,
+        computed_at DOUBLE NOT NULL,
+        INDEX idx_student_recommendations_catalog (catalog_hash)
+    )
+""", """
+    CREATE TABLE IF NOT EXISTS recommendation_state (
+        id TINYINT PRIMARY KEY,
+        catalog_hash CHAR(40) NOT NULL,
+        verified_at DOUBLE NOT NULL
+    )
+"""]
+
+# What the materializer needs to decide whether a stored row is still current:
+# internship_ids best first, kth_score is the lowest stored score when the list
+# is full (None with fewer than k results) and valid_until the moment the first
+# recommended posting closes (None if none has a deadline)
+Stored = namedtuple('Stored', ['profile_hash', 'catalog_hash', 'internship_ids', 'kth_score', 'valid_until'])
+
+class StoreUnavailable(Exception):
+    pass
+
+class RecommendationStore:
+    """
+    ``student_recommendations`` holds one precomputed /recommend body per student
+
+    ``recommendation_state`` has a single row with the catalog fingerprint the
+    table is current for and the time of the last completed sweep. A stored
+    body is served only while its profile_hash matches the live profile, its
+    catalog_hash matches the state row, no recommended posting has closed and
+    the last sweep is recent (see get_recommendations.php).
+    """
+
+    def _connect(self):
+        connection = get_db_connection()
+        if connection is None:
+            raise StoreUnavailable("MySQL is unreachable")
+        return connection
+
+    def _run(self, statements):
+        """Execute (sql, params) pairs in one transaction"""
+        connection = self._connect()
+        try:
+            cursor = connection.cursor()
+            for sql, params in statements:
+                cursor.execute(sql, params)
+            connection.commit()
+            cursor.close()
+        finally:
+            connection.close()
+
+    def create_table(self):
+        self._run([(statement, ()) for statement in SCHEMA])
+
+    def load(self):
+        """Every stored row as {user_id: Stored}, without the bodies"""
+        connection = self._connect()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT user_id, profile_hash, catalog_hash, internship_ids, kth_score, valid_until "
+                           "FROM student_recommendations")
+            rows = {
+                user_id: Stored(profile_hash, catalog_hash, [int(i) for i in ids.split(',') if i], kth_score, valid_until)
+                for user_id, profile_hash, catalog_hash, ids, kth_score, valid_until in cursor.fetchall()
+            }
+            cursor.close()
+            return rows
+        finally:
+            connection.close()
+
+    def load_profiles(self):
+        """Scorable student profiles with their PROFILE_HASH_SQL fingerprint, keyed by user_id"""
+        connection = self._connect()
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(f"""
+                SELECT ud.user_id, ud.domain, ud.cgpa,
+                       ud.total_experience AS experience_years, ud.certifications,
+                       CONCAT_WS(', ', ud.skills, ud.extracted_skills) AS skills,
+                       {PROFILE_HASH_SQL} AS profile_hash
+                FROM user_details ud
+                WHERE ud.domain IS NOT NULL AND ud.domain <> '' AND ud.cgpa IS NOT NULL
+            """)
+            # Converted the way get_recommendations.php builds its /recommend request
+            profiles = {
+                row['user_id']: {
+                    'domain': row['domain'],
+                    'cgpa': float(row['cgpa'] or 0),
+                    'experience_years': float(row['experience_years'] or 0),
+                    'certifications': int(row['certifications'] or 0),
+                    'skills': row['skills'] or '',
+                    'profile_hash': row['profile_hash']
+                }
+                for row in cursor.fetchall()
+            }
+            cursor.close()
+            return profiles
+        finally:
+            connection.close()
+
+    def save(self, rows):
+        """Insert or replace rows given as (user_id, Stored, body) triples"""
+        now = time.time()
+        values = [
+            (user_id, s.profile_hash, s.catalog_hash, ','.join(map(str, s.internship_ids)),
+             s.kth_score, s.valid_until, body, now)
+            for user_id, s, body in rows
+        ]
+        sql = ("INSERT INTO student_recommendations (user_id, profile_hash, catalog_hash, internship_ids, "
+               "kth_score, valid_until, body, computed_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s) "
+               "ON DUPLICATE KEY UPDATE profile_hash = VALUES(profile_hash), catalog_hash = VALUES(catalog_hash), "
+               "internship_ids = VALUES(internship_ids), kth_score = VALUES(kth_score), "
+               "valid_until = VALUES(valid_until), body = VALUES(body), computed_at = VALUES(computed_at)")
+        connection = self._connect()
+        try:
+            cursor = connection.cursor()
+            for start in range(0, len(values), MATERIALIZE_WRITE_BATCH):
+                cursor.executemany(sql, values[start:start + MATERIALIZE_WRITE_BATCH])
+                connection.commit()
+            cursor.close()
+        finally:
+            connection.close()
+
+    def delete(self, user_ids):
+        user_ids = list(user_ids)
+        statements = []
+        for start in range(0, len(user_ids), MATERIALIZE_WRITE_BATCH):
+            chunk = user_ids[start:start + MATERIALIZE_WRITE_BATCH]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            statements.append((f"DELETE FROM student_recommendations WHERE user_id IN ({placeholders})", chunk))
+        if statements:
+            self._run(statements)
+
+    def publish(self, catalog_hash, previous_hash=None):
+        """
+        Mark the table current for catalog_hash as of now
+
+        Rows still tagged with previous_hash were checked against the new
+        catalog and found unaffected, so they are retagged in the same
+        transaction.
+        """
+        statements = []
+        if previous_hash is not None and previous_hash != catalog_hash:
+            statements.append(("UPDATE student_recommendations SET catalog_hash = %s WHERE catalog_hash = %s",
+                               (catalog_hash, previous_hash)))
+        statements.append(("INSERT INTO recommendation_state (id, catalog_hash, verified_at) VALUES (1, %s, %s) "
+                           "ON DUPLICATE KEY UPDATE catalog_hash = VALUES(catalog_hash), "
+                           "verified_at = VALUES(verified_at)", (catalog_hash, time.time())))
+        self._run(statements)
+
+# ---------------------------
+# 3. CATALOG FINGERPRINTS
+# ---------------------------
+def catalog_fingerprint(snapshot):
+    """
+    (catalog_hash, row hashes) of a catalog snapshot
+
+    Row hashes are a uint64 Series indexed by internship_id, over every column
+    (titles and descriptions included, so display edits count as changes, and
+    created_at, which orders ties). The catalog hash also covers row order.
+    """
+    frame = snapshot.text.join(snapshot.frame)
+    rows = pd.Series(pd.util.hash_pandas_object(frame, index=False).to_numpy(),
+                     index=frame['internship_id'].to_numpy())
+    digest = hashlib.sha1(rows.index.to_numpy(dtype=np.int64).tobytes())
+    digest.update(rows.to_numpy().tobytes())
+    return digest.hexdigest(), rows
+
+def changed_rows(previous_rows, rows):
+    """
+    Internship ids whose stored recommendations may be invalid, and positions that may enter them
+
+    Returns:
+        (gone_ids, new_positions): ids removed or edited since previous_rows,
+        and catalog positions of rows added or edited
+    """
+    before = previous_rows.reindex(rows.index)
+    new_positions = np.flatnonzero(before.isna().to_numpy() | (before.to_numpy() != rows.to_numpy()))
+    after = rows.reindex(previous_rows.index)
+    gone = after.isna().to_numpy() | (after.to_numpy() != previous_rows.to_numpy())
+    return set(previous_rows.index[gone].tolist()), new_positions
+
+def closing_time(deadline_day):
+    """Epoch seconds at which a posting open through deadline_day (days since the epoch) stops being shown"""
+    if deadline_day >= NO_DEADLINE:
+        return None
+    day = datetime.date(1970, 1, 1) + datetime.timedelta(days=int(deadline_day) + 1)
+    return time.mktime(day.timetuple())
+
+# ---------------------------
+# 4. INCREMENTAL MATERIALIZER
+# ---------------------------
+class Materializer:
+    """
+    Keep student_recommendations equal to what /recommend would return
+
+    Each ``sync`` reads the profile fingerprints and the catalog snapshot and
+    recomputes only the students whose row may have changed:
+
+    - new students and students whose profile_hash moved
+    - students whose list contains a posting that has closed since
+    - after a catalog change, students whose list contains a removed or edited
+      internship, or for whom an added or edited internship scores at least
+      their k-th recommendation (checked with one score matrix over the
+      changed rows only)
+
+    Every other row is still exact: an internship's score does not depend on
+    the rest of the catalog. Rows come from the same ``recommend_internships``
+    call and quantized profile as /recommend, so the stored body is what the
+    live endpoint would answer. Students that disappear are deleted.
+
+    The materializer keeps the stored rows in memory and must be the only
+    writer of the table.
+    """
+
+    def __init__(self, store, catalog):
+        self.store = store
+        self.catalog = catalog
+        self._rows = None          # user_id -> Stored, mirrors the table
+        self._snapshot = None      # snapshot the fingerprint below belongs to
+        self._catalog_hash = None
+        self._row_hashes = None
+
+    def _fingerprint(self, snapshot):
+        """Fingerprint the snapshot once; returns the previous (hash, row hashes)"""
+        previous = (self._catalog_hash, self._row_hashes)
+        if snapshot is not self._snapshot:
+            with span(SWEEP_SECONDS, 'fingerprint'):
+                self._catalog_hash, self._row_hashes = catalog_fingerprint(snapshot)
+            self._snapshot = snapshot
+        return previous
+
+    def _affected(self, candidates, profiles, snapshot, gone_ids, new_positions):
+        """Subset of candidates (user ids on the previous catalog) a catalog change can affect"""
+        affected = {uid for uid in candidates if gone_ids.intersection(self._rows[uid].internship_ids)}
+        remaining = [uid for uid in candidates if uid not in affected]
+        if len(new_positions) == 0 or not remaining:
+            return affected
+
+        from recommendation_api import scalers
+        changed = snapshot.text.join(snapshot.frame.iloc[new_positions], new_positions)
+        index = ScoringIndex(changed)
+        chunk_size = max(1, AFFECTED_MAX_CELLS // len(index))
+        for start in range(0, len(remaining), chunk_size):
+            chunk = remaining[start:start + chunk_size]
+            scores, mask = index.score_batch([quantize_profile(profiles[uid]) for uid in chunk], scalers)
+            kth = np.array([-np.inf if self._rows[uid].kth_score is None else self._rows[uid].kth_score
+                            for uid in chunk])
+            # >= because top_k breaks ties by catalog position, where a changed row may come
+            # first; score_batch matches score_candidates bit for bit (scoring.weighted_scores)
+            hits = (mask & (scores >= kth[:, None] - KTH_SCORE_TOLERANCE)).any(axis=1)
+            affected.update(uid for uid, hit in zip(chunk, hits) if hit)
+        return affected
+
+    def _compute(self, user_ids, profiles, snapshot):
+        """(user_id, Stored, body) for user_ids, computing each distinct quantized profile once"""
+        from recommendation_api import (format_recommendations, recommend_internships,
+                                        recommendation_payload, scalers)
+        from serialization import dumps
+
+        deadlines = snapshot.index.eligibility.deadlines
+        computed = {}
+        rows = []
+        for uid in user_ids:
+            profile = quantize_profile(profiles[uid])
+            key = profile_key(profile)
+            if key not in computed:
+                ranked = recommend_internships(profile, snapshot.frame, scalers, snapshot.index, snapshot.text)
+                top_ids = [int(i) for i in ranked['internship_id']]
+                scores = ranked['total_score'].to_numpy(dtype=np.float64)
+                # Ranked rows keep their catalog position as index
+                closes = deadlines[ranked.index.to_numpy(dtype=np.int64)].min() if top_ids else NO_DEADLINE
+                body = dumps(recommendation_payload(format_recommendations(ranked))).decode('utf-8')
+                computed[key] = (top_ids, float(scores[-1]) if len(top_ids) >= TOP_K else None,
+                                 closing_time(closes), body)
+            top_ids, kth_score, valid_until, body = computed[key]
+            stored = Stored(profiles[uid]['profile_hash'], self._catalog_hash, top_ids, kth_score, valid_until)
+            rows.append((uid, stored, body))
+        return rows
+
+    def sync(self):
+        """
+        One sweep; returns a summary dict
+
+        Raises StoreUnavailable (or a MySQL error) if the database is
+        unreachable; the table is then left as it was, and readers fall back
+        to /recommend once MATERIALIZE_MAX_STALENESS has passed.
+        """
+        started = time.perf_counter()
+        # Checked in this thread, so the sweep sees catalog changes without a delay
+        self.catalog.refresh()
+        snapshot = self.catalog.snapshot()
+        if not self.catalog.ready:
+            raise StoreUnavailable("internship catalog could not be loaded")
+        previous_hash, previous_rows = self._fingerprint(snapshot)
+        catalog_hash = self._catalog_hash
+
+        with span(SWEEP_SECONDS, 'load'):
+            if self._rows is None:
+                self.store.create_table()
+                self._rows = self.store.load()
+            profiles = self.store.load_profiles()
+
+        now = time.time()
+        dirty = set()
+        on_previous = []
+        for uid, profile in profiles.items():
+            stored = self._rows.get(uid)
+            if (stored is None or stored.profile_hash != profile['profile_hash']
+                    or (stored.valid_until is not None and stored.valid_until <= now)):
+                dirty.add(uid)
+            elif stored.catalog_hash == catalog_hash:
+                continue
+            elif stored.catalog_hash == previous_hash and previous_rows is not None:
+                on_previous.append(uid)
+            else:
+                dirty.add(uid)  # computed against a catalog this process never saw (e.g. before a restart)
+
+        affected = set()
+        if on_previous:
+            with span(SWEEP_SECONDS, 'affected'):
+                gone_ids, new_positions = changed_rows(previous_rows, self._row_hashes)
+                affected = self._affected(on_previous, profiles, snapshot, gone_ids, new_positions)
+            dirty |= affected
+
+        with span(SWEEP_SECONDS, 'recompute'):
+            rows = self._compute(sorted(dirty), profiles, snapshot)
+        removed = [uid for uid in self._rows if uid not in profiles]
+        with span(SWEEP_SECONDS, 'write'):
+            self.store.save(rows)
+            self.store.delete(removed)
+            self.store.publish(catalog_hash, previous_hash)
+
+        for uid, stored, _ in rows:
+            self._rows[uid] = stored
+        for uid in removed:
+            del self._rows[uid]
+        for uid in on_previous:
+            if uid not in affected:
+                self._rows[uid] = self._rows[uid]._replace(catalog_hash=catalog_hash)
+
+        summary = {
+            "students": len(profiles),
+            "recomputed": len(rows),
+            "catalog_changed": previous_hash is not None and previous_hash != catalog_hash,
+            "checked_after_catalog_change": len(on_previous),
+            "affected_by_catalog_change": len(affected),
+            "deleted": len(removed),
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+        if rows or removed:
+            logger.info(f"Materialized recommendations: {summary}")
+        return summary
+
+# ---------------------------
+# 5. COMMAND LINE
+# ---------------------------
+def run(materializer, interval):
+    """Sweep every ``interval`` seconds until interrupted"""
+    print(f"📋 Recommendation materializer started (every {interval}s)")
+    try:
+        while True:
+            try:
+                materializer.sync()
+            except (StoreUnavailable, Error) as e:
+                logger.error(f"Materializer sweep failed: {e}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Materialize each student's recommendations into MySQL")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="keep the table current until interrupted")
+    run_parser.add_argument("--interval", type=float, default=MATERIALIZE_INTERVAL,
+                            help="seconds between sweeps")
+    commands.add_parser("once", help="run one sweep and print its summary")
+    args = parser.parse_args()
+
+    from recommendation_api import catalog
+    materializer = Materializer(RecommendationStore(), catalog)
+    if args.command == "run":
+        run(materializer, args.interval)
+        return
+    try:
+        print(json.dumps(materializer.sync()))
+    except (StoreUnavailable, Error) as e:
+        print(json.dumps({"error": f"Materializer sweep failed: {e}"}))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
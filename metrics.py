@@ -0,0 +1,217 @@
+import sys
+import time
+import threading
+import traceback
+from bisect import bisect_left
+from collections import Counter as _Tally
+from contextlib import contextmanager
+
+# ---------------------------
+# 1. METRIC TYPES
+# ---------------------------
+# Upper bounds in seconds, from sub-millisecond scoring stages to slow PDF extractions
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _label_text(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = [(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in pairs]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination, in the Prometheus data model"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def drain(self):
+        """Return the accumulated series and reset them"""
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def merge(self, series):
+        """Add series produced by ``drain`` (e.g. in another process)"""
+        with self._lock:
+            for label_values, values in series.items():
+                current = self._series.setdefault(tuple(label_values), [0] * (len(self.buckets) + 1) + [0.0])
+                for i, value in enumerate(values):
+                    current[i] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for label_values, values in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), values[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, label_values, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, label_values)} {values[-1]}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, label_values)} {cumulative}")
+        return lines
+
+class Gauge:
+    """Value read from a callback at scrape time; the callback returns {label values: number}"""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labels, read):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.read = read
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for label_values, value in sorted(self.read().items()):
+            if value is not None:
+                lines.append(f"{self.name}{_label_text(self.labels, label_values)} {float(value)}")
+        return lines
+
+# ---------------------------
+# 2. REGISTRY AND EXPOSITION
+# ---------------------------
+class Registry:
+    """Process-local set of metrics rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._metrics.setdefault(name, Histogram(name, documentation, labels, buckets))
+
+    def gauge(self, name, documentation, labels, read):
+        self._metrics[name] = Gauge(name, documentation, labels, read)
+        return self._metrics[name]
+
+    def drain(self):
+        """Histogram series accumulated since the last drain, keyed by metric name (picklable)"""
+        return {name: m.drain() for name, m in self._metrics.items() if m.kind == "histogram"}
+
+    def merge(self, drained):
+        for name, series in drained.items():
+            metric = self._metrics.get(name)
+            if metric is not None and series:
+                metric.merge(series)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@contextmanager
+def span(histogram, *label_values):
+    """Time the enclosed block into histogram"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started, *label_values)
+
+class Stopwatch:
+    """Record consecutive laps of one function into a histogram labelled by lap name"""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self._last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.histogram.observe(now - self._last, name)
+        self._last = now
+
+# ---------------------------
+# 3. SAMPLING PROFILER
+# ---------------------------
+class SamplingProfiler:
+    """
+    Low-overhead statistical profiler that can be switched on and off at runtime
+
+    A daemon thread snapshots every other thread's stack each ``interval``
+    seconds via ``sys._current_frames`` and tallies them. ``stop`` returns the
+    tallies in collapsed-stack format (``frame;frame;frame count``), which
+    flame graph tools read directly. Nothing runs while it is stopped.
+    """
+
+    MAX_DEPTH = 64
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._stacks = _Tally()
+        self.samples = 0
+        self.interval = None
+        self.started_at = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self, interval=0.005):
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._stacks = _Tally()
+            self.samples = 0
+            self.interval = interval
+            self.started_at = time.monotonic()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = traceback.extract_stack(frame, limit=self.MAX_DEPTH)
+                key = ";".join(f"{f.name} ({f.filename.rsplit('/', 1)[-1]}:{f.lineno})" for f in stack)
+                self._stacks[key] += 1
+            self.samples += 1
+
+    def stop(self):
+        """Stop sampling and return (collapsed stacks text, summary dict)"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return "", {"running": False}
+            self._stop.set()
+        thread.join()
+        collapsed = "\n".join(f"{stack} {count}" for stack, count in self._stacks.most_common())
+        summary = {
+            "running": False,
+            "samples": self.samples,
+            "interval": self.interval,
+            "seconds": round(time.monotonic() - self.started_at, 3),
+            "distinct_stacks": len(self._stacks)
+        }
+        return collapsed, summary
+
+profiler = SamplingProfiler()
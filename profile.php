@@ -25,6 +25,18 @@ if ($result->num_rows > 0) {
     $user_data = $result->fetch_assoc();
 }
 $stmt->close();
+
+// Latest resume extraction job, when uploads are parsed asynchronously (see extraction_jobs.py)
+$extraction_job = null;
+$jobs_table = $conn->query("SHOW TABLES LIKE 'extraction_jobs'");
+if ($jobs_table && $jobs_table->num_rows > 0) {
+    $stmt = $conn->prepare("SELECT status, error FROM extraction_jobs WHERE user_id = ? ORDER BY id DESC LIMIT 1");
+    $stmt->bind_param("i", $user_id);
+    $stmt->execute();
+    $extraction_job = $stmt->get_result()->fetch_assoc();
+    $stmt->close();
+}
+$extraction_pending = $extraction_job && in_array($extraction_job['status'], ['queued', 'running']);
 $conn->close();
 
 // Helper function to display data
@@ -54,6 +66,9 @@ function show_multiline_data($label, $data, $placeholder = "Not provided") {
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>My Profile - SmartMatch AI</title>
+    <?php if ($extraction_pending): ?>
+    <meta http-equiv="refresh" content="5">
+    <?php endif; ?>
     <script src="https://cdn.tailwindcss.com"></script>
     <style>
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@100..900&display=swap');
@@ -114,6 +129,11 @@ function show_multiline_data($label, $data, $placeholder = "Not provided") {
 
             <div>
                 <h2 class="text-2xl font-bold text-primary-accent mb-4">Data Extracted from Resume (AI)</h2>
+                <?php if ($extraction_pending): ?>
+                    <p class="mb-4 text-sm text-cyan-700 bg-cyan-50 rounded-lg p-3">Your resume is being analysed. This page refreshes automatically.</p>
+                <?php elseif ($extraction_job && $extraction_job['status'] == 'failed'): ?>
+                    <p class="mb-4 text-sm text-red-700 bg-red-50 rounded-lg p-3">Resume Parsing Warning: <?php echo htmlspecialchars($extraction_job['error']); ?></p>
+                <?php endif; ?>
                 <dl class="divide-y divide-gray-200">
                     <?php show_data("Name", $user_data['extracted_name'], "Not found"); ?>
                     <?php show_data("Email", $user_data['extracted_email'], "Not found"); ?>
@@ -1,107 +1,410 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, g, request, jsonify
 from flask_cors import CORS
-import mysql.connector
 from mysql.connector import Error
+import threading
+from collections import namedtuple
+import itertools
+import time
+import gc
+import gzip
+import os
+import sys
+import ipaddress
+import argparse
 import logging
 
+from db import DB_CONFIG, close_pool, get_db_connection, pool_stats, query_df
+from scoring import ScoringIndex, default_scalers, top_k, top_k_batch, TOP_K
+from response_cache import ResponseCache, quantize_profile, profile_key
+from compact import compact_frame, memory_report
+from serialization import CatalogPayload, GZIP_MIN_BYTES, dumps, etag, frame_records
+from metrics import REGISTRY, CONTENT_TYPE, profiler, span
+from export import (CATALOG_TYPES, EXPORT_FORMATS, PARQUET_AVAILABLE, PARQUET_MISSING_ERROR, RECOMMENDATION_TYPES,
+                    ExportUnavailable, catalog_chunks, encode, recommendation_chunks)
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Latency histograms exposed on /metrics
+STAGE_SECONDS = REGISTRY.histogram(
+    'recommend_stage_seconds', "Time per /recommend pipeline stage", ['stage'])
+REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_seconds', "HTTP request latency", ['endpoint', 'method', 'status'])
+CATALOG_REFRESH_SECONDS = REGISTRY.histogram(
+    'catalog_refresh_seconds', "Catalog version checks and reloads", ['kind'])
+
 # ---------------------------
 # 1. DATABASE CONFIGURATION
 # ---------------------------
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'root',  # Your XAMPP MySQL username
-    'password': '',  # Your XAMPP MySQL password (usually empty)
-    'database': 'smartmatch_db',  # YOUR actual database name
-    'port': 3306
-}
-
+# DB_CONFIG and the pooled get_db_connection() live in db.py
 
 # ---------------------------
 # 2. SETUP SCALERS
 # ---------------------------
-scalers = {
-    'cgpa': MinMaxScaler(feature_range=(0, 1)).fit(np.array([[0], [10]])),
-    'experience_years': MinMaxScaler(feature_range=(0, 1)).fit(np.array([[0], [5]])),
-    'certifications': MinMaxScaler(feature_range=(0, 1)).fit(np.array([[0], [10]]))
-}
+# Closed-form min-max constants from scoring.py, shared with offline tools (allocation, benchmarks)
+scalers = default_scalers
 
 # ---------------------------
-# 3. DATABASE CONNECTION FUNCTION
+# 3. LOAD INTERNSHIPS FROM DATABASE
 # ---------------------------
-def get_db_connection():
-    """Create and return a database connection"""
-    try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        if connection.is_connected():
-            logger.info("Successfully connected to MySQL database")
-            return connection
-    except Error as e:
-        logger.error(f"Error connecting to MySQL database: {e}")
-        return None
+INTERNSHIP_COLUMNS = [
+    'internship_id', 'title', 'company_name', 'description',
+    'required_domain', 'min_cgpa', 'required_experience', 'min_certifications',
+    'importance_domain', 'importance_cgpa', 'importance_experience', 'importance_certifications',
+    'location', 'duration_months', 'stipend', 'application_deadline',
+    'required_skills'
+]
 
-# ---------------------------
-# 4. LOAD INTERNSHIPS FROM DATABASE
-# ---------------------------
-def load_internships():
-    """Load all active internships from database"""
+# Columns newer than the original schema, selected as a constant until the table has them
+OPTIONAL_COLUMNS = {
+    'required_skills': "''"  # comma-separated, e.g. "Python, SQL, Docker"
+}
+# DDL adding them, run by `python recommendation_api.py migrate`
+OPTIONAL_COLUMN_DDL = {
+    'required_skills': "ALTER TABLE internships ADD COLUMN required_skills VARCHAR(500) NOT NULL DEFAULT ''"
+}
+_present_optional = None
+
+def forget_columns():
+    """Inspect the internships table again on the next select_list() (full reloads, migrations)"""
+    global _present_optional
+    _present_optional = None
+
+def migrate():
+    """
+    Add the OPTIONAL_COLUMNS the internships table lacks
+
+    Returns the names of the columns added, or None if the database is unreachable.
+    """
+    forget_columns()
+    described = query_df("SHOW COLUMNS FROM internships")
+    if described is None:
+        return None
+    missing = [c for c in OPTIONAL_COLUMNS if c not in set(described.iloc[:, 0])]
+    if not missing:
+        return []
+    
     connection = get_db_connection()
     if not connection:
-        return pd.DataFrame()
-    
+        return None
     try:
-        query = """
+        cursor = connection.cursor()
+        for column in missing:
+            cursor.execute(OPTIONAL_COLUMN_DDL[column])
+        cursor.close()
+    finally:
+        connection.close()
+        forget_columns()
+    return missing
+
+def select_list():
+    """SELECT expressions for INTERNSHIP_COLUMNS, or None if the table cannot be inspected"""
+    global _present_optional
+    if _present_optional is None:
+        described = query_df("SHOW COLUMNS FROM internships")
+        if described is None:
+            return None
+        _present_optional = set(OPTIONAL_COLUMNS) & set(described.iloc[:, 0])
+    return [
+        f"{OPTIONAL_COLUMNS[c]} AS {c}" if c in OPTIONAL_COLUMNS and c not in _present_optional else c
+        for c in INTERNSHIP_COLUMNS
+    ]
+
+def fetch_internships(updated_since=None):
+    """
+    Fetch internships from database, returning None if the database is unreachable or the query fails
+
+    Without ``updated_since`` all active internships are returned. With it, every
+    row touched at or after that timestamp is returned (including deactivated ones,
+    flagged by ``is_active``) so a cached catalog can be patched incrementally.
+    The bound is inclusive because updated_at has one-second resolution: a row
+    written in the same second as the last fingerprint would otherwise be
+    missed. Re-reading rows is harmless since they replace by internship_id.
+    """
+    select = select_list()
+    if select is None:
+        return None
+    columns = ",\n        ".join(select + ['created_at'])
+    if updated_since is None:
+        query = f"""
         SELECT 
-            internship_id, 
-            title, 
-            company_name,
-            description,
-            required_domain, 
-            min_cgpa, 
-            required_experience, 
-            min_certifications,
-            importance_domain, 
-            importance_cgpa, 
-            importance_experience, 
-            importance_certifications,
-            location,
-            duration_months,
-            stipend,
-            application_deadline
+        {columns}
         FROM internships
         WHERE is_active = 1
         ORDER BY created_at DESC
         """
-        
-        df = pd.read_sql(query, connection)
-        logger.info(f"Successfully loaded {len(df)} internships from database")
-        return df
-        
-    except Error as e:
-        logger.error(f"Error loading internships: {e}")
+        df = query_df(query)
+        if df is not None:
+            logger.info(f"Successfully loaded {len(df)} internships from database")
+    else:
+        query = f"""
+        SELECT 
+        {columns},
+        is_active
+        FROM internships
+        WHERE updated_at >= %s
+        """
+        df = query_df(query, (updated_since,))
+        if df is not None:
+            logger.info(f"Loaded {len(df)} changed internships since {updated_since}")
+    return df
+
+def load_internships():
+    """Load all active internships from database"""
+    df = fetch_internships()
+    if df is None:
         return pd.DataFrame()
+    return df[INTERNSHIP_COLUMNS]
+
+def load_catalog_version():
+    """
+    Return a cheap (active_count, max_updated_at) fingerprint of the internships table
+
+    Returns None if the database is unreachable or the table has no ``updated_at``
+    column, in which case the catalog falls back to time-based reloads.
+    """
+    connection = get_db_connection()
+    if not connection:
+        return None
+    
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT SUM(is_active = 1), MAX(updated_at) FROM internships")
+        active_count, max_updated = cursor.fetchone()
+        cursor.close()
+        return (int(active_count or 0), max_updated)
+    
+    except Error as e:
+        logger.warning(f"Could not read catalog version, using TTL reloads: {e}")
+        return None
     
     finally:
-        if connection.is_connected():
-            connection.close()
+        connection.close()  # returns it to the pool
+
+# ---------------------------
+# 4. SHARED INTERNSHIP CATALOG
+# ---------------------------
+CATALOG_CHECK_INTERVAL = 5   # seconds between version checks against the database
+CATALOG_TTL = 60             # full reload interval when no version column is available
+CATALOG_MAX_AGE = 900        # full reload at least this often, as a safety net
+
+# A compact catalog frame together with its packed text columns and the scoring
+# arrays and JSON payload precomputed from it. ``generation`` grows with every
+# snapshot built in this process, so caches can tell older snapshots from newer.
+CatalogSnapshot = namedtuple('CatalogSnapshot', ['frame', 'index', 'payload', 'text', 'generation'])
+_generations = itertools.count()
+
+class InternshipCatalog:
+    """
+    Thread-safe, process-wide snapshot of the active internships
+
+    Requests read the current DataFrame without touching the database. At most
+    once per ``check_interval`` a background thread compares the table
+    fingerprint from ``load_catalog_version()`` with the cached one and, if it
+    moved, pulls only the rows changed since the last refresh; requests keep
+    getting the previous snapshot meanwhile, even while MySQL is unreachable.
+    Snapshots are never mutated in place: a new frame is built and swapped in,
+    so readers need no locking.
+
+    Snapshots hold the catalog in compact form (``compact.compact_frame``):
+    categorical string columns, and titles and descriptions packed outside the
+    frame, decoded only for the rows a response returns.
+    """
+
+    def __init__(self, check_interval=CATALOG_CHECK_INTERVAL, ttl=CATALOG_TTL, max_age=CATALOG_MAX_AGE):
+        self.check_interval = check_interval
+        self.ttl = ttl
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()  # held while a background refresh is queued or running
+        self._df, self._text = compact_frame(pd.DataFrame(columns=INTERNSHIP_COLUMNS + ['created_at']))
+        self._snapshot = CatalogSnapshot(
+            self._df, ScoringIndex(self._df), CatalogPayload(self._df, self._text, INTERNSHIP_COLUMNS), self._text,
+            next(_generations)
+        )
+        self._version = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._stale = True
+
+    def snapshot(self):
+        """Return the current (frame, index) snapshot without checking for changes"""
+        return self._snapshot
+
+    def current(self):
+        """
+        Return the current snapshot, starting a background refresh if it may be outdated
+
+        Only the first load blocks, as there is nothing to serve before it.
+        """
+        if not self.ready:
+            self.refresh()
+        elif self._stale or time.monotonic() - self._checked_at >= self.check_interval:
+            self._refresh_in_background()
+        return self._snapshot
+
+    def _refresh_in_background(self):
+        if not self._refreshing.acquire(blocking=False):
+            return  # a refresh is already on its way
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Background catalog refresh failed: {e}")
+            finally:
+                self._refreshing.release()
+
+        threading.Thread(target=run, name='catalog-refresh', daemon=True).start()
+
+    def get(self):
+        """Return the current internships as a plain DataFrame (decodes every packed text column)"""
+        snapshot = self.current()
+        return snapshot.text.join(snapshot.frame)[INTERNSHIP_COLUMNS]
+
+    def load_frame(self, df, version=None):
+        """Install a snapshot built from an existing frame (offline tools, benchmarks)"""
+        with self._lock:
+            now = time.monotonic()
+            self._checked_at = now
+            self._swap(df, version, now)
+
+    def invalidate(self):
+        """Force a full reload on the next access"""
+        self._stale = True
+        self._checked_at = 0.0
+
+    @property
+    def ready(self):
+        """True once a snapshot has been loaded or installed"""
+        return self._loaded_at > 0
+
+    def info(self):
+        """Describe the snapshot for health/admin endpoints"""
+        version = self._version
+        return {
+            "catalog_ready": self.ready,
+            "internships_loaded": len(self._df),
+            "catalog_version": None if version is None else [version[0], str(version[1])],
+            "catalog_age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None
+        }
+
+    def refresh(self, force=False):
+        """
+        Bring the snapshot up to date; only one thread hits the database at a time
+
+        Attempts are at least ``check_interval`` apart unless ``force`` is set,
+        also while no load has succeeded yet: threads that queued behind an
+        attempt return its result instead of retrying MySQL one after another.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if force:
+                self._stale = True
+            elif now - self._checked_at < self.check_interval:
+                return  # another thread checked recently, possibly while we were waiting
+            try:
+                self._check(now)
+            finally:
+                # Counted from the end of the attempt, which may have sat out a connection timeout
+                self._checked_at = time.monotonic()
+
+    def _check(self, now):
+        with span(CATALOG_REFRESH_SECONDS, 'version_check'):
+            version = load_catalog_version()
+        age = now - self._loaded_at
+        
+        if version is None:
+            if self._stale or age >= self.ttl:
+                self._full_reload(version, now)
+            return
+        
+        if self._stale or age >= self.max_age or self._version is None:
+            self._full_reload(version, now)
+        elif version != self._version:
+            self._apply_changes(version, now)
+
+    def _full_reload(self, version, now):
+        forget_columns()  # picks up optional columns added since the last full reload
+        with span(CATALOG_REFRESH_SECONDS, 'full_query'):
+            df = fetch_internships()
+        if df is None:
+            logger.warning("Catalog reload failed, keeping previous snapshot")
+            return
+        self._swap(df, version, now)
+
+    def _apply_changes(self, version, now):
+        since = self._version[1]
+        if since is None or version[1] is None:
+            return self._full_reload(version, now)
+        
+        with span(CATALOG_REFRESH_SECONDS, 'delta_query'):
+            changed = fetch_internships(updated_since=since)
+        if changed is None:
+            logger.warning("Catalog update failed, keeping previous snapshot")
+            return
+        
+        current = self._df
+        keep = ~current['internship_id'].isin(changed['internship_id']).to_numpy()
+        kept = self._text.join(current[keep], np.flatnonzero(keep))
+        active = changed[changed['is_active'] == 1].drop(columns=['is_active'])
+        df = pd.concat([active, kept], ignore_index=True)
+        df = df.sort_values(by='created_at', ascending=False, kind='stable').reset_index(drop=True)
+        
+        # Hard deletes never show up in an updated_at delta; the count catches them
+        if len(df) != version[0]:
+            logger.info("Catalog delta does not match active count, doing a full reload")
+            return self._full_reload(version, now)
+        
+        logger.info(f"Catalog updated incrementally: {len(changed)} changed rows, {len(df)} active")
+        self._swap(df, version, now)
+
+    def _swap(self, df, version, now):
+        with span(CATALOG_REFRESH_SECONDS, 'compact'):
+            df, text = compact_frame(df.reset_index(drop=True))
+        self._df, self._text = df, text
+        # Frame, text and scoring arrays are published together so they always line up
+        with span(CATALOG_REFRESH_SECONDS, 'index_build'):
+            self._snapshot = CatalogSnapshot(df, ScoringIndex(df), CatalogPayload(df, text, INTERNSHIP_COLUMNS), text,
+                                             next(_generations))
+        self._version = version
+        self._loaded_at = now
+        self._stale = False
 
 # ---------------------------
 # 5. RECOMMENDATION ALGORITHM
 # ---------------------------
-def recommend_internships(student_data, internships_df, scalers):
+RESULT_COLUMNS = [
+    'internship_id', 'title', 'company_name', 'description',
+    'required_domain', 'location', 'duration_months', 'stipend',
+    'application_deadline', 'required_skills'
+]
+
+BATCH_MAX_CELLS = 4_000_000  # students x internships per score matrix (~32 MB of float64)
+MAX_BATCH_STUDENTS = 50_000
+
+def result_rows(internships_df, positions, text=None):
+    """RESULT_COLUMNS of the rows at positions, with packed text columns decoded for just those rows"""
+    columns = {
+        c: text.columns[c].take(positions) if text is not None and c in text else internships_df[c].array.take(positions)
+        for c in RESULT_COLUMNS
+    }
+    return pd.DataFrame(columns, index=internships_df.index[positions])
+
+def recommend_internships(student_data, internships_df, scalers, index=None, text=None):
     """
     Generate personalized internship recommendations
     
     Args:
-        student_data (dict): Student profile with domain, cgpa, experience_years, certifications
+        student_data (dict): Student profile with domain, cgpa, experience_years,
+            certifications and optional skills
         internships_df (DataFrame): All available internships
         scalers (dict): Feature scalers
+        index (ScoringIndex): Precomputed arrays for internships_df (built on the fly if omitted)
+        text (TextStore): Packed text columns of a compact catalog frame
     
     Returns:
         DataFrame: Ranked internship recommendations with scores
@@ -110,80 +413,215 @@ def recommend_internships(student_data, internships_df, scalers):
         logger.warning("No internships available for recommendation")
         return pd.DataFrame(columns=['internship_id', 'title', 'company_name', 'total_score'])
     
-    # Convert student data to DataFrame
-    student = pd.DataFrame([student_data])
-    student_profile = student.iloc[0]
+    if index is None or len(index) != len(internships_df):
+        index = ScoringIndex(internships_df)
     
-    # A. Apply Hard Filters (minimum requirements)
-    eligible_internships = internships_df[
-        (internships_df['min_cgpa'] <= student_profile['cgpa']) &
-        (internships_df['required_experience'] <= student_profile['experience_years']) &
-        (internships_df['min_certifications'] <= student_profile['certifications'])
-    ].copy()
+    # A. Hard filters: eligible, still-open postings from the pre-filter index
+    with span(STAGE_SECONDS, 'hard_filter'):
+        positions = index.candidates(student_data)
     
-    if eligible_internships.empty:
+    if len(positions) == 0:
         logger.info("No internships match the hard filter criteria")
         return pd.DataFrame(columns=['internship_id', 'title', 'company_name', 'total_score'])
     
-    # B. Scale Student Features
-    s_cgpa_scaled = scalers['cgpa'].transform([[student_profile['cgpa']]])[0][0]
-    s_exp_scaled = scalers['experience_years'].transform([[student_profile['experience_years']]])[0][0]
-    s_certs_scaled = scalers['certifications'].transform([[student_profile['certifications']]])[0][0]
-    
-    # C. Calculate Component Scores
-    # Domain match (binary: 1 if exact match, 0.5 if partial, 0 if no match)
-    eligible_internships['score_domain'] = eligible_internships.apply(
-        lambda row: (
-            1.0 if row['required_domain'].lower() == student_profile['domain'].lower()
-            else 0.5 if student_profile['domain'].lower() in row['required_domain'].lower() or row['required_domain'].lower() in student_profile['domain'].lower()
-            else 0.0
-        ) * row['importance_domain'],
-        axis=1
-    )
+    # B-D. Scaled, weighted component scores of the candidates only
+    with span(STAGE_SECONDS, 'scoring'):
+        scores = index.score_candidates(student_data, scalers, positions)
     
-    # CGPA score (normalized)
-    eligible_internships['score_cgpa'] = s_cgpa_scaled * eligible_internships['importance_cgpa']
+    # E. Rank and Return Top Recommendations
+    with span(STAGE_SECONDS, 'sort'):
+        top = top_k(scores, None, TOP_K)
+        ranked = result_rows(internships_df, positions[top], text)
+        ranked['total_score'] = scores[top]
+    return ranked
+
+def recommend_internships_batch(students, internships_df, scalers, index=None, k=TOP_K, chunk_size=None, text=None):
+    """
+    Generate recommendations for many students with one score matrix per chunk
     
-    # Experience score (normalized)
-    eligible_internships['score_exp'] = s_exp_scaled * eligible_internships['importance_experience']
+    Args:
+        students (list): Student profiles, same fields as recommend_internships
+        internships_df (DataFrame): All available internships
+        scalers (dict): Feature scalers
+        index (ScoringIndex): Precomputed arrays for internships_df (built on the fly if omitted)
+        k (int): Recommendations per student
+        chunk_size (int): Students scored per matrix; defaults to keeping each
+            students x internships matrix under BATCH_MAX_CELLS entries
+        text (TextStore): Packed text columns of a compact catalog frame
     
-    # Certifications score (normalized)
-    eligible_internships['score_certs'] = s_certs_scaled * eligible_internships['importance_certifications']
+    Returns:
+        list: One ranked DataFrame per student, in input order
+    """
+    empty = pd.DataFrame(columns=RESULT_COLUMNS + ['total_score'])
+    if internships_df.empty or not students:
+        return [empty.copy() for _ in students]
     
-    # D. Calculate Total Score
-    score_cols = ['score_domain', 'score_cgpa', 'score_exp', 'score_certs']
-    eligible_internships['total_score'] = eligible_internships[score_cols].sum(axis=1)
+    if index is None or len(index) != len(internships_df):
+        index = ScoringIndex(internships_df)
     
-    # E. Rank and Return Top Recommendations
-    ranked = eligible_internships.sort_values(by='total_score', ascending=False)
+    if chunk_size is None:
+        chunk_size = max(1, BATCH_MAX_CELLS // len(index))
     
-    result_columns = [
-        'internship_id', 'title', 'company_name', 'description',
-        'required_domain', 'location', 'duration_months', 'stipend',
-        'application_deadline', 'total_score'
-    ]
+    results = []
+    for start in range(0, len(students), chunk_size):
+        chunk = students[start:start + chunk_size]
+        scores, mask = index.score_batch(chunk, scalers)
+        for row, top in enumerate(top_k_batch(scores, mask, k)):
+            ranked = result_rows(internships_df, top, text)
+            ranked['total_score'] = scores[row, top]
+            results.append(ranked)
     
-    return ranked[result_columns].head(10)  # Return top 10 recommendations
+    logger.info(f"Scored {len(students)} students against {len(index)} internships")
+    return results
+
+def format_recommendations(recommendations_df):
+    """Convert a ranked DataFrame into JSON-ready records (column by column)"""
+    return frame_records(recommendations_df)
+
+def recommendation_payload(recommendations_json):
+    """Body of a 200 /recommend response (also what materializer.py stores per student)"""
+    if not recommendations_json:
+        return {
+            "message": "No matching internships found for your profile",
+            "recommendations": []
+        }
+    return {
+        "success": True,
+        "count": len(recommendations_json),
+        "recommendations": recommendations_json
+    }
 
 # ---------------------------
 # 6. FLASK API SETUP
 # ---------------------------
-app = Flask(__name__)
-CORS(app)  # Enable CORS for PHP frontend
+# Routes live on a blueprint; create_app() builds the Flask app around it
+api = Blueprint('api', __name__)
+
+INTERNSHIPS_MAX_PAGE = 1000  # largest ?limit= accepted by /internships
+MAX_TOP_K = 100              # larger top_k requests are clamped to this
+
+# Admin routes answer loopback clients only, unless ADMIN_ALLOW_REMOTE=1. Behind a
+# reverse proxy every client looks local, so block these paths at the proxy as well.
+ADMIN_PATHS = ('/admin/', '/export/recommendations')  # every student's recommendations
+ADMIN_ALLOW_REMOTE = os.environ.get('ADMIN_ALLOW_REMOTE') == '1'
 
-# Load internships when server starts
-all_internships = load_internships()
+def json_response(payload, status=200):
+    """JSON response encoded with the fast encoder (orjson when installed)"""
+    return Response(dumps(payload), status=status, mimetype='application/json')
 
-@app.route('/health', methods=['GET'])
+def parse_top_k(value):
+    """A requested top_k clamped to MAX_TOP_K, or None unless it is a positive integer"""
+    if isinstance(value, bool):
+        return None
+    try:
+        k = int(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if k < 1 or (isinstance(value, float) and k != value):
+        return None
+    return min(k, MAX_TOP_K)
+
+# Shared internship catalog. Importing this module does no database work: the
+# catalog loads on the first request that needs it, or earlier through warm_up()
+catalog = InternshipCatalog()
+
+# Formatted /recommend results per quantized profile, emptied whenever the catalog snapshot changes
+response_cache = ResponseCache()
+
+# Scrape-time gauges for /metrics
+REGISTRY.gauge('catalog_internships', "Internships in the current catalog snapshot", [],
+               lambda: {(): len(catalog.snapshot().frame)})
+REGISTRY.gauge('response_cache', "Response cache counters and occupancy", ['value'],
+               lambda: {(k,): v for k, v in response_cache.stats().items() if k != 'hit_rate'})
+REGISTRY.gauge('db_pool', "Database pool counters and utilization", ['value'],
+               lambda: {(k,): v for k, v in pool_stats().items()})
+
+@api.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@api.after_app_request
+def record_request_time(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint, request.method, str(response.status_code))
+    return response
+
+def is_loopback(address):
+    """True for 127.0.0.0/8, ::1 and IPv4-mapped loopback addresses"""
+    try:
+        ip = ipaddress.ip_address(address or '')
+    except ValueError:
+        return False
+    mapped = getattr(ip, 'ipv4_mapped', None)
+    return (mapped or ip).is_loopback
+
+@api.before_request
+def guard_admin():
+    if request.path.startswith(ADMIN_PATHS) and not ADMIN_ALLOW_REMOTE and not is_loopback(request.remote_addr):
+        logger.warning(f"Refused {request.method} {request.path} from {request.remote_addr}")
+        return jsonify({"error": "Admin endpoints are only available from localhost"}), 403
+
+@api.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Prometheus text exposition of latency histograms and gauges
+    
+    Under the pre-fork server each worker keeps its own metrics, so series
+    describe the worker that answered the scrape.
+    """
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+@api.route('/admin/profiler', methods=['POST'])
+def toggle_profiler():
+    """
+    Start or stop the sampling profiler in this worker
+    
+    {"action": "start", "interval": 0.005} starts sampling; {"action": "stop"}
+    stops it and returns collapsed stacks (flame graph input) as text/plain.
+    """
+    payload = request.get_json(silent=True) or {}
+    action = payload.get('action')
+    if action == 'start':
+        interval = float(payload.get('interval', 0.005))
+        if not 0.0005 <= interval <= 1:
+            return jsonify({"error": "interval must be between 0.0005 and 1 second"}), 400
+        started = profiler.start(interval)
+        return jsonify({"running": True, "already_running": not started, "interval": profiler.interval})
+    if action == 'stop':
+        collapsed, summary = profiler.stop()
+        logger.info(f"Profiler stopped: {summary}")
+        return Response(collapsed + "\n", mimetype='text/plain')
+    return jsonify({"error": "action must be 'start' or 'stop'", "running": profiler.running}), 400
+
+@api.route('/health', methods=['GET'])
 def health_check():
     """API health check endpoint"""
     return jsonify({
         "status": "healthy",
-        "internships_loaded": len(all_internships),
-        "database": DB_CONFIG['database']
+        **catalog.info(),
+        "database": DB_CONFIG['database'],
+        "db_pool": pool_stats(),
+        "response_cache": response_cache.stats()
     })
 
-@app.route('/recommend', methods=['POST'])
+@api.route('/admin/catalog/refresh', methods=['POST'])
+def refresh_catalog():
+    """Force a full reload of the internship catalog (e.g. after bulk edits)"""
+    try:
+        catalog.refresh(force=True)
+        return jsonify({"success": True, **catalog.info()})
+    except Exception as e:
+        logger.error(f"Error refreshing catalog: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@api.route('/admin/catalog/memory', methods=['GET'])
+def catalog_memory():
+    """Approximate memory held by this worker's catalog snapshot, by component (walks every string)"""
+    return jsonify(memory_report(catalog.snapshot()))
+
+@api.route('/recommend', methods=['POST'])
 def get_recommendations():
     """
     Endpoint to get personalized internship recommendations
@@ -193,8 +631,13 @@ def get_recommendations():
         "domain": "Software Development",
         "cgpa": 8.5,
         "experience_years": 1.0,
-        "certifications": 2
+        "certifications": 2,
+        "skills": "Python, MySQL, React"
     }
+    
+    "skills" is optional (string or list); it boosts internships whose
+    required_skills it covers. Results are cached per quantized profile
+    (see response_cache.quantize_profile) and catalog snapshot.
     """
     try:
         # Get student data from request
@@ -212,8 +655,10 @@ def get_recommendations():
                 "error": f"Missing required fields: {', '.join(missing_fields)}"
             }), 400
         
-        # Reload internships to get latest data
-        current_internships = load_internships()
+        # Use the shared catalog snapshot (refreshed when the table changes)
+        with span(STAGE_SECONDS, 'catalog'):
+            snapshot = catalog.current()
+        current_internships = snapshot.frame
         
         if current_internships.empty:
             return jsonify({
@@ -221,32 +666,26 @@ def get_recommendations():
                 "recommendations": []
             }), 200
         
-        # Generate recommendations
-        recommendations_df = recommend_internships(student_data, current_internships, scalers)
-        
-        # Convert DataFrame to JSON
-        if recommendations_df.empty:
-            return jsonify({
-                "message": "No matching internships found for your profile",
-                "recommendations": []
-            }), 200
-        
-        # Format the response
-        recommendations_json = recommendations_df.to_dict('records')
+        # Generate recommendations, or reuse them for an identical profile
+        with span(STAGE_SECONDS, 'cache_lookup'):
+            profile = quantize_profile(student_data)
+            key = profile_key(profile)
+            recommendations_json = response_cache.get(key, snapshot)
+        if recommendations_json is None:
+            recommendations_df = recommend_internships(
+                profile, current_internships, scalers, snapshot.index, snapshot.text
+            )
+            with span(STAGE_SECONDS, 'format'):
+                recommendations_json = format_recommendations(recommendations_df)
+            response_cache.put(key, snapshot, recommendations_json)
         
-        # Format scores and other fields for display
-        for rec in recommendations_json:
-            rec['total_score'] = round(float(rec['total_score']), 2)
-            rec['stipend'] = float(rec['stipend']) if rec['stipend'] else 0
-            rec['application_deadline'] = str(rec['application_deadline']) if rec['application_deadline'] else None
+        if not recommendations_json:
+            return json_response(recommendation_payload(recommendations_json))
         
         logger.info(f"Returned {len(recommendations_json)} recommendations")
         
-        return jsonify({
-            "success": True,
-            "count": len(recommendations_json),
-            "recommendations": recommendations_json
-        })
+        with span(STAGE_SECONDS, 'serialization'):
+            return json_response(recommendation_payload(recommendations_json))
     
     except Exception as e:
         logger.error(f"Error processing recommendation request: {e}")
@@ -255,50 +694,337 @@ def get_recommendations():
             "recommendations": []
         }), 500
 
-@app.route('/internships', methods=['GET'])
-def get_all_internships():
-    """Get all active internships"""
+@api.route('/recommend/batch', methods=['POST'])
+def get_batch_recommendations():
+    """
+    Endpoint to get recommendations for many students in one call
+    
+    Expected JSON payload:
+    {
+        "top_k": 10,
+        "students": [
+            {"student_id": 7, "domain": "Web Development", "cgpa": 8.1,
+             "experience_years": 0, "certifications": 1},
+            ...
+        ]
+    }
+    
+    "student_id" is optional and echoed back; results keep the input order.
+    "top_k" defaults to TOP_K and is clamped to MAX_TOP_K.
+    """
     try:
-        current_internships = load_internships()
+        payload = request.get_json()
         
-        if current_internships.empty:
-            return jsonify({
-                "success": True,
-                "count": 0,
-                "internships": []
-            })
+        if not payload or not isinstance(payload.get('students'), list):
+            return jsonify({"error": "Expected a JSON object with a 'students' list"}), 400
         
-        internships_json = current_internships.to_dict('records')
+        students = payload['students']
+        if len(students) > MAX_BATCH_STUDENTS:
+            return jsonify({"error": f"At most {MAX_BATCH_STUDENTS} students per batch"}), 400
         
-        # Format data
-        for internship in internships_json:
-            internship['stipend'] = float(internship['stipend']) if internship['stipend'] else 0
-            internship['application_deadline'] = str(internship['application_deadline']) if internship['application_deadline'] else None
+        k = parse_top_k(payload.get('top_k', TOP_K))
+        if k is None:
+            return jsonify({"error": "top_k must be a positive integer"}), 400
         
-        return jsonify({
+        # Validate every profile up front; invalid ones get an error entry instead of failing the batch
+        required_fields = ['domain', 'cgpa', 'experience_years', 'certifications']
+        results = []
+        valid_students = []
+        for student in students:
+            missing_fields = [field for field in required_fields if not isinstance(student, dict) or field not in student]
+            entry = {"student_id": student.get('student_id') if isinstance(student, dict) else None}
+            if missing_fields:
+                entry["error"] = f"Missing required fields: {', '.join(missing_fields)}"
+            else:
+                valid_students.append(student)
+            results.append(entry)
+        
+        snapshot = catalog.current()
+        rankings = iter(recommend_internships_batch(
+            valid_students, snapshot.frame, scalers, snapshot.index, k=k, text=snapshot.text
+        ))
+        
+        for entry in results:
+            if "error" in entry:
+                continue
+            recommendations_json = format_recommendations(next(rankings))
+            entry["count"] = len(recommendations_json)
+            entry["recommendations"] = recommendations_json
+        
+        logger.info(f"Returned batch recommendations for {len(valid_students)} students")
+        
+        return json_response({
             "success": True,
-            "count": len(internships_json),
-            "internships": internships_json
+            "count": len(results),
+            "results": results
         })
     
+    except Exception as e:
+        logger.error(f"Error processing batch recommendation request: {e}")
+        return jsonify({"error": str(e), "results": []}), 500
+
+@api.route('/internships', methods=['GET'])
+def get_all_internships():
+    """
+    Get active internships
+    
+    Query parameters (all optional):
+        fields: comma-separated columns to include (default: all)
+        offset: index of the first internship (default: 0)
+        limit: internships per page, at most INTERNSHIPS_MAX_PAGE (default: all)
+    
+    The full listing is serialized once per catalog snapshot. Responses carry
+    an ETag (If-None-Match gives 304 Not Modified) and are gzipped when the
+    client accepts it.
+    """
+    try:
+        payload = catalog.current().payload
+        
+        fields = request.args.get('fields')
+        offset = request.args.get('offset', type=int, default=0)
+        limit = request.args.get('limit', type=int)
+        if offset < 0 or (limit is not None and not 1 <= limit <= INTERNSHIPS_MAX_PAGE):
+            return jsonify({"error": f"offset must be >= 0 and limit between 1 and {INTERNSHIPS_MAX_PAGE}"}), 400
+        
+        if fields:
+            fields = [f.strip() for f in fields.split(',') if f.strip()]
+            unknown = [f for f in fields if f not in payload.fields]
+            if unknown:
+                return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+        
+        if not fields and not offset and limit is None:
+            body, gzipped, tag = payload.full_body()
+        else:
+            internships_json = payload.records(fields or None, offset, limit)
+            body = dumps({
+                "success": True,
+                "count": len(internships_json),
+                "total": len(payload),
+                "offset": offset,
+                "internships": internships_json
+            })
+            gzipped, tag = None, etag(body)
+        
+        response = Response(body, mimetype='application/json')
+        response.vary.add('Accept-Encoding')
+        response.cache_control.no_cache = True  # clients may keep it but must revalidate
+        if len(body) >= GZIP_MIN_BYTES and 'gzip' in request.accept_encodings:
+            response.set_data(gzipped if gzipped is not None else gzip.compress(body))
+            response.content_encoding = 'gzip'
+            tag += '-gzip'
+        response.set_etag(tag)
+        return response.make_conditional(request)
+    
     except Exception as e:
         logger.error(f"Error fetching internships: {e}")
         return jsonify({"error": str(e)}), 500
 
+def export_response(open_chunks, types, name):
+    """
+    Stream an export as JSON Lines (default) or Parquet (?format=parquet), chunk by chunk
+
+    The body is sent with chunked transfer encoding while rows are still being
+    read from the database. Errors found once streaming has started can only
+    end the stream early; they are logged.
+    """
+    fmt = request.args.get('format', 'jsonl')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    if fmt == 'parquet' and not PARQUET_AVAILABLE:
+        return jsonify({"error": PARQUET_MISSING_ERROR}), 501
+    try:
+        chunks = open_chunks()
+    except ExportUnavailable as e:
+        return jsonify({"error": str(e)}), 503
+
+    def body():
+        try:
+            yield from encode(chunks, fmt, types)
+        except Exception as e:
+            logger.error(f"Export of {name} stopped early: {e}")
+
+    response = Response(body(), mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={name}.{fmt}'
+    return response
+
+@api.route('/export/internships', methods=['GET'])
+def export_internships():
+    """Every active internship, read from the database with a server-side cursor"""
+    return export_response(catalog_chunks, CATALOG_TYPES, 'internships')
+
+@api.route('/export/recommendations', methods=['GET'])
+def export_recommendations():
+    """
+    Top-k recommendations (?top_k=, default TOP_K, at most MAX_TOP_K) of every student profile
+
+    One row per student and rank. Profiles are streamed from user_details and
+    scored in chunks, so memory stays flat for any cohort size. Whole-cohort
+    exports can outlast the pre-fork server's worker timeout with sync
+    workers; use threads, or ``python export.py recommendations``. Like the
+    admin routes, it answers loopback clients only (see ADMIN_PATHS).
+    """
+    k = parse_top_k(request.args.get('top_k', TOP_K))
+    if k is None:
+        return jsonify({"error": "top_k must be a positive integer"}), 400
+    snapshot = catalog.current()
+    if not catalog.ready:
+        return jsonify({"error": "Internship catalog is not available"}), 503
+    return export_response(lambda: recommendation_chunks(snapshot, k), RECOMMENDATION_TYPES, 'recommendations')
+
 # ---------------------------
-# 7. RUN THE SERVER
+# 7. APP FACTORY
 # ---------------------------
-if __name__ == '__main__':
+def warm_up(background=True):
+    """
+    Load the catalog ahead of the first request
+
+    In the background the server answers /health (with "catalog_ready": false)
+    right away; a request that needs the catalog meanwhile waits for this load
+    instead of starting another. If it fails, requests retry at most once per
+    ``check_interval``. Returns the loading thread, or None when run in the
+    foreground.
+    """
+    def load():
+        started = time.perf_counter()
+        catalog.refresh()
+        state = "ready" if catalog.ready else "unavailable, retrying on a later request"
+        logger.info(f"Catalog warm-up: {len(catalog.snapshot().frame)} internships, {state} "
+                    f"({time.perf_counter() - started:.2f}s)")
+
+    if not background:
+        load()
+        return None
+    thread = threading.Thread(target=load, name="catalog-warmup", daemon=True)
+    thread.start()
+    return thread
+
+def create_app(warm=False):
+    """Build the Flask app; with ``warm`` the catalog starts loading in a background thread"""
+    flask_app = Flask(__name__)
+    CORS(flask_app)  # Enable CORS for PHP frontend
+    flask_app.register_blueprint(api)
+    if warm:
+        warm_up()
+    return flask_app
+
+# WSGI entry point (e.g. gunicorn recommendation_api:app); building it does no I/O
+app = create_app()
+
+# ---------------------------
+# 8. RUN THE SERVER
+# ---------------------------
+def print_banner(host, port, mode):
     print("\n" + "="*60)
     print("🚀 INTERNSHIP RECOMMENDATION API SERVER")
     print("="*60)
     print(f"📊 Database: {DB_CONFIG['database']}")
-    print(f"📍 Server: http://localhost:5000")
+    print(f"📍 Server: http://{host}:{port} ({mode})")
     print(f"🔗 Endpoints:")
     print(f"   - GET  /health (health check)")
     print(f"   - POST /recommend (get recommendations)")
+    print(f"   - POST /recommend/batch (recommendations for many students)")
     print(f"   - GET  /internships (get all internships)")
-    print(f"📦 Internships loaded: {len(all_internships)}")
+    print(f"   - GET  /export/internships, /export/recommendations (JSON Lines or Parquet)")
+    print(f"   - POST /admin/catalog/refresh (force catalog reload)")
+    print(f"   - GET  /admin/catalog/memory (catalog memory report)")
+    if not ADMIN_ALLOW_REMOTE:
+        print(f"   (/admin/* and /export/recommendations only from localhost; ADMIN_ALLOW_REMOTE=1 opens them)")
+    print(f"   - GET  /metrics (Prometheus metrics)")
+    if catalog.ready:
+        print(f"📦 Internships loaded: {len(catalog.snapshot().frame)}")
+    else:
+        print(f"📦 Internships: loading on startup")
     print("="*60 + "\n")
-    
-    app.run(host='0.0.0.0', port=5000, debug=True)
+
+def _when_ready(server):
+    # Runs in the master once the sockets are bound, before workers fork. The
+    # catalog is loaded here so every worker inherits it; connections queue in
+    # the listen backlog meanwhile. Workers must not share MySQL sockets, and
+    # freezing the GC keeps the collector from touching (and so copying) the
+    # inherited catalog pages in every worker.
+    warm_up(background=False)
+    close_pool()
+    gc.freeze()
+
+def serve(host='0.0.0.0', port=5000, workers=4, threads=2, timeout=30, max_requests=0):
+    """
+    Run the API under gunicorn's pre-fork server
+
+    The app and its catalog snapshot are loaded once in the master
+    (``preload_app`` and the ``when_ready`` hook) and inherited copy-on-write
+    by every worker; each worker then keeps its snapshot current on its own.
+    Send SIGHUP to the master for a graceful reload (new workers start before
+    old ones finish their requests) and SIGTERM for a graceful shutdown.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        logger.warning("gunicorn is not installed (pip install gunicorn); "
+                       "falling back to the threaded single-process server")
+        warm_up()
+        app.run(host=host, port=port, debug=False, threaded=True)
+        return
+
+    options = {
+        'bind': f'{host}:{port}',
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': True,
+        'timeout': timeout,
+        'graceful_timeout': 30,
+        'keepalive': 5,
+        'max_requests': max_requests,
+        'max_requests_jitter': max_requests // 10,
+        'when_ready': _when_ready
+    }
+
+    class RecommendationServer(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    RecommendationServer().run()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Internship recommendation API")
+    subparsers = parser.add_subparsers(dest='command')
+
+    dev = subparsers.add_parser('dev', help="Flask development server with the debugger (default)")
+    dev.add_argument('--host', default='0.0.0.0')
+    dev.add_argument('--port', type=int, default=5000)
+
+    prod = subparsers.add_parser('serve', help="production pre-fork server (gunicorn)")
+    prod.add_argument('--host', default='0.0.0.0')
+    prod.add_argument('--port', type=int, default=5000)
+    prod.add_argument('--workers', type=int, default=(os.cpu_count() or 1) * 2 + 1)
+    prod.add_argument('--threads', type=int, default=2, help="threads per worker")
+    prod.add_argument('--timeout', type=int, default=30, help="seconds before a stuck worker is restarted")
+    prod.add_argument('--max-requests', type=int, default=0,
+                      help="recycle a worker after this many requests (0 = never)")
+
+    subparsers.add_parser('migrate', help="add the optional internships columns (e.g. required_skills)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'migrate':
+        added = migrate()
+        if added is None:
+            sys.exit("❌ Could not inspect the internships table (is MySQL running?)")
+        print(f"✅ Added columns: {', '.join(added)}" if added else "✅ Schema is up to date")
+    elif args.command == 'serve':
+        print_banner(args.host, args.port, f"gunicorn, {args.workers} workers x {args.threads} threads")
+        serve(args.host, args.port, args.workers, args.threads, args.timeout, args.max_requests)
+    else:
+        host = getattr(args, 'host', '0.0.0.0')
+        port = getattr(args, 'port', 5000)
+        print_banner(host, port, "development server")
+        if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+            warm_up()  # only in the reloader's child, which is the process serving requests
+        app.run(host=host, port=port, debug=True)
+
+if __name__ == '__main__':
+    main()
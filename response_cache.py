@@ -0,0 +1,121 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+from domains import normalize_domain
+from skills import parse_skills
+
+# ---------------------------
+# 1. CACHE SETTINGS
+# ---------------------------
+# Set RECOMMEND_CACHE_SIZE=0 to disable caching
+RECOMMEND_CACHE_SIZE = int(os.environ.get('RECOMMEND_CACHE_SIZE', 4096))   # entries (~10 KB each)
+RECOMMEND_CACHE_TTL = float(os.environ.get('RECOMMEND_CACHE_TTL', 300))    # seconds
+
+# ---------------------------
+# 2. PROFILE QUANTIZATION
+# ---------------------------
+def quantize_profile(student_data):
+    """
+    Canonical copy of the fields recommendations depend on
+
+    CGPA and experience are rounded to 0.01, certifications to a whole number,
+    the domain and skills are normalized. Recommendations are computed from
+    this copy, so every profile that maps to the same key gets exactly the
+    cached answer.
+    """
+    skills = tuple(sorted(parse_skills(student_data.get('skills'))))
+    return {
+        'domain': normalize_domain(student_data['domain']),
+        'cgpa': round(float(student_data['cgpa']), 2),
+        'experience_years': round(float(student_data['experience_years']), 2),
+        'certifications': int(round(float(student_data['certifications']))),
+        'skills': list(skills)
+    }
+
+def profile_key(profile):
+    """Hashable cache key of a quantized profile"""
+    return (profile['domain'], profile['cgpa'], profile['experience_years'],
+            profile['certifications'], tuple(profile['skills']))
+
+# ---------------------------
+# 3. LRU / TTL RESULT CACHE
+# ---------------------------
+class ResponseCache:
+    """
+    Bounded LRU cache of formatted recommendations for one catalog snapshot
+
+    Entries are tied to the snapshot they were computed from: the first lookup
+    with a newer snapshot (i.e. after a catalog refresh) empties the cache,
+    so a result is never served across catalog versions. Lookups and stores
+    for an older snapshot than the cached one (a request that started before
+    the refresh) are ignored instead. Snapshots are ordered by their
+    ``generation``. Entries also expire after ``ttl`` seconds. Each server
+    process keeps its own cache.
+    """
+
+    def __init__(self, max_entries=RECOMMEND_CACHE_SIZE, ttl=RECOMMEND_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._generation = -1
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0,
+                       "stale_puts": 0}
+
+    def _check_snapshot(self, snapshot):
+        """False for a snapshot older than the cached entries; a newer one empties the cache"""
+        if snapshot.generation < self._generation:
+            return False
+        if snapshot.generation > self._generation:
+            if self._entries:
+                self._stats["invalidations"] += 1
+            self._entries.clear()
+            self._generation = snapshot.generation
+        return True
+
+    def get(self, key, snapshot):
+        """Cached value for key under snapshot, or None"""
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key) if self._check_snapshot(snapshot) else None
+            if entry is not None and time.monotonic() - entry[0] >= self.ttl:
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def put(self, key, snapshot, value):
+        """Store value for key, evicting the least recently used entries past max_entries"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if not self._check_snapshot(snapshot):
+                self._stats["stale_puts"] += 1
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters and occupancy for /health"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["max_entries"] = self.max_entries
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+        return stats
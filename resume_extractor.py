@@ -1,198 +1,115 @@
-import streamlit as st
-import fitz
-import re
-import spacy
-
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    st.error("⚠ Please install spaCy model: python -m spacy download en_core_web_sm")
-    st.stop()
-
-# ========== STEP 1: Extract text from PDF ==========
-def extract_text_from_pdf(pdf_file):
-    text = ""
-    with fitz.open(stream=pdf_file.read(), filetype="pdf") as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
-
-
-# ========== STEP 2: Extract information ==========
-def extract_info(text):
-    info = {}
-    doc = nlp(text)
-
-    # ========== NAME ==========
-    def extract_full_name(text):
-        lines = [line.strip() for line in text.split("\n") if line.strip()]
-        for line in lines[:5]:
-            if "@" in line or re.search(r'\d', line):
-                continue
-            words = line.split()
-            if 1 < len(words) <= 4 and all(w[0].isupper() for w in words if w.isalpha()):
-                return line
-        return None
-
-    info["name"] = extract_full_name(text)
-
-    # ========== EMAIL ==========
-    email = re.findall(r'\S+@\S+', text)
-    info["email"] = email[0] if email else None
-
-    # ========== PHONE ==========
-    phone = re.findall(r'\+?\d[\d\s-]{8,}\d', text)
-    info["phone"] = phone[0] if phone else None
-
-    # ========== EDUCATION ==========
-    edu_keywords = ["B.Tech", "B.E", "M.Tech", "Bachelor", "Master", "Degree", "University", "College"]
-    education_lines = [line.strip() for line in text.split("\n") if any(k in line for k in edu_keywords)]
-    filtered_education = [l for l in education_lines if not any(substr in l.lower() for substr in ["coursera", "computer communications", "university of colorado"])]
-    info["education"] = " | ".join(filtered_education) if filtered_education else None
-
-    # ========== EXPERIENCE ==========
-    # prepare lines for section-aware extraction
-    lines = [line.strip() for line in text.split("\n") if line.strip()]
-    lower_lines = [l.lower() for l in lines]
-
-    # detect whether an explicit Experience/Work Experience heading exists
-    # Only treat a line as a heading if it's a short, standalone line (to avoid matching inline words)
-    exp_heading_tokens = ["experience", "work experience", "professional experience", "employment"]
-    def is_heading_line(line):
-        s = line.strip()
-        if not s or len(s) > 60:
-            return False
-        for tok in exp_heading_tokens:
-            if s == tok or s.startswith(tok + " ") or s.startswith(tok + ":"):
-                return True
-        return False
-
-    has_exp_heading = any(is_heading_line(l) for l in lower_lines)
-
-    if has_exp_heading:
-        # collect lines under the Experience heading until the next section
-        start_idx = None
-        for i, l in enumerate(lower_lines):
-            if any(tok in l for tok in exp_heading_tokens):
-                start_idx = i + 1
-                break
-        exp_section = []
-        stop_tokens = ["education", "project", "projects", "skills", "certification", "certifications", "achievement", "awards", "interests"]
-        if start_idx is not None:
-            for line in lines[start_idx:]:
-                low = line.lower()
-                if any(tok in low for tok in stop_tokens):
-                    break
-                exp_section.append(re.sub(r'^[\u2022\-\*\s]+', '', line))
-        info["experience"] = " | ".join(exp_section) if exp_section else "NOT APPLICABLE"
-    else:
-        # No explicit Experience section — report Not Applicable
-        info["experience"] = "NOT APPLICABLE"
-
-    # ========== PROJECTS ==========
-    proj_keywords = ["Project", "Developed", "Implemented", "Built", "Designed", "Created"]
-    project_lines = [line.strip() for line in text.split("\n") if any(k.lower() in line.lower() for k in proj_keywords)]
-    info["projects"] = " | ".join(project_lines) if project_lines else "Not Applicable"
-
-    # ========== SKILLS ==========
-    skills_keywords = ["Java", "Python", "C++", "C", "HTML", "CSS", "JavaScript", "PHP", "MySQL", "jQuery",
-                       "Machine Learning", "AI", "Data Science", "Cloud", "DevOps", "Git", "GitHub"]
-    found_skills = [skill for skill in skills_keywords if skill.lower() in text.lower()]
-    info["skills"] = found_skills if found_skills else ["Not Mentioned"]
-
-    # ========== CERTIFICATIONS ==========
-    lines = [line.strip() for line in text.split("\n") if line.strip()]
-    lower_lines = [line.lower() for line in lines]
-
-    certs = []
-    start_idx = None
-    for i, line in enumerate(lower_lines):
-        if "certification" in line or "certificate" in line:
-            start_idx = i + 1
-            break
-
-    if start_idx is not None:
-        for line in lines[start_idx:]:
-            if any(word in line.lower() for word in ["achievement", "education", "experience", "project", "skills"]):
-                break
-            if line and not line.lower().startswith("certification"):
-                certs.append(line)
+import os
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-    date_pattern = re.compile(r'^(?:[A-Za-z]{3,9}\s+\d{4}|\d{4})$')
-    clean_certs = []
-    for c in certs:
-        s = c.strip()
-        if date_pattern.match(s):
-            continue
-        s = re.sub(r'^[\u2022\-\*\s]+', '', s)
-        if s:
-            clean_certs.append(s)
-
-    info["certifications"] = clean_certs if clean_certs else ["Not Mentioned"]
-
-    return info
+import streamlit as st
 
+# Extraction itself (patterns, sections, spaCy NER, result cache) is the
+# extractor_cli.py core; this file is only the reviewer UI around it.
+from extractor_cli import init_worker, worker_extract_bytes, worker_ready, MODEL_MISSING_ERROR
+
+# ========== SETTINGS ==========
+EXTRACT_WORKERS = max(1, min(4, os.cpu_count() or 1))  # processes extracting uploads concurrently
+
+# ========== STEP 1: Shared extraction pool ==========
+# Streamlit re-runs this script on every widget interaction. The pool is a
+# process-wide resource: it is created once per server, and each worker loads
+# the spaCy model and compiles the patterns once, for every session and rerun.
+@st.cache_resource(show_spinner="Loading the extraction model... ⏳")
+def get_pool():
+    pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS, initializer=init_worker)
+    model_ready = all(f.result() for f in [pool.submit(worker_ready) for _ in range(EXTRACT_WORKERS)])
+    return pool, model_ready
+
+# ========== STEP 2: Extract a batch of uploads ==========
+def upload_key(upload, regex_only):
+    """Content hash of an upload, so two files both named resume.pdf stay apart"""
+    return hashlib.sha256(upload.getvalue()).hexdigest(), regex_only
+
+def extract_uploads(files, regex_only):
+    """(name, fields) per upload in upload order, extracted concurrently; results of this session are reused across reruns"""
+    done = st.session_state.setdefault("results", {})
+    keys = [upload_key(f, regex_only) for f in files]
+    pending = {key: f for key, f in zip(keys, files) if key not in done}
+    if pending:
+        pool, _ = get_pool()
+        progress = st.progress(0.0, text=f"Extracting 0/{len(pending)} resumes...")
+        futures = {pool.submit(worker_extract_bytes, f.getvalue(), regex_only): key for key, f in pending.items()}
+        for finished, future in enumerate(as_completed(futures), 1):
+            try:
+                info = future.result()
+            except Exception as e:
+                info = {"error": f"Extraction failed: {e}"}
+            done[futures[future]] = info
+            progress.progress(finished / len(pending), text=f"Extracting {finished}/{len(pending)} resumes...")
+        progress.empty()
+    return [(f.name, done[key]) for f, key in zip(files, keys)]
 
 # ========== STEP 3: Streamlit UI ==========
-st.set_page_config(page_title="Resume Extractor", layout="centered")
-st.title("📄 Smart Resume Information Extractor")
-
-uploaded_file = st.file_uploader("Upload your Resume (PDF)", type=["pdf"])
-
-if uploaded_file:
-    with st.spinner("Extracting information... ⏳"):
-        text = extract_text_from_pdf(uploaded_file)
-        info = extract_info(text)
-
-    st.success("Extraction complete!")
-
-    st.header("Extracted Details")
-
-    # Name
+def show_items(label, value, empty_values, separator=" | "):
+    st.subheader(label)
+    if not value or value in empty_values:
+        st.write(value or "Not Found")
+        return
+    for item in value.split(separator):
+        st.write("•", item)
+
+def show_details(info):
     st.subheader("Name")
-    st.write(info["name"] or "Not Found")
-
-    # Email
+    st.write(info.get("name") or "Not Found")
     st.subheader("Email")
-    st.write(info["email"] or "Not Found")
-
-    # Phone
+    st.write(info.get("email") or "Not Found")
     st.subheader("Phone")
-    st.write(info["phone"] or "Not Found")
+    st.write(info.get("phone") or "Not Found")
+    show_items("Education", info.get("education"), {"Not Mentioned"})
+    show_items("Experience", info.get("experience"), {"NOT APPLICABLE"})
+    show_items("Projects", info.get("projects"), {"Not Applicable"})
+    st.subheader("Skills")
+    st.write(info.get("skills") or "Not Mentioned")
+    show_items("Certifications", info.get("certifications"), {"Not Mentioned"})
 
-    # Education
-    st.subheader("Education")
-    if info["education"]:
-        for edu in info["education"].split(" | "):
-            st.write("•", edu)
-    else:
-        st.write("Not Found")
+st.set_page_config(page_title="Resume Extractor", layout="centered")
+st.title("📄 Smart Resume Information Extractor")
 
-    # Experience
-    st.subheader("Experience")
-    if info["experience"] == "NOT APPLICABLE":
-        st.write("NOT APPLICABLE")
-    else:
-        for exp in info["experience"].split(" | "):
-            st.write("•", exp)
+uploaded_files = st.file_uploader("Upload resumes (PDF)", type=["pdf"], accept_multiple_files=True)
+fast_mode = st.checkbox("Fast mode (regex only, no spaCy)")
 
-    # Projects
-    st.subheader("Projects")
-    if info["projects"] == "Not Applicable":
-        st.write("Not Applicable")
-    else:
-        for proj in info["projects"].split(" | "):
-            st.write("•", proj)
+if not fast_mode and not get_pool()[1]:
+    st.error(f"⚠ {MODEL_MISSING_ERROR}, or use fast mode.")
+    st.stop()
 
-    # Skills
-    st.subheader("Skills")
-    st.write(", ".join(info["skills"]))
+if uploaded_files:
+    results = extract_uploads(uploaded_files, regex_only=fast_mode)
+    failed = sum("error" in info for _, info in results)
+    st.success(f"Extracted {len(results) - failed} of {len(results)} resumes.")
+
+    st.header("Batch Overview")
+    st.dataframe([
+        {
+            "File": name,
+            "Name": info.get("name"),
+            "Email": info.get("email"),
+            "Phone": info.get("phone"),
+            "Skills": info.get("skills"),
+            "Status": info.get("error", "OK")
+        }
+        for name, info in results
+    ], use_container_width=True)
+    st.download_button(
+        "Download results (JSON Lines)",
+        "".join(json.dumps({"file": name, **info}) + "\n" for name, info in results),
+        file_name="resumes.jsonl",
+        mime="application/x-ndjson"
+    )
 
-    # Certifications
-    st.subheader("Certifications")
-    for cert in info["certifications"]:
-        st.write("•", cert)
+    st.header("Extracted Details")
+    for name, info in results:
+        with st.expander(name, expanded=len(results) == 1):
+            if "error" in info:
+                st.error(info["error"])
+            else:
+                show_details(info)
 
 else:
-    st.info("Please upload a PDF resume to begin.")
\ No newline at end of file
+    st.info("Please upload one or more PDF resumes to begin.")
@@ -0,0 +1,255 @@
+from collections import namedtuple
+
+import numpy as np
+
+from domains import DomainIndex
+from skills import SkillIndex, SKILL_WEIGHT
+from eligibility import EligibilityIndex
+
+# ---------------------------
+# 1. FEATURE LAYOUT
+# ---------------------------
+# Column order of the importance matrix; student features are scaled into the same order
+IMPORTANCE_COLUMNS = ['importance_domain', 'importance_cgpa', 'importance_experience', 'importance_certifications']
+STUDENT_FEATURES = ['cgpa', 'experience_years', 'certifications']
+
+TOP_K = 10
+
+# Feature ranges the student features are min-max scaled from
+FEATURE_RANGES = {
+    'cgpa': (0, 10),
+    'experience_years': (0, 5),
+    'certifications': (0, 10)
+}
+
+# x -> x * scale + offset, the closed form of a (0, 1) min-max scaler fitted on [low, high]
+FeatureScale = namedtuple('FeatureScale', ['scale', 'offset'])
+
+def min_max_scale(low, high):
+    scale = 1.0 / (high - low)
+    return FeatureScale(scale, -low * scale)
+
+default_scalers = {feature: min_max_scale(low, high) for feature, (low, high) in FEATURE_RANGES.items()}
+
+def scale_student(student_data, scalers):
+    """Min-max scale cgpa, experience and certifications into STUDENT_FEATURES order"""
+    return np.array([
+        float(student_data[feature]) * scalers[feature].scale + scalers[feature].offset
+        for feature in STUDENT_FEATURES
+    ])
+
+def weighted_scores(importance, domain_scores, scaled):
+    """
+    Importance-weighted sum of the domain score and the scaled student features
+
+    Every scoring path goes through here, term by term in one fixed order, so
+    single-student and batch scores agree bit for bit and tie the same way (a
+    BLAS product may sum in any order or fuse multiply-adds). ``importance`` is
+    (n, 4); ``domain_scores`` and ``scaled`` are (n,) and (3,) for one student,
+    or (m, n) and (m, 3) for m students.
+    """
+    scores = domain_scores * importance[:, 0]
+    term = np.empty_like(scores)
+    for j in range(len(STUDENT_FEATURES)):
+        np.multiply(importance[:, j + 1], np.expand_dims(scaled[..., j], -1), out=term)
+        scores += term
+    return scores
+
+def skill_bonus(coverage):
+    """Score bonus for covering a share of an internship's required skills"""
+    return SKILL_WEIGHT * coverage
+
+# ---------------------------
+# 2. PRECOMPUTED SCORING INDEX
+# ---------------------------
+class ScoringIndex:
+    """
+    Contiguous NumPy view of an internships DataFrame, built once per catalog snapshot
+
+    Row ``i`` of every array corresponds to row ``i`` (positionally) of the frame it
+    was built from. ``required_domain`` goes into a ``DomainIndex``, so the
+    domain score of a request is a precomputed similarity row gathered through
+    the dictionary-encoded internship domains. ``rank`` uses the
+    ``EligibilityIndex`` to score only the open postings a student qualifies
+    for; ``score`` and ``score_batch`` produce full-catalog arrays.
+    """
+
+    def __init__(self, internships_df):
+        self.size = len(internships_df)
+
+        # Hard-filter thresholds
+        self.min_cgpa = internships_df['min_cgpa'].to_numpy(dtype=np.float64)
+        self.required_experience = internships_df['required_experience'].to_numpy(dtype=np.float64)
+        self.min_certifications = internships_df['min_certifications'].to_numpy(dtype=np.float64)
+        self.eligibility = EligibilityIndex(
+            self.min_cgpa, self.required_experience, self.min_certifications,
+            internships_df['application_deadline'].to_numpy() if 'application_deadline' in internships_df else None
+        )
+
+        # (n, 4) importance weights: domain, cgpa, experience, certifications. float32
+        # halves the largest per-posting array; products with the float64 student
+        # features and domain scores are still accumulated in float64.
+        self.importance = np.ascontiguousarray(
+            internships_df[IMPORTANCE_COLUMNS].to_numpy(dtype=np.float32)
+        )
+
+        # Normalized, dictionary-encoded domains with precomputed similarity rows
+        # (object first: a categorical column cannot be filled with a new category)
+        self.domains = DomainIndex(
+            internships_df['required_domain'].astype(object).fillna('').astype(str).to_numpy()
+        )
+
+        # Required skills as a sparse inverted index (frames without the column require none)
+        if 'required_skills' in internships_df:
+            self.skills = SkillIndex(internships_df['required_skills'].to_numpy())
+        else:
+            self.skills = SkillIndex([None] * self.size)
+
+    def __len__(self):
+        return self.size
+
+    def domain_match(self, student_domain):
+        """Per-internship domain similarity in [0, 1] (see ``domains.domain_similarity``)"""
+        return self.domains.scores(student_domain)
+
+    def eligible_mask(self, cgpa, experience_years, certifications):
+        """Boolean mask of internships whose minimum requirements the student meets"""
+        return (
+            (self.min_cgpa <= cgpa) &
+            (self.required_experience <= experience_years) &
+            (self.min_certifications <= certifications)
+        )
+
+    def score(self, student_data, scalers):
+        """
+        Score every internship for one student
+
+        The optional ``skills`` field (list or comma-separated string) adds up
+        to ``SKILL_WEIGHT`` for internships whose required skills it covers.
+
+        Returns:
+            (scores, mask): float64 total scores and the hard-filter mask, both of length n
+        """
+        mask = self.eligible_mask(
+            float(student_data['cgpa']),
+            float(student_data['experience_years']),
+            float(student_data['certifications'])
+        )
+        mask &= self.eligibility.open_mask()
+        scaled = scale_student(student_data, scalers)
+        scores = weighted_scores(self.importance, self.domain_match(student_data['domain']), scaled)
+
+        # Skill bonus, touching only internships that require one of the student's skills
+        positions, coverage = self.skills.coverage(student_data.get('skills'))
+        scores[positions] += skill_bonus(coverage)
+        return scores, mask
+
+    def candidates(self, student_data):
+        """Sorted positions of open internships whose minimum requirements the student meets"""
+        return self.eligibility.candidates(
+            float(student_data['cgpa']),
+            float(student_data['experience_years']),
+            float(student_data['certifications'])
+        )
+
+    def score_candidates(self, student_data, scalers, positions):
+        """Total scores of the internships at ``positions`` (e.g. from ``candidates``)"""
+        scaled = scale_student(student_data, scalers)
+        domain_row = self.domains.row(student_data['domain'])
+        importance = np.take(self.importance, positions, axis=0)
+        scores = weighted_scores(importance, domain_row[self.domains.codes[positions]], scaled)
+
+        matched = self.skills.matched_counts(student_data.get('skills'))
+        if matched is not None:
+            scores += skill_bonus(matched[positions] * self.skills.inverse_required[positions])
+        return scores
+
+    def rank(self, student_data, scalers, k=TOP_K):
+        """
+        Best k eligible internships for one student, scoring only the pre-filtered candidates
+
+        Returns:
+            (positions, scores): catalog positions and total scores, best first
+        """
+        positions = self.candidates(student_data)
+        if len(positions) == 0:
+            return positions, np.empty(0)
+        scores = self.score_candidates(student_data, scalers, positions)
+        top = top_k(scores, None, k)
+        return positions[top], scores[top]
+
+    def score_batch(self, students, scalers):
+        """
+        Score every internship for many students at once
+
+        The hard filters are broadcast as (m, 1) student columns against (1, n)
+        internship thresholds; the domain score is looked up once per distinct
+        student domain and gathered into the (m, n) matrix.
+
+        Returns:
+            (scores, mask): (m, n) float64 scores and boolean hard-filter mask
+        """
+        cgpa = np.array([float(s['cgpa']) for s in students])[:, None]
+        experience = np.array([float(s['experience_years']) for s in students])[:, None]
+        certifications = np.array([float(s['certifications']) for s in students])[:, None]
+        mask = (
+            (self.min_cgpa[None, :] <= cgpa) &
+            (self.required_experience[None, :] <= experience) &
+            (self.min_certifications[None, :] <= certifications)
+        ) & self.eligibility.open_mask()[None, :]
+
+        domain_scores = self.domains.score_matrix([s['domain'] for s in students])
+
+        scaled = np.array([scale_student(s, scalers) for s in students]).reshape(len(students), 3)
+        scores = weighted_scores(self.importance, domain_scores, scaled)
+
+        coverage = self.skills.coverage_batch([s.get('skills') for s in students])
+        scores[coverage.row, coverage.col] += skill_bonus(coverage.data)
+        return scores, mask
+
+# ---------------------------
+# 3. TOP-K SELECTION
+# ---------------------------
+def top_k(scores, mask, k=TOP_K):
+    """
+    Positions of the k best eligible scores, best first; ties go to the lower position
+
+    Uses ``np.argpartition`` to find the k-th best score, then fully sorts only
+    the scores at or above it, so the result is the same as a stable full sort.
+    A ``mask`` of None treats every score as eligible.
+    """
+    candidates = np.arange(len(scores)) if mask is None else np.flatnonzero(mask)
+    candidate_scores = scores[candidates]
+    if len(candidates) > k:
+        kth = candidate_scores[np.argpartition(-candidate_scores, k - 1)[k - 1]]
+        keep = np.flatnonzero(candidate_scores >= kth)
+        candidates, candidate_scores = candidates[keep], candidate_scores[keep]
+        return candidates[np.lexsort((candidates, -candidate_scores))[:k]]
+    return candidates[np.argsort(-candidate_scores, kind='stable')]
+
+def top_k_batch(scores, mask, k=TOP_K):
+    """
+    Row-wise ``top_k`` for an (m, n) score matrix
+
+    Each row keeps the scores above its k-th best plus as many ties with it as
+    fit, lowest position first, so rows agree with ``top_k`` on ties.
+    Returns a list of m position arrays, best first, containing only eligible internships.
+    """
+    masked = np.where(mask, scores, -np.inf)
+    m, n = masked.shape
+    if n > k:
+        kth = -np.partition(-masked, k - 1, axis=1)[:, k - 1:k]
+        selected = masked >= kth
+        crowded = np.flatnonzero(selected.sum(axis=1) > k)
+        if len(crowded):
+            ties = masked[crowded] == kth[crowded]
+            room = k - (selected[crowded] & ~ties).sum(axis=1, keepdims=True)
+            selected[crowded] &= ~ties | (np.cumsum(ties, axis=1) <= room)
+        part = np.nonzero(selected)[1].reshape(m, k)
+    else:
+        part = np.broadcast_to(np.arange(n), masked.shape)
+    part_scores = np.take_along_axis(masked, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    ranked = np.take_along_axis(part, order, axis=1)
+    ranked_scores = np.take_along_axis(part_scores, order, axis=1)
+    return [row[np.isfinite(row_scores)] for row, row_scores in zip(ranked, ranked_scores)]
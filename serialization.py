@@ -0,0 +1,122 @@
+import gzip
+import json
+import hashlib
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+GZIP_MIN_BYTES = 1024   # smaller bodies are sent uncompressed
+GZIP_LEVEL = 6
+
+# ---------------------------
+# 1. JSON ENCODING
+# ---------------------------
+def _default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def dumps(obj):
+    """Serialize to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, separators=(',', ':')).encode('utf-8')
+
+# ---------------------------
+# 2. COLUMNAR RECORD CONVERSION
+# ---------------------------
+def column_values(df, column):
+    """
+    One column as a list of JSON-ready Python values
+
+    ``stipend`` becomes a float (0 when missing), ``application_deadline`` a
+    string (None when missing) and ``total_score`` is rounded to 2 places;
+    other columns are passed through with NumPy scalars and NaN converted.
+    """
+    values = df[column].to_numpy()
+    if column == 'stipend':
+        return np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0).tolist()
+    if column == 'total_score':
+        return np.round(np.asarray(values, dtype=np.float64), 2).tolist()
+    if column == 'application_deadline':
+        return [None if v is None or v != v or v == '' else str(v) for v in values.tolist()]
+    if values.dtype.kind in 'fO':
+        missing = pd.isna(values)
+        if missing.any():
+            values = values.astype(object)
+            values[missing] = None
+    return values.tolist()
+
+def frame_records(df, columns=None):
+    """Rows of df as dicts, converted column by column instead of row by row"""
+    columns = list(df.columns if columns is None else columns)
+    values = [column_values(df, c) for c in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+# ---------------------------
+# 3. PRE-SERIALIZED CATALOG
+# ---------------------------
+class CatalogPayload:
+    """
+    Pages and the encoded ``/internships`` body of one catalog snapshot
+
+    Pages are converted on request from the snapshot's own storage: only the
+    requested rows and fields of the frame, with columns packed in a
+    ``TextStore`` (see compact.py) decoded for those rows alone. The full
+    body, its gzip encoding and ETag are encoded on first use and cached.
+    """
+
+    def __init__(self, df, text=None, fields=None):
+        self._df = df
+        self._text = text
+        self.fields = list(df.columns) if fields is None else list(fields)
+        self._lock = threading.Lock()
+        self._full = None
+
+    def __len__(self):
+        return len(self._df)
+
+    def _values(self, rows, column, start, end):
+        if self._text is not None and column in self._text:
+            return self._text.columns[column].take(np.arange(start, end))
+        return column_values(rows, column)
+
+    def nbytes(self):
+        """Bytes cached by this payload: the encoded full body and its gzip copy (0 until built)"""
+        full = self._full
+        return {
+            "body_bytes": 0 if full is None else len(full[0]),
+            "gzip_bytes": 0 if full is None else len(full[1])
+        }
+
+    def records(self, fields=None, offset=0, limit=None):
+        """Internship dicts for the selected fields and row range"""
+        fields = self.fields if fields is None else fields
+        end = len(self) if limit is None else min(len(self), offset + limit)
+        start = min(offset, end)
+        rows = self._df.iloc[start:end]
+        sliced = [self._values(rows, f, start, end) for f in fields]
+        return [dict(zip(fields, row)) for row in zip(*sliced)]
+
+    def full_body(self):
+        """(body, gzip body, etag) of the unpaginated response, encoded once"""
+        if self._full is None:
+            body = dumps({"success": True, "count": len(self), "internships": self.records()})
+            with self._lock:
+                if self._full is None:
+                    self._full = (body, gzip.compress(body, GZIP_LEVEL), etag(body))
+                    logger.info(f"Serialized catalog: {len(body)} bytes, {len(self._full[1])} gzipped")
+        return self._full
+
+def etag(body):
+    """Strong ETag (unquoted) for a response body"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
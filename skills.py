@@ -0,0 +1,147 @@
+import re
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# ---------------------------
+# 1. SKILL NORMALIZATION
+# ---------------------------
+# Spelling variants mapped to one canonical (lowercase) skill name
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'k8s': 'kubernetes',
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'sklearn': 'scikit-learn',
+    'amazon web services': 'aws',
+    'google cloud': 'gcp',
+    'html5': 'html',
+    'css3': 'css',
+    'c plus plus': 'c++',
+    'cpp': 'c++'
+}
+
+# Values the extractor writes when nothing was found
+EMPTY_VALUES = {'', 'not mentioned', 'not found', 'none', 'n/a'}
+
+SKILL_WEIGHT = 0.2  # total_score bonus for covering every skill an internship requires
+
+def parse_skills(value):
+    """
+    Canonical skill names from a comma/semicolon/newline separated string or a list
+
+    Handles both the free-text ``skills`` field students type and the
+    ``extracted_skills`` the resume extractor writes.
+    """
+    if value is None or isinstance(value, float):  # NULL / NaN
+        return []
+    if isinstance(value, str):
+        items = re.split(r'[,;\n|]', value)
+    else:
+        items = [str(v) for v in value]
+    skills = []
+    for item in items:
+        skill = ' '.join(item.lower().split())
+        skill = SKILL_ALIASES.get(skill, skill)
+        if skill not in EMPTY_VALUES and skill not in skills:
+            skills.append(skill)
+    return skills
+
+# ---------------------------
+# 2. SPARSE INVERTED INDEX
+# ---------------------------
+class SkillIndex:
+    """
+    Required skills of one catalog snapshot as sparse matrices
+
+    ``by_internship`` is an (n, vocabulary) CSR matrix of required skills and
+    ``by_skill`` its transpose, i.e. the inverted index skill -> internship
+    positions. A request only walks the postings of the skills the student
+    has, rather than comparing skill lists against every posting.
+    """
+
+    def __init__(self, required_skills):
+        # Parse each distinct value once; rows then copy their value's skill ids
+        codes, values = pd.factorize(pd.Series(required_skills, dtype=object))
+        self.vocab = {}
+        value_ids = [
+            [self.vocab.setdefault(skill, len(self.vocab)) for skill in parse_skills(value)]
+            for value in values
+        ]
+        value_len = np.array([len(ids) for ids in value_ids] + [0], dtype=np.int64)  # code -1 (missing) -> last
+        value_start = np.concatenate([[0], np.cumsum(value_len)[:-1]])
+        flat_ids = np.array([i for ids in value_ids for i in ids], dtype=np.int32)
+
+        n = len(codes)
+        row_len = value_len[codes]
+        indptr = np.concatenate([[0], np.cumsum(row_len)])
+        offsets = np.repeat(value_start[codes] - indptr[:-1], row_len)
+        indices = flat_ids[offsets + np.arange(indptr[-1])]
+        self.by_internship = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(n, len(self.vocab))
+        )
+        self.by_skill = self.by_internship.T.tocsr()
+        self.required_count = np.diff(self.by_internship.indptr).astype(np.int32)
+        self.inverse_required = np.divide(
+            1.0, self.required_count, out=np.zeros(n, dtype=np.float32), where=self.required_count > 0,
+            dtype=np.float32
+        )
+
+    def __len__(self):
+        return self.by_internship.shape[0]
+
+    def skill_ids(self, skills):
+        """Vocabulary ids of the skills that some internship requires"""
+        return [self.vocab[s] for s in parse_skills(skills) if s in self.vocab]
+
+    def matched_counts(self, skills):
+        """Number of the student's skills each internship requires, or None if none match"""
+        ids = self.skill_ids(skills)
+        if not ids:
+            return None
+        postings = np.concatenate([
+            self.by_skill.indices[self.by_skill.indptr[i]:self.by_skill.indptr[i + 1]] for i in ids
+        ])
+        return np.bincount(postings, minlength=len(self))
+
+    def coverage(self, skills):
+        """
+        Share of required skills the student has, for internships requiring at least one of them
+
+        Returns:
+            (positions, coverage): internship positions and their coverage in (0, 1]
+        """
+        counts = self.matched_counts(skills)
+        if counts is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        positions = np.flatnonzero(counts)
+        return positions, counts[positions] * self.inverse_required[positions]
+
+    def coverage_batch(self, students_skills):
+        """
+        Coverage for many students as a sparse (m, n) matrix
+
+        The students' skills form an (m, vocabulary) CSR matrix, so the overlap
+        with every internship is one sparse product.
+        """
+        indptr, indices = [0], []
+        for skills in students_skills:
+            indices.extend(self.skill_ids(skills))
+            indptr.append(len(indices))
+        students = sparse.csr_matrix(
+            (np.ones(len(indices)), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(len(students_skills), len(self.vocab))
+        )
+        overlap = (students @ self.by_skill).tocoo()
+        overlap.data = overlap.data * self.inverse_required[overlap.col]
+        return overlap
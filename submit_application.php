@@ -23,9 +23,13 @@ if ($_SERVER["REQUEST_METHOD"] == "POST") {
     }
     
     $final_resume_path = null;
+    $new_upload = false;
+    $existing_data = [];
 
     // 3. FETCH EXISTING RESUME PATH (if user is just updating)
-    $stmt_select = $conn->prepare("SELECT resume_path FROM user_details WHERE user_id = ?");
+    $stmt_select = $conn->prepare("SELECT resume_path, extracted_name, extracted_email, extracted_phone, extracted_education,
+                                          extracted_experience, extracted_projects, extracted_skills, extracted_certifications
+                                   FROM user_details WHERE user_id = ?");
     $stmt_select->bind_param("i", $user_id);
     $stmt_select->execute();
     $result = $stmt_select->get_result();
@@ -55,6 +59,7 @@ if ($_SERVER["REQUEST_METHOD"] == "POST") {
 
             if (move_uploaded_file($file['tmp_name'], $target_file)) {
                 $final_resume_path = $target_file; // Set to new path
+                $new_upload = true;
             } else {
                 $message = "Error: There was an issue uploading your file.";
                 $message_type = "error";
@@ -62,30 +67,49 @@ if ($_SERVER["REQUEST_METHOD"] == "POST") {
         }
     }
 
-    // --- NEW: RUN PYTHON EXTRACTOR ---
+    // --- RESUME EXTRACTION ---
+    // Keep what was extracted from the current resume; a new upload clears it until its job finishes.
+    // With the extraction_jobs table in place (created by `python extraction_jobs.py run` or
+    // `python extractor_service.py --jobs`), a new resume is queued after the save below and
+    // this request does not wait for the parser. Without it, the extractor runs synchronously.
     $extracted_data = [];
+    foreach ($existing_data as $column => $value) {
+        if (strpos($column, 'extracted_') === 0) {
+            $extracted_data[substr($column, strlen('extracted_'))] = $value;
+        }
+    }
     $python_error = null;
-    
-    if ($final_resume_path && $message_type == "success") {
+    $jobs_table = $conn->query("SHOW TABLES LIKE 'extraction_jobs'");
+    $use_job_queue = $jobs_table && $jobs_table->num_rows > 0;
+
+    if ($new_upload && $use_job_queue) {
+        $extracted_data = [];
+    } elseif (!$use_job_queue && $final_resume_path && $message_type == "success") {
         // Use "python" or "python3". You might need the full path if your server can't find it.
         // e.g., "C:/Users/Aditya/AppData/Local/Programs/Python/Python39/python.exe"
         // Use escapeshellarg to prevent command injection
         $command = "python extractor_cli.py " . escapeshellarg($final_resume_path);
         
-        $json_output = shell_exec($command . " 2>&1"); // "2>&1" captures errors
+        exec($command . " 2>&1", $output_lines, $exit_code); // "2>&1" captures errors
+        $json_output = implode("\n", $output_lines);
         
         if ($json_output) {
             $extracted_data = json_decode($json_output, true);
             if (isset($extracted_data['error'])) {
                 $python_error = "Resume Parsing Warning: " . $extracted_data['error'];
                 $message = "Details saved, but " . $python_error;
+            } elseif ($exit_code !== 0) {
+                // Failed without a JSON error (e.g. a Python traceback)
+                $extracted_data = [];
+                $python_error = "Resume Parsing Failed: extractor exited with status " . $exit_code;
+                $message = "Details saved, but " . $python_error;
             }
         } else {
             $python_error = "Resume Parsing Failed: No output from script. Check Python path & file permissions.";
             $message = "Details saved, but " . $python_error;
         }
     }
-    // --- END: RUN PYTHON EXTRACTOR ---
+    // --- END: RESUME EXTRACTION ---
 
 
     // 5. GET ALL DATA FROM FORM
@@ -136,6 +160,16 @@ if ($_SERVER["REQUEST_METHOD"] == "POST") {
     );
 
     if ($stmt->execute()) {
+        if ($new_upload && $use_job_queue) {
+            $stmt_job = $conn->prepare("INSERT INTO extraction_jobs (user_id, resume_path, status, created_at)
+                                        VALUES (?, ?, 'queued', UNIX_TIMESTAMP())");
+            $stmt_job->bind_param("is", $user_id, $final_resume_path);
+            $stmt_job->execute();
+            $stmt_job->close();
+            if (empty($message)) {
+                $message = "Your details have been saved! Your resume is being analysed; the extracted data will appear on your profile shortly.";
+            }
+        }
         if (empty($message)) { // If no file error or parsing warning occurred
             $message = "Your details and resume data have been saved successfully!";
             $message_type = "success";
@@ -0,0 +1,38 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+sys.path.insert(0, os.path.join(HERE, '..', 'benchmarks'))
+
+import db
+import recommendation_api
+from synthetic import make_internships
+
+def tied_internships(templates=40, copies=3, seed=0):
+    """
+    Synthetic catalog in which every posting has ``copies`` exact duplicates
+
+    Importances, domains and skill lists are random (non-uniform) per template,
+    so students cover their required skills partially and ties are common.
+    """
+    base = make_internships(templates, seed=seed)
+    df = pd.concat([base] * copies, ignore_index=True)
+    df['internship_id'] = np.arange(1, len(df) + 1)
+    df['title'] = [f"Intern {i}" for i in df['internship_id']]
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+@pytest.fixture
+def catalog(monkeypatch):
+    """The API's shared catalog, never checked against the (absent) database"""
+    monkeypatch.setattr(db, 'DB_ACQUIRE_TIMEOUT', 0)
+    monkeypatch.setattr(recommendation_api.catalog, 'check_interval', float('inf'))
+    return recommendation_api.catalog
+
+@pytest.fixture
+def client(catalog):
+    return recommendation_api.app.test_client()
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from allocation import allocate, candidate_edges, count_blocking_pairs, deferred_acceptance
+from conftest import tied_internships
+from scoring import ScoringIndex, default_scalers
+from synthetic import make_students
+
+def sequential_deferred_acceptance(cand, cand_score, capacity):
+    """Textbook student-proposing deferred acceptance, one proposal at a time"""
+    m, limit = cand.shape
+    held = {}  # internship -> [(score, student)]
+    pointer = [0] * m
+    free = list(range(m))
+    while free:
+        student = free.pop()
+        if pointer[student] == limit or cand[student, pointer[student]] < 0:
+            continue
+        internship, score = cand[student, pointer[student]], cand_score[student, pointer[student]]
+        pointer[student] += 1
+        seats = sorted(held.get(internship, []) + [(-score, student)])  # best score, then lower position
+        held[internship] = seats[:capacity[internship]]
+        free.extend(s for _, s in seats[capacity[internship]:])
+    assigned = np.full(m, -1)
+    for internship, seats in held.items():
+        for _, student in seats:
+            assigned[student] = internship
+    return assigned
+
+def brute_force_blocking_pairs(cand, cand_score, capacity, assigned):
+    """Pairs where the student prefers the internship and it has a free seat or a weaker holder"""
+    pairs = 0
+    holders = {}
+    for student, internship in enumerate(assigned):
+        if internship >= 0:
+            rank = list(cand[student]).index(internship)
+            holders.setdefault(internship, []).append((cand_score[student, rank], -student))
+    for student in range(len(cand)):
+        current = list(cand[student]).index(assigned[student]) if assigned[student] >= 0 else cand.shape[1]
+        for rank in range(current):
+            internship = cand[student, rank]
+            if internship < 0:
+                continue
+            seats = holders.get(internship, [])
+            if len(seats) < capacity[internship] or (cand_score[student, rank], -student) > min(seats):
+                pairs += 1
+    return pairs
+
+@pytest.fixture(scope='module')
+def market():
+    internships = tied_internships(templates=50, copies=3, seed=2)
+    students = make_students(400, seed=4)
+    index = ScoringIndex(internships)
+    capacity = np.random.default_rng(0).integers(1, 4, len(internships))
+    return internships, students, index, capacity
+
+@pytest.mark.parametrize('limit', [5, 20])
+def test_matches_sequential_deferred_acceptance(market, limit):
+    _, students, index, capacity = market
+    cand, cand_score = candidate_edges(students, index, default_scalers, limit, chunk_size=64)
+    assigned, choice_rank, _ = deferred_acceptance(cand, cand_score, capacity)
+    assert np.array_equal(assigned, sequential_deferred_acceptance(cand, cand_score, capacity))
+    assert brute_force_blocking_pairs(cand, cand_score, capacity, assigned) == 0
+    assert count_blocking_pairs(cand, cand_score, capacity, assigned, choice_rank) == 0
+    assert (np.bincount(assigned[assigned >= 0], minlength=len(capacity)) <= capacity).all()
+
+def test_count_blocking_pairs_finds_instability(market):
+    _, students, index, capacity = market
+    cand, cand_score = candidate_edges(students, index, default_scalers, 10)
+    assigned, choice_rank, _ = deferred_acceptance(cand, cand_score, capacity)
+    # Unplace some students: every seat they leave becomes a blocking pair for them or others
+    broken, broken_rank = assigned.copy(), choice_rank.copy()
+    broken[:50], broken_rank[:50] = -1, -1
+    expected = brute_force_blocking_pairs(cand, cand_score, capacity, broken)
+    assert expected > 0
+    assert count_blocking_pairs(cand, cand_score, capacity, broken, broken_rank) == expected
+
+def test_allocate_is_deterministic_and_uses_recommendation_scores(market):
+    internships, students, index, capacity = market
+    result, summary = allocate(students, internships, capacities=capacity, candidates_per_student=15, index=index)
+    again, _ = allocate(students, internships, capacities=capacity, candidates_per_student=15)
+    assert result.equals(again)
+    placed = result.dropna(subset=['total_score'])
+    assert summary["placed"] == len(placed) > 0
+    assert placed['choice_rank'].between(1, 15).all()
+
+    position = {internship_id: i for i, internship_id in enumerate(internships['internship_id'])}
+    seats = placed['internship_id'].map(position).value_counts()
+    assert (seats <= capacity[seats.index]).all()
+    for row in placed.itertuples():
+        scores, _ = index.score(students[row.Index], default_scalers)
+        assert row.total_score == scores[position[row.internship_id]]
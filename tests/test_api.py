@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from recommendation_api import MAX_TOP_K
+from synthetic import make_internships, make_students
+
+@pytest.fixture
+def loaded(catalog):
+    catalog.load_frame(make_internships(300).assign(created_at=pd.Timestamp('2024-01-01')))
+    return catalog
+
+@pytest.mark.parametrize('top_k', ['ten', None, [3], 0, -5, 2.5, True])
+def test_batch_rejects_bad_top_k(client, loaded, top_k):
+    response = client.post('/recommend/batch', json={"top_k": top_k, "students": make_students(2)})
+    assert response.status_code == 400
+    assert "top_k" in response.get_json()["error"]
+
+def test_batch_clamps_top_k(client, loaded):
+    student = {**make_students(1)[0], 'cgpa': 10, 'experience_years': 5, 'certifications': 10}
+    response = client.post('/recommend/batch', json={"top_k": 10**9, "students": [student]})
+    assert response.status_code == 200
+    assert response.get_json()["results"][0]["count"] == MAX_TOP_K
+
+@pytest.mark.parametrize('method, path', [
+    ('GET', '/admin/catalog/memory'),
+    ('POST', '/admin/catalog/refresh'),
+    ('POST', '/admin/profiler'),
+    ('GET', '/export/recommendations')
+])
+def test_admin_paths_refuse_remote_clients(client, loaded, method, path):
+    remote = client.open(path, method=method, environ_base={'REMOTE_ADDR': '10.0.0.5'})
+    assert remote.status_code == 403
+
+def test_admin_paths_serve_loopback_clients(client, loaded):
+    for address in ['127.0.0.1', '::1', '::ffff:127.0.0.1']:
+        response = client.get('/admin/catalog/memory', environ_base={'REMOTE_ADDR': address})
+        assert response.status_code == 200
+    assert client.get('/health', environ_base={'REMOTE_ADDR': '10.0.0.5'}).status_code == 200
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pandas as pd
+
+import recommendation_api
+from recommendation_api import InternshipCatalog
+from synthetic import make_internships
+
+class FailingLoader:
+    """Stands in for fetch_internships while MySQL is down: slow, then None"""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, updated_since=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return None
+
+def failing_catalog(monkeypatch, check_interval=60):
+    loader = FailingLoader()
+    monkeypatch.setattr(recommendation_api, 'fetch_internships', loader)
+    monkeypatch.setattr(recommendation_api, 'load_catalog_version', lambda: None)
+    return InternshipCatalog(check_interval=check_interval), loader
+
+def test_waiters_share_one_failed_first_load(monkeypatch):
+    catalog, loader = failing_catalog(monkeypatch)
+    finished = []
+
+    def request():
+        catalog.current()
+        finished.append(time.monotonic())
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=request) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loader.calls == 1
+    assert max(finished) - started < 2 * loader.delay
+    assert not catalog.ready
+
+def test_failed_load_is_retried_after_check_interval(monkeypatch):
+    catalog, loader = failing_catalog(monkeypatch, check_interval=0.1)
+    catalog.current()
+    catalog.current()
+    assert loader.calls == 1
+
+    time.sleep(0.15)
+    catalog.current()
+    assert loader.calls == 2
+
+    catalog.refresh(force=True)
+    assert loader.calls == 3
+
+def test_ready_catalog_serves_snapshot_while_database_is_down(monkeypatch):
+    catalog, loader = failing_catalog(monkeypatch, check_interval=0)
+    catalog.load_frame(make_internships(5).assign(created_at=pd.Timestamp('2024-01-01')))
+    catalog.invalidate()
+
+    started = time.monotonic()
+    snapshot = catalog.current()
+    assert time.monotonic() - started < loader.delay
+    assert len(snapshot.frame) == 5
+
+def test_full_reload_sees_optional_column_added_later(monkeypatch):
+    columns = [c for c in recommendation_api.INTERNSHIP_COLUMNS if c != 'required_skills']
+    queries = []
+
+    def query_df(query, params=None):
+        if query.startswith("SHOW COLUMNS"):
+            return pd.DataFrame({'Field': columns + ['created_at', 'is_active']})
+        queries.append(query)
+        return make_internships(3).assign(created_at=pd.Timestamp('2024-01-01'))
+
+    monkeypatch.setattr(recommendation_api, 'query_df', query_df)
+    monkeypatch.setattr(recommendation_api, 'load_catalog_version', lambda: None)
+    monkeypatch.setattr(recommendation_api, '_present_optional', None)
+    catalog = InternshipCatalog()
+
+    catalog.refresh(force=True)
+    assert "'' AS required_skills" in queries[-1]
+
+    columns.append('required_skills')  # ALTER TABLE while the server runs
+    catalog.refresh(force=True)
+    assert "'' AS required_skills" not in queries[-1]
+    assert "required_skills" in queries[-1]
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from domains import DomainIndex, domain_similarity, normalize_domain
+
+def similarity(a, b):
+    return domain_similarity(normalize_domain(a), normalize_domain(b))
+
+def test_normalize_expands_aliases_and_punctuation():
+    assert normalize_domain('Data Science & ML') == 'data science and machine learning'
+    assert normalize_domain('UI/UX Design') == 'ui ux design'
+    assert normalize_domain('  FullStack  Dev ') == 'full stack development'
+    assert normalize_domain(None) == ''
+
+@pytest.mark.parametrize('a, b, expected', [
+    ('Web Development', 'web development', 1.0),
+    ('Web Dev', 'Web Development', 1.0),                      # alias
+    ('Cyber Security', 'Network & Cyber Security', 0.5),      # containment, the original rule
+    ('Full Stack Development', 'Front End Development', 0.5), # same family, no common word
+    ('Data Science & ML', 'Artificial Intelligence', 0.5),
+    ('Cloud Computing', 'DevOps', 0.5),
+    ('Web Development', 'Game Development', 0.0),             # only a generic word in common
+    ('Cyber Security', 'UI/UX Design', 0.0),
+    ('', '', 1.0),
+    ('', 'DevOps', 0.0),
+])
+def test_domain_similarity(a, b, expected):
+    assert similarity(a, b) == expected
+    assert similarity(b, a) == expected
+
+def test_token_overlap_is_scaled_jaccard():
+    # {'quantum', 'computing'} vs {'quantum', 'physics'}: one shared word out of three
+    assert similarity('Quantum Computing', 'Quantum Physics') == pytest.approx(0.5 / 3)
+
+def test_index_matches_pairwise_similarity():
+    domains = ['Web Development', 'web  development', 'DevOps', None, 'Machine Learning', 'Game Development']
+    index = DomainIndex(domains)
+    assert len(index.vocab) == 5  # the two web spellings share a code
+    students = ['Full Stack Development', 'AI', 'Something New', 'Web Dev']
+    matrix = index.score_matrix(students)
+    for row, student in zip(matrix, students):
+        expected = [similarity(student, d) for d in domains]
+        assert row.tolist() == expected
+        assert np.array_equal(index.scores(student), row)
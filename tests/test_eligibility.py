@@ -0,0 +1,52 @@
+import datetime
+
+import numpy as np
+
+from eligibility import NO_DEADLINE, EligibilityIndex, deadline_days, today_days
+
+def random_index(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    min_cgpa = rng.choice([0, 6.0, 6.5, 7.0, 7.5, 8.0, np.nan], n)
+    experience = rng.choice([0, 0.5, 1, 2], n)
+    certifications = rng.choice([0, 1, 2, 3], n)
+    base = datetime.date(2026, 1, 1)
+    deadlines = [
+        None if rng.random() < 0.3 else (base + datetime.timedelta(days=int(rng.integers(-20, 20)))).isoformat()
+        for _ in range(n)
+    ]
+    return EligibilityIndex(min_cgpa, experience, certifications, deadlines), (min_cgpa, experience, certifications)
+
+def test_deadline_days_treats_missing_and_invalid_as_open():
+    days = deadline_days(['2026-01-01', None, 'not a date', datetime.date(2026, 1, 2)])
+    epoch = int(np.datetime64('2026-01-01', 'D').astype(np.int64))
+    assert days.tolist() == [epoch, NO_DEADLINE, NO_DEADLINE, epoch + 1]
+
+def test_candidates_match_brute_force_filter():
+    index, (min_cgpa, experience, certifications) = random_index()
+    base = int(np.datetime64('2026-01-01', 'D').astype(np.int64))
+    rng = np.random.default_rng(1)
+    for today in [base - 30, base, base + 7, base + 30]:
+        is_open = index.open_mask(today)
+        assert np.array_equal(is_open, index.deadlines >= today)
+        for _ in range(25):
+            cgpa, years, certs = rng.uniform(5, 10), rng.choice([0, 0.5, 1, 3]), rng.integers(0, 4)
+            expected = np.flatnonzero(
+                (min_cgpa <= cgpa) & (experience <= years) & (certifications <= certs) & is_open
+            )
+            assert index.candidates(cgpa, years, certs, today).tolist() == expected.tolist()
+
+def test_deadline_today_is_still_open():
+    today = today_days()
+    index = EligibilityIndex([0, 0, 0], [0, 0, 0], [0, 0, 0], [
+        datetime.date.today(), datetime.date.today() - datetime.timedelta(days=1), None
+    ])
+    assert index.open_mask().tolist() == [True, False, True]
+    assert index.candidates(10, 5, 10, today).tolist() == [0, 2]
+
+def test_no_deadlines_and_missing_thresholds():
+    index = EligibilityIndex([6.0, np.nan, 7.0], [0, 0, 0], [0, 0, 0])
+    assert index.open_mask().all()
+    # A missing minimum never passes, as the NaN comparison of the plain filter would not
+    assert index.candidates(10, 0, 0).tolist() == [0, 2]
+    assert index.candidates(6.5, 0, 0).tolist() == [0]
+    assert len(index.candidates(5.0, 0, 0)) == 0
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+import extractor_cli
+from extraction_cache import ExtractionCache
+from synthetic import make_resume_pdf
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(str(tmp_path / "cache"), version="2", max_bytes=10_000)
+
+def test_keys_follow_content_and_mode(cache, tmp_path):
+    a, b = tmp_path / "a.pdf", tmp_path / "b.pdf"
+    a.write_bytes(b"%PDF same bytes")
+    b.write_bytes(b"%PDF same bytes")
+    assert cache.key(str(a)) == cache.key(str(b)) == cache.key_bytes(b"%PDF same bytes")
+    assert cache.key(str(a), "regex") != cache.key(str(a), "en_core_web_sm")
+    assert cache.key_bytes(b"%PDF other bytes") != cache.key(str(a))
+    assert cache.key(str(tmp_path / "missing.pdf")) is None
+
+def test_disabled_cache(tmp_path):
+    cache = ExtractionCache("")
+    assert cache.key_bytes(b"data") is None
+    cache.put(None, {"name": "x"})
+    assert cache.get(None) is None
+
+def test_round_trip_and_versions(cache):
+    key = cache.key_bytes(b"resume")
+    assert cache.get(key) is None
+    cache.put(key, {"name": "Asha Menon", "skills": "Python"})
+    assert cache.get(key) == {"name": "Asha Menon", "skills": "Python"}
+    # A new extractor version never reads the old entries
+    assert ExtractionCache(cache.directory, version="3").get(key) is None
+
+def test_corrupt_entry_is_a_miss(cache):
+    key = cache.key_bytes(b"resume")
+    cache.put(key, {"name": "x"})
+    with open(cache._path(key), "w") as f:
+        f.write("{not json")
+    assert cache.get(key) is None
+
+def test_eviction_drops_old_versions_then_least_recently_used(cache):
+    old = ExtractionCache(cache.directory, version="1")
+    old.put(old.key_bytes(b"old"), {"text": "x" * 100})
+    keys = [cache.key_bytes(bytes([i])) for i in range(60)]
+    for i, key in enumerate(keys):
+        cache.put(key, {"text": "x" * 200})
+        os.utime(cache._path(key), (i, i))  # deterministic recency
+        if i == 5:
+            cache.get(keys[0])  # a hit makes the first entry the most recently used
+            os.utime(cache._path(keys[0]), (1000, 1000))
+    assert not os.path.exists(os.path.join(cache.directory, "1"))
+    assert cache._scan_size() <= cache.max_bytes
+    assert cache.get(keys[0]) is not None and cache.get(keys[-1]) is not None
+    assert cache.get(keys[1]) is None
+
+def test_extract_resume_reuses_results_by_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(extractor_cli, "result_cache", ExtractionCache(str(tmp_path / "cache"), version="test"))
+    path = make_resume_pdf(str(tmp_path / "resume.pdf"), seed=4)
+    first = extractor_cli.extract_resume(path, None, regex_only=True)
+    assert "error" not in first and first["email"]
+
+    calls = []
+    monkeypatch.setattr(extractor_cli, "extract_info", lambda text, nlp=None: calls.append(text) or {})
+    with open(path, "rb") as f:
+        data = f.read()
+    assert extractor_cli.extract_resume_bytes(data, None, regex_only=True) == first
+    assert extractor_cli.cached_resume(path, regex_only=True) == first
+    # The model mode is a different entry; without a model it reports the missing model
+    assert extractor_cli.extract_resume(path, None) == {"error": extractor_cli.MODEL_MISSING_ERROR}
+    assert calls == []
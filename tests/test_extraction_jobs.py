@@ -0,0 +1,98 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+import extraction_jobs
+from extraction_jobs import JOB_MAX_ATTEMPTS, JobRunner, JobStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    store.create_table()
+    return store
+
+class FakePool:
+    """Completes each submitted job immediately with the result mapped to its resume path"""
+
+    def __init__(self, results):
+        self.results = results
+
+    def submit(self, fn, path):
+        future = Future()
+        outcome = self.results[path.rsplit('/', 1)[-1]]
+        if isinstance(outcome, Exception):
+            future.set_exception(outcome)
+        else:
+            future.set_result((outcome, {}))
+        return future
+
+def test_claim_in_queue_order_and_report_position(store):
+    ids = [store.enqueue(user_id, f"uploads/{user_id}.pdf") for user_id in (7, 8, 9)]
+    assert [store.get(i)['position'] for i in ids] == [0, 1, 2]
+    job = store.claim("w1")
+    assert job['id'] == ids[0] and job['status'] == 'running' and job['attempts'] == 1
+    assert store.get(ids[2])['position'] == 1
+    store.finish(job, 'done', result={"cgpa": 8.5})
+    assert store.get(ids[0])['result'] == {"cgpa": 8.5}
+    assert 'position' not in store.get(ids[0])
+
+def test_concurrent_claims_never_share_a_job(store):
+    for user_id in range(40):
+        store.enqueue(user_id, f"uploads/{user_id}.pdf")
+    claimed, lock = [], threading.Lock()
+
+    def drain(worker_id):
+        while (job := store.claim(worker_id)) is not None:
+            with lock:
+                claimed.append(job['id'])
+
+    threads = [threading.Thread(target=drain, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == list(range(1, 41))
+
+def test_retry_until_attempts_run_out(store):
+    job_id = store.enqueue(1, "uploads/1.pdf")
+    for attempt in range(1, JOB_MAX_ATTEMPTS + 1):
+        job = store.claim("w1")
+        assert job['attempts'] == attempt
+        expected = 'failed' if attempt == JOB_MAX_ATTEMPTS else 'queued'
+        assert store.retry(job, "boom") == expected
+    assert store.get(job_id)['status'] == 'failed'
+    assert store.claim("w1") is None
+
+def test_requeue_stale_running_jobs(store):
+    fresh, stale = store.enqueue(1, "a.pdf"), store.enqueue(2, "b.pdf")
+    store.claim("w1")
+    store.claim("w1")
+    assert store.requeue_stale(older_than=60) == 0
+    time.sleep(0.05)
+    assert store.requeue_stale(older_than=0.01) == 2
+    assert [store.get(i)['status'] for i in (fresh, stale)] == ['queued', 'queued']
+
+def test_runner_records_every_outcome(store, monkeypatch):
+    applied = []
+    monkeypatch.setattr(extraction_jobs, 'apply_result', lambda job, info: applied.append(job['user_id']) or True)
+    pool = FakePool({
+        "ok.pdf": {"cgpa": 9.0},
+        "bad.pdf": {"error": "Could not read the PDF."},
+        "crash.pdf": RuntimeError("worker died")
+    })
+    ids = [store.enqueue(user_id, f"uploads/{name}") for user_id, name in enumerate(pool.results)]
+    runner = JobRunner(store, pool, slots=2, poll_interval=0.01)
+    runner.start()
+    deadline = time.monotonic() + 5
+    while store.get(ids[2])['status'] != 'failed' and time.monotonic() < deadline:
+        time.sleep(0.01)
+    runner.stop()
+
+    ok, bad, crash = (store.get(i) for i in ids)
+    assert ok['status'] == 'done' and ok['result'] == {"cgpa": 9.0} and applied == [0]
+    assert bad['status'] == 'failed' and bad['error'] == "Could not read the PDF." and bad['attempts'] == 1
+    # A crashed worker is retried until the attempts run out
+    assert crash['status'] == 'failed' and crash['attempts'] == JOB_MAX_ATTEMPTS
+    assert runner.in_flight == 0
@@ -0,0 +1,103 @@
+import re
+
+import pytest
+
+from extractor_cli import SECTION_HEADINGS, SECTION_STOP_TOKENS, KeywordMatcher, ResumeSections, extract_info
+from synthetic import make_resume_text
+
+def scanned_section(text, kind):
+    """The section as the per-field line scans found it before ResumeSections"""
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+
+    def is_heading(line):
+        s = line.lower()
+        return len(s) <= 60 and any(s == t or s.startswith(t + " ") or s.startswith(t + ":")
+                                    for t in SECTION_HEADINGS[kind])
+
+    start = next((i + 1 for i, line in enumerate(lines) if is_heading(line)), None)
+    body = []
+    if start is not None:
+        for line in lines[start:]:
+            if is_heading(line) or any(t in line.lower() for t in SECTION_STOP_TOKENS[kind]):
+                break
+            body.append(line)
+    return body
+
+HANDWRITTEN = [
+    "Jane Doe\nWork Experience:\n  Intern at Acme\n\nBuilt dashboards\nEducation\nB.Tech",
+    "Experience\nExperience\nIntern",                          # a repeated heading ends the section
+    "Certifications\n1. AWS Cloud Practitioner\n- Azure Fundamentals\nSkills used daily: Python",
+    "Certificate in Data Science\nIntern work experience at Acme",  # a stop word inside a line ends it
+    "No headings at all\njust text",
+    "Employment history of a very long heading line that goes on past sixty characters\nIntern",
+]
+
+@pytest.mark.parametrize('text', HANDWRITTEN + [make_resume_text(seed) for seed in range(20)])
+def test_sections_match_line_scans(text):
+    resume = ResumeSections(text)
+    assert resume.lines == [line.strip() for line in text.split("\n") if line.strip()]
+    for kind in SECTION_HEADINGS:
+        assert resume.sections.get(kind, []) == scanned_section(text, kind)
+
+RESUME = """
+Asha Menon
+asha.menon@example.com
++91 98765 43210
+Education
+B.Tech in Computer Science, Example University
+Online course, Coursera University
+Experience
+Backend Intern at Acme - Python and Docker
+Teaching assistant
+Projects
+Developed a React dashboard for placements
+Skills
+Python, C++, React, Docker
+Certification
+\u2022 AWS Cloud Practitioner
+2. Azure Fundamentals
+Interests
+Chess
+"""
+
+def test_extract_info_regex_only():
+    assert extract_info(RESUME, nlp=None) == {
+        "name": "Asha Menon",
+        "email": "asha.menon@example.com",
+        "phone": "+91 98765 43210",
+        "education": "B.Tech in Computer Science, Example University",
+        "experience": "Backend Intern at Acme - Python and Docker | Teaching assistant",
+        "projects": "Projects | Developed a React dashboard for placements",
+        "skills": "Python, C++, React, Docker, AWS, Azure",  # anywhere in the text
+        "certifications": "AWS Cloud Practitioner | Azure Fundamentals"
+    }
+
+def test_extract_info_defaults():
+    assert extract_info("hello world", nlp=None) == {
+        "name": None, "email": None, "phone": None, "education": "Not Mentioned",
+        "experience": "NOT APPLICABLE", "projects": "Not Applicable", "skills": "Not Mentioned",
+        "certifications": "Not Mentioned"
+    }
+
+VOCABULARY = ["Java", "Python", "C++", "C", "JavaScript", "Machine Learning", "AI", "Node.js", "Git"]
+
+@pytest.mark.parametrize('text, expected', [
+    ("C++, Java", ["Java", "C++"]),
+    ("JavaScript only", ["JavaScript"]),
+    ("plain C and python3", ["C"]),
+    ("PYTHON/java", ["Java", "Python"]),
+    ("Node.js and Git", ["Node.js", "Git"]),
+    ("GitHub, domain, training", []),
+    ("machine learning, AI", ["Machine Learning", "AI"]),
+    ("", []),
+])
+def test_keyword_matcher(text, expected):
+    assert KeywordMatcher(VOCABULARY).find(text) == expected
+
+def test_keyword_matcher_agrees_with_word_regexes():
+    # Apart from the "C" inside "C++", the trie finds what one \b regex per keyword finds
+    matcher = KeywordMatcher(VOCABULARY)
+    for seed in range(20):
+        text = make_resume_text(seed).replace("C++", "")
+        expected = [k for k in VOCABULARY if re.search(r'(?<![a-z0-9])' + re.escape(k.lower()) + r'(?![a-z0-9])', text.lower())]
+        assert matcher.find(text) == expected
@@ -0,0 +1,66 @@
+import gzip
+import json
+
+import pandas as pd
+import pytest
+
+from recommendation_api import INTERNSHIP_COLUMNS, INTERNSHIPS_MAX_PAGE
+from synthetic import make_internships
+
+@pytest.fixture
+def loaded(catalog):
+    catalog.load_frame(make_internships(250).assign(created_at=pd.Timestamp('2024-01-01')))
+    return catalog
+
+def listing(client, query='', **headers):
+    return client.get(f'/internships{query}', headers=headers)
+
+def test_full_listing(client, loaded):
+    body = listing(client).get_json()
+    assert body["success"] and body["count"] == 250
+    assert [i["internship_id"] for i in body["internships"]] == list(range(1, 251))
+    assert set(body["internships"][0]) == set(INTERNSHIP_COLUMNS)
+
+def test_pages_cover_the_full_listing(client, loaded):
+    everything = listing(client).get_json()["internships"]
+    pages = []
+    for offset in range(0, 250, 100):
+        page = listing(client, f'?offset={offset}&limit=100').get_json()
+        assert page["total"] == 250 and page["offset"] == offset
+        pages += page["internships"]
+    assert pages == everything
+    assert listing(client, '?offset=400&limit=10').get_json()["internships"] == []
+
+def test_fields_selects_columns(client, loaded):
+    body = listing(client, '?fields=internship_id, title&limit=5').get_json()
+    assert body["internships"] == [{"internship_id": i, "title": f"Intern {i}"} for i in range(1, 6)]
+
+@pytest.mark.parametrize('query', ['?offset=-1', '?limit=0', f'?limit={INTERNSHIPS_MAX_PAGE + 1}', '?fields=title,salary'])
+def test_bad_parameters(client, loaded, query):
+    assert listing(client, query).status_code == 400
+
+@pytest.mark.parametrize('query', ['', '?offset=10&limit=50'])
+def test_etag_revalidation(client, loaded, query):
+    first = listing(client, query)
+    assert first.headers['ETag'] and 'no-cache' in first.headers['Cache-Control']
+    again = listing(client, query, **{'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304 and again.data == b''
+    assert listing(client, query, **{'If-None-Match': '"other"'}).status_code == 200
+
+def test_etag_changes_with_the_catalog(client, loaded):
+    tag = listing(client).headers['ETag']
+    loaded.load_frame(make_internships(251).assign(created_at=pd.Timestamp('2024-01-01')))
+    response = listing(client, **{'If-None-Match': tag})
+    assert response.status_code == 200 and response.headers['ETag'] != tag
+
+@pytest.mark.parametrize('query', ['', '?fields=title&limit=200'])
+def test_gzip_when_accepted(client, loaded, query):
+    plain = listing(client, query)
+    zipped = listing(client, query, **{'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in plain.headers
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in zipped.headers['Vary']
+    assert json.loads(gzip.decompress(zipped.data)) == plain.get_json()
+    # The two encodings are different representations, so their tags differ
+    assert zipped.headers['ETag'] != plain.headers['ETag']
+    assert listing(client, query, **{'Accept-Encoding': 'gzip', 'If-None-Match': zipped.headers['ETag']}).status_code == 304
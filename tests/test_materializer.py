@@ -0,0 +1,109 @@
+import pandas as pd
+
+import materializer
+import recommendation_api
+from conftest import tied_internships
+from synthetic import make_students
+
+STUDENT = {
+    'domain': 'Software Development',
+    'cgpa': 8.0,
+    'experience_years': 1.0,
+    'certifications': 2,
+    'skills': 'Python, SQL'
+}
+
+def tied_catalog(ids):
+    """Internships that differ only in id and title, so every student scores them all equally"""
+    n = len(ids)
+    return pd.DataFrame({
+        'internship_id': ids,
+        'title': [f"Intern {i}" for i in ids],
+        'company_name': "Company",
+        'description': "Identical posting.",
+        'required_domain': 'Software Development',
+        'min_cgpa': 6.0,
+        'required_experience': 0.0,
+        'min_certifications': 0,
+        'importance_domain': 0.4,
+        'importance_cgpa': 0.3,
+        'importance_experience': 0.2,
+        'importance_certifications': 0.1,
+        'location': 'Remote',
+        'duration_months': 3,
+        'stipend': 10000.0,
+        'application_deadline': [None] * n,
+        'required_skills': 'Python, SQL'
+    })
+
+class MemoryStore:
+    """RecommendationStore kept in a dict"""
+
+    def __init__(self, profiles):
+        self.profiles = profiles
+        self.rows = {}
+
+    def create_table(self):
+        pass
+
+    def load(self):
+        return {uid: stored for uid, (stored, _) in self.rows.items()}
+
+    def load_profiles(self):
+        return {uid: dict(profile) for uid, profile in self.profiles.items()}
+
+    def save(self, rows):
+        for uid, stored, body in rows:
+            self.rows[uid] = (stored, body)
+
+    def delete(self, user_ids):
+        for uid in user_ids:
+            del self.rows[uid]
+
+    def publish(self, catalog_hash, previous_hash=None):
+        for uid, (stored, body) in list(self.rows.items()):
+            if stored.catalog_hash == previous_hash:
+                self.rows[uid] = (stored._replace(catalog_hash=catalog_hash), body)
+
+def live_body(student):
+    client = recommendation_api.app.test_client()
+    response = client.post('/recommend', json=student)
+    assert response.status_code == 200
+    return response.get_data(as_text=True)
+
+def test_insert_into_tied_catalog_matches_recommend(catalog):
+    catalog.load_frame(tied_catalog(list(range(1, 31))))
+    store = MemoryStore({1: {**STUDENT, 'profile_hash': 'a'}})
+    mat = materializer.Materializer(store, catalog)
+    mat.sync()
+    assert store.rows[1][1] == live_body(STUDENT)
+
+    # A new posting, newest first, ties with the stored k-th score and wins on catalog position
+    catalog.load_frame(tied_catalog([31] + list(range(1, 31))))
+    summary = mat.sync()
+
+    assert summary["affected_by_catalog_change"] == 1
+    assert store.rows[1][1] == live_body(STUDENT)
+    assert store.rows[1][0].internship_ids[0] == 31
+
+def test_insert_tying_kth_of_weighted_catalog_matches_recommend(catalog):
+    # Random importances with partial skill coverage: a new copy of the student's
+    # k-th posting ties it exactly and comes first in catalog order, so it must
+    # displace it in the materialized body as it does in /recommend
+    for seed in range(100):
+        df = tied_internships(templates=12, copies=2, seed=seed)
+        student = {**make_students(1, seed=seed)[0], 'skills': 'Python, Java, React, Docker'}
+        catalog.load_frame(df)
+        store = MemoryStore({1: {**student, 'profile_hash': 'a'}})
+        mat = materializer.Materializer(store, catalog)
+        mat.sync()
+        stored = store.rows[1][0].internship_ids
+        if len(stored) < materializer.TOP_K:
+            continue
+
+        copy = df[df['internship_id'] == stored[-1]].assign(internship_id=10**6)
+        catalog.load_frame(pd.concat([copy, df], ignore_index=True))
+        mat.sync()
+
+        assert store.rows[1][1] == live_body(student), f"seed {seed}"
+        assert 10**6 in store.rows[1][0].internship_ids, f"seed {seed}"
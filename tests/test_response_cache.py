@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from response_cache import ResponseCache, profile_key, quantize_profile
+
+def snapshot(generation):
+    return SimpleNamespace(generation=generation)
+
+def test_newer_snapshot_invalidates_entries():
+    cache = ResponseCache(max_entries=10, ttl=60)
+    old, new = snapshot(1), snapshot(2)
+    cache.put('a', old, [1])
+    assert cache.get('a', old) == [1]
+
+    assert cache.get('a', new) is None
+    assert cache.stats()["invalidations"] == 1
+    assert cache.get('a', old) is None  # not resurrected by going back
+
+def test_late_put_from_older_snapshot_is_dropped():
+    cache = ResponseCache(max_entries=10, ttl=60)
+    old, new = snapshot(1), snapshot(2)
+    cache.get('a', old)           # request A starts on the old snapshot
+    cache.put('b', new, [2])      # request B already runs on the refreshed one
+    cache.put('a', old, [1])      # A finishes late
+
+    assert cache.get('b', new) == [2]
+    assert cache.get('a', new) is None
+    assert cache.stats()["stale_puts"] == 1
+
+def test_ttl_and_lru_eviction():
+    cache = ResponseCache(max_entries=2, ttl=0)
+    cache.put('a', snapshot(1), [1])
+    assert cache.get('a', snapshot(1)) is None
+    assert cache.stats()["expirations"] == 1
+
+    cache = ResponseCache(max_entries=2, ttl=60)
+    current = snapshot(1)
+    for key in 'abc':
+        cache.put(key, current, [key])
+    assert cache.get('a', current) is None
+    assert cache.get('c', current) == ['c']
+    assert cache.stats()["evictions"] == 1
+
+def test_equivalent_profiles_share_a_key():
+    a = {'domain': 'Data Science & ML', 'cgpa': 8.004, 'experience_years': 1, 'certifications': 2.0,
+         'skills': 'Python, sklearn'}
+    b = {'domain': 'data science and machine learning', 'cgpa': 8.0, 'experience_years': 1.0,
+         'certifications': 2, 'skills': ['scikit-learn', 'python']}
+    assert profile_key(quantize_profile(a)) == profile_key(quantize_profile(b))
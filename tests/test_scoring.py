@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import tied_internships
+import recommendation_api
+from domains import domain_similarity, normalize_domain
+from scoring import IMPORTANCE_COLUMNS, STUDENT_FEATURES, ScoringIndex, default_scalers, top_k, top_k_batch
+from skills import SKILL_WEIGHT, parse_skills
+from synthetic import add_deadlines, make_students
+
+def reference_scores(df, student):
+    """
+    The scoring formula written out row by row, as the pre-vectorization code did
+
+    Importances go through float32 because that is how ``ScoringIndex`` stores them.
+    """
+    domain = normalize_domain(student['domain'])
+    skills = set(parse_skills(student.get('skills')))
+    scaled = [float(student[f]) * default_scalers[f].scale + default_scalers[f].offset for f in STUDENT_FEATURES]
+    scores = []
+    for _, row in df.iterrows():
+        importance = [float(np.float32(row[c])) for c in IMPORTANCE_COLUMNS]
+        score = domain_similarity(domain, normalize_domain(row['required_domain'])) * importance[0]
+        for weight, value in zip(importance[1:], scaled):
+            score += weight * value
+        required = parse_skills(row['required_skills'])
+        if required:
+            score += SKILL_WEIGHT * (len(skills.intersection(required)) * float(np.float32(1.0 / len(required))))
+        scores.append(score)
+    return np.array(scores)
+
+def reference_ranking(df, student, k=10):
+    """Eligible, still-open postings by score, ties in catalog order"""
+    deadline = pd.to_datetime(df['application_deadline'], errors='coerce')
+    eligible = (
+        (df['min_cgpa'] <= student['cgpa']) &
+        (df['required_experience'] <= student['experience_years']) &
+        (df['min_certifications'] <= student['certifications']) &
+        (deadline.isna() | (deadline >= pd.Timestamp.today().normalize()))
+    ).to_numpy()
+    scores = reference_scores(df, student)
+    positions = np.flatnonzero(eligible)
+    order = np.argsort(-scores[positions], kind='stable')[:k]
+    return positions[order], scores[positions][order]
+
+@pytest.fixture(scope='module')
+def catalog_df():
+    return add_deadlines(tied_internships(templates=60, copies=3))
+
+@pytest.fixture(scope='module')
+def students():
+    students = make_students(40, seed=5)
+    # Free-text domains exercise aliases and families as well as the form values
+    for student, domain in zip(students, ['Web Dev', 'AI/ML', 'Full Stack Development', 'Data Science & ML', 'Other']):
+        student['domain'] = domain
+    return students
+
+def test_scores_match_reference_formula(catalog_df, students):
+    index = ScoringIndex(catalog_df)
+    for student in students[:10]:
+        scores, _ = index.score(student, default_scalers)
+        assert np.array_equal(scores, reference_scores(catalog_df, student))
+
+def test_recommendations_match_reference_ranking(catalog_df, students):
+    index = ScoringIndex(catalog_df)
+    for student in students:
+        positions, scores = reference_ranking(catalog_df, student)
+        ranked = recommendation_api.recommend_internships(student, catalog_df, default_scalers, index=index)
+        assert ranked['internship_id'].tolist() == catalog_df['internship_id'].to_numpy()[positions].tolist()
+        assert np.array_equal(ranked['total_score'].to_numpy(dtype=np.float64), scores)
+
+def test_batch_recommendations_match_single(catalog_df, students):
+    index = ScoringIndex(catalog_df)
+    batch = recommendation_api.recommend_internships_batch(students, catalog_df, default_scalers, index=index,
+                                                           chunk_size=7)
+    for student, ranked in zip(students, batch):
+        single = recommendation_api.recommend_internships(student, catalog_df, default_scalers, index=index)
+        assert ranked['internship_id'].tolist() == single['internship_id'].tolist()
+        assert np.array_equal(ranked['total_score'].to_numpy(dtype=np.float64),
+                              single['total_score'].to_numpy(dtype=np.float64))
+
+def test_batch_scores_equal_single_scores_bitwise():
+    index = ScoringIndex(tied_internships())
+    students = make_students(60)
+    everything = np.arange(len(index))
+    scores, _ = index.score_batch(students, default_scalers)
+    for row, student in zip(scores, students):
+        single = index.score_candidates(student, default_scalers, everything)
+        full, _ = index.score(student, default_scalers)
+        assert np.array_equal(row, single)
+        assert np.array_equal(full, single)
+
+@pytest.mark.parametrize('k', [1, 3, 10, 50])
+def test_top_k_equals_stable_sort_with_ties(k):
+    rng = np.random.default_rng(k)
+    scores = rng.integers(0, 5, size=(20, 40)).astype(np.float64)  # heavy ties
+    mask = rng.random(scores.shape) < 0.7
+    batch = top_k_batch(scores, mask, k)
+    for row, row_mask, ranked in zip(scores, mask, batch):
+        eligible = np.flatnonzero(row_mask)
+        expected = eligible[np.argsort(-row[eligible], kind='stable')[:k]]
+        assert top_k(row, row_mask, k).tolist() == expected.tolist()
+        assert ranked.tolist() == expected.tolist()